@@ -4,7 +4,7 @@ Loads and validates environment variables for the application.
 """
 
 import os
-from typing import Optional
+from typing import Dict, List, Optional
 from functools import lru_cache
 from pydantic_settings import BaseSettings
 from dotenv import load_dotenv
@@ -20,6 +20,117 @@ class Settings(BaseSettings):
     groq_api_key: str = os.getenv("GROQ_API_KEY", "")
     model_name: str = os.getenv("MODEL_NAME", "llama3-70b-8192") # Modified default model name
     
+    # Small, fast model for cheap tasks (see model_routing)
+    fast_model_name: str = os.getenv("FAST_MODEL_NAME", "llama3-8b-8192")
+    # Per-task routing overrides: "task=model|fallback;content:tagline=model"
+    model_routes: str = os.getenv("MODEL_ROUTES", "")
+    
+    # Fallback and hedging: a model is skipped for route_cooldown seconds
+    # after route_failure_threshold consecutive failures; a hedged request
+    # goes to the next model once the first exceeds its p95 latency
+    route_failure_threshold: int = int(os.getenv("ROUTE_FAILURE_THRESHOLD", "3"))
+    route_cooldown: float = float(os.getenv("ROUTE_COOLDOWN", "30"))
+    hedging_enabled: bool = os.getenv("HEDGING_ENABLED", "false").lower() == "true"
+    hedge_min_samples: int = int(os.getenv("HEDGE_MIN_SAMPLES", "20"))
+    hedge_min_delay_ms: int = int(os.getenv("HEDGE_MIN_DELAY_MS", "500"))
+    
+    # Groq connection pool (shared across all requests)
+    groq_max_connections: int = int(os.getenv("GROQ_MAX_CONNECTIONS", "100"))
+    groq_max_keepalive_connections: int = int(os.getenv("GROQ_MAX_KEEPALIVE_CONNECTIONS", "20"))
+    groq_keepalive_expiry: float = float(os.getenv("GROQ_KEEPALIVE_EXPIRY", "30"))
+    groq_timeout: float = float(os.getenv("GROQ_TIMEOUT", "60"))
+    groq_connect_timeout: float = float(os.getenv("GROQ_CONNECT_TIMEOUT", "5"))
+    
+    # Stability AI connection pool (shared across all logo requests); HTTP/2
+    # is used when the h2 package is installed
+    stability_http2: bool = os.getenv("STABILITY_HTTP2", "true").lower() == "true"
+    stability_max_connections: int = int(os.getenv("STABILITY_MAX_CONNECTIONS", "10"))
+    stability_max_keepalive_connections: int = int(os.getenv("STABILITY_MAX_KEEPALIVE_CONNECTIONS", "10"))
+    stability_keepalive_expiry: float = float(os.getenv("STABILITY_KEEPALIVE_EXPIRY", "60"))
+    stability_connect_timeout: float = float(os.getenv("STABILITY_CONNECT_TIMEOUT", "5"))
+    stability_read_timeout: float = float(os.getenv("STABILITY_READ_TIMEOUT", "60"))
+    stability_pool_timeout: float = float(os.getenv("STABILITY_POOL_TIMEOUT", "10"))
+    
+    # Token budgets: model context size, prompt limit and per-endpoint
+    # max_tokens overrides ("content:tagline=200,design=1500")
+    model_context_tokens: int = int(os.getenv("MODEL_CONTEXT_TOKENS", "8192"))
+    max_prompt_tokens: int = int(os.getenv("MAX_PROMPT_TOKENS", "6000"))
+    output_token_budgets: str = os.getenv("OUTPUT_TOKEN_BUDGETS", "")
+    token_budget_auto_tune: bool = os.getenv("TOKEN_BUDGET_AUTO_TUNE", "true").lower() == "true"
+    
+    # Client-side rate limiting (requests / tokens per minute per model;
+    # the token limit is updated from Groq's rate-limit headers)
+    groq_rpm_limit: int = int(os.getenv("GROQ_RPM_LIMIT", "30"))
+    groq_tpm_limit: int = int(os.getenv("GROQ_TPM_LIMIT", "6000"))
+    rate_limit_max_wait: float = float(os.getenv("RATE_LIMIT_MAX_WAIT", "60"))
+    rate_limit_max_retries: int = int(os.getenv("RATE_LIMIT_MAX_RETRIES", "3"))
+    
+    # Priority classes: weighted-fair shares of upstream capacity, and the
+    # fraction of the token budget bulk traffic must leave free
+    priority_weight_interactive: float = float(os.getenv("PRIORITY_WEIGHT_INTERACTIVE", "8"))
+    priority_weight_standard: float = float(os.getenv("PRIORITY_WEIGHT_STANDARD", "3"))
+    priority_weight_bulk: float = float(os.getenv("PRIORITY_WEIGHT_BULK", "1"))
+    priority_bulk_headroom: float = float(os.getenv("PRIORITY_BULK_HEADROOM", "0.2"))
+    
+    # Circuit breakers (per upstream): open when, over the rolling window,
+    # the failure rate or slow-call rate crosses its threshold
+    breaker_failure_rate: float = float(os.getenv("BREAKER_FAILURE_RATE", "0.5"))
+    breaker_slow_call_rate: float = float(os.getenv("BREAKER_SLOW_CALL_RATE", "0.8"))
+    breaker_window_seconds: float = float(os.getenv("BREAKER_WINDOW_SECONDS", "60"))
+    breaker_min_calls: int = int(os.getenv("BREAKER_MIN_CALLS", "10"))
+    breaker_open_seconds: float = float(os.getenv("BREAKER_OPEN_SECONDS", "30"))
+    breaker_half_open_calls: int = int(os.getenv("BREAKER_HALF_OPEN_CALLS", "2"))
+    groq_slow_call_seconds: float = float(os.getenv("GROQ_SLOW_CALL_SECONDS", "20"))
+    stability_slow_call_seconds: float = float(os.getenv("STABILITY_SLOW_CALL_SECONDS", "45"))
+    
+    # Content-addressed store for generated images (served by hash)
+    blob_store_dir: str = os.getenv("BLOB_STORE_DIR", "data/blobs")
+    
+    # Background logo jobs
+    logo_jobs_dir: str = os.getenv("LOGO_JOBS_DIR", "data/logo_jobs")
+    logo_job_workers: int = int(os.getenv("LOGO_JOB_WORKERS", "2"))
+    logo_job_max_queued: int = int(os.getenv("LOGO_JOB_MAX_QUEUED", "100"))
+    # Finished jobs are deleted this long after they end (0 keeps them forever)
+    logo_job_retention_seconds: float = float(os.getenv("LOGO_JOB_RETENTION_SECONDS", str(7 * 24 * 3600)))
+    
+    # Diffusion steps for progressive logo previews (full renders use 30)
+    logo_preview_steps: int = int(os.getenv("LOGO_PREVIEW_STEPS", "10"))
+    
+    # Logo derivatives (thumbnails, favicon, social cards) rendered in a
+    # process pool
+    logo_derivative_workers: int = int(os.getenv("LOGO_DERIVATIVE_WORKERS", "2"))
+    
+    # Brand-guide PDF rendering (process pool, bounded queue, per-render timeout)
+    pdf_render_workers: int = int(os.getenv("PDF_RENDER_WORKERS", "2"))
+    pdf_render_max_pending: int = int(os.getenv("PDF_RENDER_MAX_PENDING", "16"))
+    pdf_render_timeout: float = float(os.getenv("PDF_RENDER_TIMEOUT", "30"))
+    
+    # Rendered brand-guide PDFs, cached on disk (LRU, bounded by total size)
+    export_cache_dir: str = os.getenv("EXPORT_CACHE_DIR", "data/export_cache")
+    export_cache_max_bytes: int = int(os.getenv("EXPORT_CACHE_MAX_BYTES", str(200 * 1024 * 1024)))
+    
+    # Bulk brand-guide ZIP export
+    bulk_export_max_guides: int = int(os.getenv("BULK_EXPORT_MAX_GUIDES", "100"))
+    bulk_export_concurrency: int = int(os.getenv("BULK_EXPORT_CONCURRENCY", "4"))
+    
+    # User store: MongoDB when MONGODB_URI is set, else embedded SQLite
+    # (":memory:" for an in-memory store)
+    mongodb_uri: str = os.getenv("MONGODB_URI", "")
+    mongodb_database: str = os.getenv("MONGODB_DATABASE", "bizforge")
+    user_store_sqlite_path: str = os.getenv("USER_STORE_SQLITE_PATH", "data/users.db")
+    
+    # Share one upstream call between concurrent identical requests
+    request_coalescing_enabled: bool = os.getenv("REQUEST_COALESCING_ENABLED", "true").lower() == "true"
+    
+    # Response Cache (exact-match, opt-in per task)
+    response_cache_enabled: bool = os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() == "true"
+    response_cache_tasks: str = os.getenv("RESPONSE_CACHE_TASKS", "sentiment,design")
+    response_cache_ttl: float = float(os.getenv("RESPONSE_CACHE_TTL", "3600"))
+    response_cache_max_entries: int = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "1000"))
+    response_cache_max_bytes: int = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(50 * 1024 * 1024)))
+    response_cache_sqlite_path: str = os.getenv("RESPONSE_CACHE_SQLITE_PATH", "")
+    response_cache_sqlite_max_entries: int = int(os.getenv("RESPONSE_CACHE_SQLITE_MAX_ENTRIES", "10000"))
+    
     # Optional Image Generation
     hf_api_token: Optional[str] = os.getenv("HF_API_TOKEN", None)
     sdxl_model: str = os.getenv("SDXL_MODEL", "stabilityai/stable-diffusion-xl-base-1.0")
@@ -36,9 +147,66 @@ class Settings(BaseSettings):
     # API Configuration
     api_prefix: str = "/api"
     
+    # Batch API
+    batch_max_items: int = int(os.getenv("BATCH_MAX_ITEMS", "500"))
+    batch_max_concurrency: int = int(os.getenv("BATCH_MAX_CONCURRENCY", "8"))
+    
+    # Chat history compaction (older turns folded into a rolling summary)
+    chat_history_token_budget: int = int(os.getenv("CHAT_HISTORY_TOKEN_BUDGET", "3000"))
+    chat_keep_turns: int = int(os.getenv("CHAT_KEEP_TURNS", "4"))
+    chat_summary_stride: int = int(os.getenv("CHAT_SUMMARY_STRIDE", "4"))
+    chat_summary_cache_size: int = int(os.getenv("CHAT_SUMMARY_CACHE_SIZE", "1000"))
+    
+    # Local fast-path sentiment: texts scored below this confidence go to the LLM
+    fast_sentiment_threshold: float = float(os.getenv("FAST_SENTIMENT_THRESHOLD", "0.45"))
+    
+    # Packed multi-text sentiment analysis
+    sentiment_batch_token_budget: int = int(os.getenv("SENTIMENT_BATCH_TOKEN_BUDGET", "3000"))
+    sentiment_batch_max_items: int = int(os.getenv("SENTIMENT_BATCH_MAX_ITEMS", "25"))
+    sentiment_batch_max_retries: int = int(os.getenv("SENTIMENT_BATCH_MAX_RETRIES", "2"))
+    sentiment_batch_concurrency: int = int(os.getenv("SENTIMENT_BATCH_CONCURRENCY", "4"))
+    sentiment_batch_max_texts: int = int(os.getenv("SENTIMENT_BATCH_MAX_TEXTS", "5000"))
+    
+    # Bulk sentiment jobs (CSV / NDJSON uploads)
+    sentiment_jobs_dir: str = os.getenv("SENTIMENT_JOBS_DIR", "data/sentiment_jobs")
+    sentiment_job_workers: int = int(os.getenv("SENTIMENT_JOB_WORKERS", "4"))
+    sentiment_job_chunk_size: int = int(os.getenv("SENTIMENT_JOB_CHUNK_SIZE", "100"))
+    sentiment_job_max_upload_bytes: int = int(os.getenv("SENTIMENT_JOB_MAX_UPLOAD_BYTES", str(1024 * 1024 * 1024)))
+    # Finished jobs (input and results) are deleted this long after they end
+    # (0 keeps them forever)
+    sentiment_job_retention_seconds: float = float(os.getenv("SENTIMENT_JOB_RETENTION_SECONDS", str(7 * 24 * 3600)))
+    
+    @property
+    def cached_tasks(self) -> set:
+        """Tasks whose generations may be served from the response cache."""
+        return {t.strip() for t in self.response_cache_tasks.split(",") if t.strip()}
+    
+    @property
+    def model_routing(self) -> Dict[str, List[str]]:
+        """
+        Ordered candidate models per task or budget key ("content:tagline").
+        The first model is preferred; the rest are fallbacks.
+        """
+        fast, large = self.fast_model_name, self.model_name
+        routes = {
+            "sentiment": [fast, large],
+            "sentiment_batch": [fast, large],
+            "chat_summary": [fast, large],
+            "content:tagline": [fast, large],
+            "content:social_post": [fast, large],
+            "default": [large, fast],
+        }
+        for entry in self.model_routes.split(";"):
+            if "=" in entry:
+                task, models = entry.split("=", 1)
+                routes[task.strip()] = [m.strip() for m in models.split("|") if m.strip()]
+        return routes
+    
     class Config:
         env_file = ".env"
         case_sensitive = False
+        # Settings such as model_name / model_routes are not pydantic internals
+        protected_namespaces = ("settings_",)
 
 
 @lru_cache()
@@ -3,17 +3,53 @@ BizForge - GenAI-Powered Branding & Business Analytics Platform
 Main FastAPI Application Entry Point
 """
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 
 from app.config import get_settings
-from app.routers import brand, content, chat, sentiment, design, logo, users, export
+from app.routers import brand, content, chat, sentiment, design, logo, users, export, batch
+from app.services.ai_service import init_ai_service, close_ai_service, get_ai_service_stats
+from app.services.cache import get_response_cache
+from app.services.cancellation import CancellationMiddleware, get_cancellation_stats
+from app.services.circuit_breaker import get_breaker_stats
+from app.services.export_cache import get_export_cache
+from app.services.logo_derivatives import close_logo_derivatives, get_logo_derivatives
+from app.services.logo_jobs import get_logo_job_manager
+from app.services.pdf_renderer import init_pdf_renderer, close_pdf_renderer, get_pdf_renderer
+from app.services.priority import PriorityMiddleware
+from app.services.sentiment_jobs import get_sentiment_job_manager
+from app.services.stability import init_stability_client, close_stability_client, get_stability_stats
+from app.services.tokens import init_token_counter
+from app.services.user_store import init_user_repository, close_user_repository, get_user_repository
 
 # Get settings
 settings = get_settings()
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Manage shared upstream clients for the lifetime of the application."""
+    await init_token_counter()
+    await init_ai_service()
+    await init_stability_client()
+    await get_sentiment_job_manager().resume_all()
+    await get_logo_job_manager().start()
+    await init_pdf_renderer()
+    await init_user_repository()
+    yield
+    await get_logo_job_manager().shutdown()
+    close_logo_derivatives()
+    close_pdf_renderer()
+    await get_sentiment_job_manager().shutdown()
+    await close_ai_service()
+    await close_stability_client()
+    get_response_cache().close()
+    await close_user_repository()
+
+
 # Initialize FastAPI application
 app = FastAPI(
     title="BizForge API",
@@ -21,6 +57,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 # Configure CORS for frontend integration
@@ -32,6 +69,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Cancel AI work on client disconnect or when X-Deadline-Ms runs out
+app.add_middleware(CancellationMiddleware)
+
+# Assign each request its upstream priority class (X-Priority header);
+# added last so it wraps the cancellation middleware's request task
+app.add_middleware(PriorityMiddleware)
+
 # Include API routers
 app.include_router(brand.router, prefix=settings.api_prefix, tags=["Brand"])
 app.include_router(content.router, prefix=settings.api_prefix, tags=["Content"])
@@ -41,6 +85,7 @@ app.include_router(design.router, prefix=settings.api_prefix, tags=["Design"])
 app.include_router(logo.router, prefix=settings.api_prefix, tags=["Logo"])
 app.include_router(users.router, prefix=settings.api_prefix, tags=["Users"])
 app.include_router(export.router, prefix=settings.api_prefix, tags=["Export"])
+app.include_router(batch.router, prefix=settings.api_prefix, tags=["Batch"])
 
 
 @app.get("/api/config", tags=["Config"])
@@ -52,10 +97,21 @@ async def get_public_config():
 @app.get("/health", tags=["Health"])
 async def health_check():
     """Health check endpoint for monitoring."""
+    breakers = get_breaker_stats()
     return {
-        "status": "healthy",
+        "status": "degraded" if any(b["state"] != "closed" for b in breakers.values()) else "healthy",
         "service": "BizForge API",
-        "model": settings.model_name
+        "model": settings.model_name,
+        "circuit_breakers": breakers,
+        "requests": get_cancellation_stats(),
+        "response_cache": get_response_cache().stats(),
+        "stability_pool": get_stability_stats(),
+        "logo_jobs": get_logo_job_manager().stats(),
+        "logo_derivatives": get_logo_derivatives().stats(),
+        "pdf_renderer": get_pdf_renderer().stats(),
+        "export_cache": get_export_cache().stats(),
+        "user_store": get_user_repository().stats(),
+        **get_ai_service_stats()
     }
 
 
@@ -184,3 +184,29 @@ Generate 3 different logo concept prompts, each with:
 4. **Negative Prompt**: What to avoid in the generation
 
 Format each concept clearly for easy use with AI image generators."""
+
+
+# Batch Sentiment Analysis Prompt (strict JSON output)
+BATCH_SENTIMENT_PROMPT = """Classify the sentiment of each text below for brand/business insights.
+
+Context: {context}
+
+Texts (JSON array of objects with "id" and "text"):
+{items}
+
+Respond with ONLY a JSON object of this exact shape, with one result per input id:
+{{"results": [{{"id": <id>, "label": "positive" | "negative" | "neutral" | "mixed", "confidence": <number between 0 and 1>, "emotions": [<primary emotions>], "key_phrases": [<short phrases copied from the text>]}}]}}
+
+Do not include any text outside the JSON object."""
+
+
+# Conversation Summary Prompt (rolling summary of older chat turns)
+CONVERSATION_SUMMARY_PROMPT = """You maintain a running summary of a branding consultation between a business owner and BizForge AI.
+
+Current summary:
+{summary}
+
+New conversation turns to fold into the summary:
+{turns}
+
+Write the updated summary in under 250 words. Keep every concrete fact about the business (name, industry, audience, goals, constraints), decisions already made, recommendations given, and open questions. Drop greetings and repetition. Respond with the summary only."""
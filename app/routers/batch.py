@@ -0,0 +1,184 @@
+"""
+Batch Generation Router
+API endpoint for running many generation requests in one round trip.
+"""
+
+import asyncio
+import json
+from typing import AsyncIterator, List
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+from app.schemas.models import (
+    BatchRequest, BatchResponse, BatchItemResult, ErrorResponse,
+    BrandNameRequest, ContentRequest, ChatRequest, SentimentRequest, DesignRequest,
+    BrandNameResponse, ContentResponse, ChatResponse, SentimentResponse, DesignResponse
+)
+from app.routers.sentiment import fast_path_response
+from app.services.ai_service import get_ai_service
+from app.config import get_settings
+
+router = APIRouter()
+settings = get_settings()
+
+
+# ============ Sub-request handlers ============
+
+async def _run_brand_name(request: BrandNameRequest) -> BrandNameResponse:
+    suggestions = await get_ai_service().generate_brand_names(
+        industry=request.industry,
+        keywords=request.keywords,
+        style=request.style,
+        target_audience=request.target_audience,
+        context=request.context
+    )
+    return BrandNameResponse(success=True, suggestions=suggestions.text, model_used=suggestions.model)
+
+
+async def _run_content(request: ContentRequest) -> ContentResponse:
+    content = await get_ai_service().generate_marketing_content(
+        brand_name=request.brand_name,
+        brand_description=request.brand_description,
+        content_type=request.content_type,
+        target_audience=request.target_audience,
+        tone=request.tone,
+        key_message=request.key_message,
+        cta=request.cta
+    )
+    return ContentResponse(
+        success=True,
+        content=content.text,
+        content_type=request.content_type,
+        model_used=content.model
+    )
+
+
+async def _run_chat(request: ChatRequest) -> ChatResponse:
+    history = [
+        {"role": msg.role, "content": msg.content}
+        for msg in request.conversation_history
+    ]
+    response = await get_ai_service().chat(
+        message=request.message,
+        conversation_history=history,
+        business_context=request.business_context
+    )
+    return ChatResponse(success=True, response=response.text, model_used=response.model)
+
+
+async def _run_sentiment(request: SentimentRequest) -> SentimentResponse:
+    # Same fast / auto / full handling as /sentiment/analyze
+    fast = fast_path_response(request)
+    if fast is not None:
+        return fast
+    analysis = await get_ai_service().analyze_sentiment(
+        text=request.text,
+        context=request.context
+    )
+    return SentimentResponse(success=True, analysis=analysis.text, model_used=analysis.model)
+
+
+async def _run_design(request: DesignRequest) -> DesignResponse:
+    recommendations = await get_ai_service().generate_color_palette(
+        brand_name=request.brand_name,
+        industry=request.industry,
+        brand_personality=request.brand_personality,
+        target_audience=request.target_audience,
+        mood=request.mood,
+        existing_colors=request.existing_colors
+    )
+    return DesignResponse(success=True, recommendations=recommendations.text, model_used=recommendations.model)
+
+
+HANDLERS = {
+    "brand_name": _run_brand_name,
+    "content": _run_content,
+    "chat": _run_chat,
+    "sentiment": _run_sentiment,
+    "design": _run_design,
+}
+
+
+# ============ Execution ============
+
+async def _run_item(index: int, item, semaphore: asyncio.Semaphore) -> BatchItemResult:
+    """Run one sub-request; failures are captured in the result, never raised."""
+    async with semaphore:
+        try:
+            response = await HANDLERS[item.type](item.request)
+            return BatchItemResult(
+                index=index, id=item.id, type=item.type,
+                success=True, result=response.model_dump()
+            )
+        except Exception as e:
+            return BatchItemResult(
+                index=index, id=item.id, type=item.type,
+                success=False, error=str(e)
+            )
+
+
+def _start(request: BatchRequest) -> List[asyncio.Task]:
+    """Schedule every sub-request, bounded by the batch concurrency."""
+    semaphore = asyncio.Semaphore(min(request.concurrency, settings.batch_max_concurrency))
+    return [
+        asyncio.create_task(_run_item(index, item, semaphore))
+        for index, item in enumerate(request.items)
+    ]
+
+
+async def _ndjson_results(tasks: List[asyncio.Task]) -> AsyncIterator[str]:
+    """Yield results as NDJSON lines in completion order."""
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            result = await next_done
+            yield json.dumps(result.model_dump()) + "\n"
+    finally:
+        # Client went away: stop the remaining work
+        for task in tasks:
+            task.cancel()
+
+
+# ============ Endpoint ============
+
+@router.post(
+    "/batch",
+    response_model=BatchResponse,
+    responses={
+        200: {"content": {"application/x-ndjson": {}}},
+        413: {"model": ErrorResponse}
+    },
+    summary="Batch Generation",
+    description="Run many brand name, content, chat, sentiment and design requests in one call."
+)
+async def run_batch(request: BatchRequest):
+    """
+    Execute a batch of typed sub-requests with bounded concurrency.
+    
+    - **items**: Sub-requests, each with a `type` and a `request` body matching
+      the corresponding single-item endpoint
+    - **concurrency**: Maximum sub-requests run at once (capped server-side)
+    - **stream**: Return NDJSON lines in completion order as items finish
+    
+    A failing item never fails the batch; its result carries `success: false`
+    and the error message.
+    """
+    if len(request.items) > settings.batch_max_items:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large: {len(request.items)} items (max {settings.batch_max_items})"
+        )
+    
+    tasks = _start(request)
+    
+    if request.stream:
+        return StreamingResponse(_ndjson_results(tasks), media_type="application/x-ndjson")
+    
+    results = await asyncio.gather(*tasks)
+    succeeded = sum(1 for r in results if r.success)
+    return BatchResponse(
+        success=succeeded == len(results),
+        total=len(results),
+        succeeded=succeeded,
+        failed=len(results) - succeeded,
+        results=results
+    )
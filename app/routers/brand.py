@@ -3,9 +3,13 @@ Brand Name Generator Router
 API endpoint for generating creative brand names.
 """
 
-from fastapi import APIRouter, HTTPException
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException
 from app.schemas.models import BrandNameRequest, BrandNameResponse, ErrorResponse
 from app.services.ai_service import get_ai_service
+from app.services.errors import AIServiceError
+from app.services.cache import cache_allowed
 from app.config import get_settings
 
 router = APIRouter()
@@ -19,7 +23,10 @@ settings = get_settings()
     summary="Generate Brand Names",
     description="Generate creative, memorable brand name suggestions based on industry, keywords, and style preferences."
 )
-async def generate_brand_name(request: BrandNameRequest):
+async def generate_brand_name(
+    request: BrandNameRequest,
+    cache_control: Optional[str] = Header(default=None)
+):
     """
     Generate brand name suggestions using AI.
     
@@ -31,19 +38,22 @@ async def generate_brand_name(request: BrandNameRequest):
     """
     try:
         ai_service = get_ai_service()
-        suggestions = ai_service.generate_brand_names(
+        suggestions = await ai_service.generate_brand_names(
             industry=request.industry,
             keywords=request.keywords,
             style=request.style,
             target_audience=request.target_audience,
-            context=request.context
+            context=request.context,
+            use_cache=cache_allowed(cache_control)
         )
         
         return BrandNameResponse(
             success=True,
-            suggestions=suggestions,
-            model_used=settings.model_name
+            suggestions=suggestions.text,
+            model_used=suggestions.model
         )
+    except AIServiceError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e), headers=e.headers)
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -4,8 +4,11 @@ API endpoint for conversational branding consultation.
 """
 
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from app.schemas.models import ChatRequest, ChatResponse, ErrorResponse
 from app.services.ai_service import get_ai_service
+from app.services.errors import AIServiceError
+from app.services.streaming import SSE_HEADERS, sse_stream
 from app.config import get_settings
 
 router = APIRouter()
@@ -43,7 +46,7 @@ async def chat(request: ChatRequest):
             for msg in request.conversation_history
         ] if request.conversation_history else []
         
-        response = ai_service.chat(
+        response = await ai_service.chat(
             message=request.message,
             conversation_history=history,
             business_context=request.business_context
@@ -51,11 +54,55 @@ async def chat(request: ChatRequest):
         
         return ChatResponse(
             success=True,
-            response=response,
-            model_used=settings.model_name
+            response=response.text,
+            model_used=response.model
         )
+    except AIServiceError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e), headers=e.headers)
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Chat failed: {str(e)}"
         )
+
+
+@router.post(
+    "/chat/stream",
+    responses={500: {"model": ErrorResponse}},
+    summary="Branding Consultant Chat (Streaming)",
+    description="Same as /chat, but streams the reply as Server-Sent Events."
+)
+async def chat_stream(request: ChatRequest):
+    """
+    Stream the AI branding consultant's reply.
+    
+    Emits `token` events (`{"content": "..."}`) as the reply is generated,
+    then a final `done` event with `model_used`, `usage` and `finish_reason`.
+    """
+    try:
+        ai_service = get_ai_service()
+        
+        history = [
+            {"role": msg.role, "content": msg.content}
+            for msg in request.conversation_history
+        ] if request.conversation_history else []
+        
+        events = ai_service.stream_chat(
+            message=request.message,
+            conversation_history=history,
+            business_context=request.business_context
+        )
+        first_event = await events.__anext__()
+    except AIServiceError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e), headers=e.headers)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Chat failed: {str(e)}"
+        )
+    
+    return StreamingResponse(
+        sse_stream(first_event, events),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS
+    )
@@ -3,9 +3,15 @@ Marketing Content Generator Router
 API endpoint for generating marketing content.
 """
 
-from fastapi import APIRouter, HTTPException
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import StreamingResponse
 from app.schemas.models import ContentRequest, ContentResponse, ErrorResponse
 from app.services.ai_service import get_ai_service
+from app.services.errors import AIServiceError
+from app.services.cache import cache_allowed
+from app.services.streaming import SSE_HEADERS, sse_stream
 from app.config import get_settings
 
 router = APIRouter()
@@ -19,7 +25,10 @@ settings = get_settings()
     summary="Generate Marketing Content",
     description="Generate compelling marketing content including taglines, social posts, emails, and ad copy."
 )
-async def generate_content(request: ContentRequest):
+async def generate_content(
+    request: ContentRequest,
+    cache_control: Optional[str] = Header(default=None)
+):
     """
     Generate marketing content using AI.
     
@@ -33,24 +42,67 @@ async def generate_content(request: ContentRequest):
     """
     try:
         ai_service = get_ai_service()
-        content = ai_service.generate_marketing_content(
+        content = await ai_service.generate_marketing_content(
             brand_name=request.brand_name,
             brand_description=request.brand_description,
             content_type=request.content_type,
             target_audience=request.target_audience,
             tone=request.tone,
             key_message=request.key_message,
-            cta=request.cta
+            cta=request.cta,
+            use_cache=cache_allowed(cache_control)
         )
         
         return ContentResponse(
             success=True,
-            content=content,
+            content=content.text,
+            content_type=request.content_type,
+            model_used=content.model
+        )
+    except AIServiceError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e), headers=e.headers)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to generate content: {str(e)}"
+        )
+
+
+@router.post(
+    "/content/generate/stream",
+    responses={500: {"model": ErrorResponse}},
+    summary="Generate Marketing Content (Streaming)",
+    description="Same as /content/generate, but streams the content as Server-Sent Events."
+)
+async def generate_content_stream(request: ContentRequest):
+    """
+    Stream marketing content as it is generated.
+    
+    Emits `token` events (`{"content": "..."}`) followed by a final `done`
+    event with `content_type`, `model_used`, `usage` and `finish_reason`.
+    """
+    try:
+        ai_service = get_ai_service()
+        events = ai_service.stream_marketing_content(
+            brand_name=request.brand_name,
+            brand_description=request.brand_description,
             content_type=request.content_type,
-            model_used=settings.model_name
+            target_audience=request.target_audience,
+            tone=request.tone,
+            key_message=request.key_message,
+            cta=request.cta
         )
+        first_event = await events.__anext__()
+    except AIServiceError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e), headers=e.headers)
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Failed to generate content: {str(e)}"
         )
+    
+    return StreamingResponse(
+        sse_stream(first_event, events, done_extra={"content_type": request.content_type}),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS
+    )
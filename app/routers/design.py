@@ -3,9 +3,13 @@ Design System / Color Palette Router
 API endpoint for generating design recommendations.
 """
 
-from fastapi import APIRouter, HTTPException
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException
 from app.schemas.models import DesignRequest, DesignResponse, ErrorResponse
 from app.services.ai_service import get_ai_service
+from app.services.errors import AIServiceError
+from app.services.cache import cache_allowed
 from app.config import get_settings
 
 router = APIRouter()
@@ -19,7 +23,10 @@ settings = get_settings()
     summary="Generate Color Palette",
     description="Generate color palette and design system recommendations for your brand."
 )
-async def generate_palette(request: DesignRequest):
+async def generate_palette(
+    request: DesignRequest,
+    cache_control: Optional[str] = Header(default=None)
+):
     """
     Generate design system recommendations.
     
@@ -40,20 +47,23 @@ async def generate_palette(request: DesignRequest):
     """
     try:
         ai_service = get_ai_service()
-        recommendations = ai_service.generate_color_palette(
+        recommendations = await ai_service.generate_color_palette(
             brand_name=request.brand_name,
             industry=request.industry,
             brand_personality=request.brand_personality,
             target_audience=request.target_audience,
             mood=request.mood,
-            existing_colors=request.existing_colors
+            existing_colors=request.existing_colors,
+            use_cache=cache_allowed(cache_control)
         )
         
         return DesignResponse(
             success=True,
-            recommendations=recommendations,
-            model_used=settings.model_name
+            recommendations=recommendations.text,
+            model_used=recommendations.model
         )
+    except AIServiceError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e), headers=e.headers)
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -1,21 +1,47 @@
 """
 BizForge Export API Router
-Handles PDF generation for brand guides.
+Handles PDF generation for brand guides, streamed from the render cache,
+singly or as a bulk ZIP archive.
 """
 
-from fastapi import APIRouter
-from fastapi.responses import StreamingResponse
-from pydantic import BaseModel
-from typing import Optional
-from io import BytesIO
-from reportlab.lib.pagesizes import letter
-from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib.units import inch
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel, Field
+from typing import AsyncIterator, BinaryIO, List, Optional, Tuple
+import asyncio
 import datetime
+import json
+import os
+import re
+
+from app.config import get_settings
+from app.services.blob_store import get_blob_store
+from app.services.coalescing import SingleFlight
+from app.services.errors import AIServiceError
+from app.services.export_cache import get_export_cache
+from app.services.pdf_renderer import brand_guide_key, get_pdf_renderer
+from app.services.zip_stream import ZipStream
 
 router = APIRouter(prefix="/export", tags=["Export"])
+_inflight = SingleFlight()
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Logos served from the blob store: /api/logo/images/<sha256>.png
+LOGO_URL_RE = re.compile(r"/logo/images/([0-9a-f]{64})\.png")
+
+
+class PaletteColor(BaseModel):
+    """A palette swatch."""
+    hex: str = Field(..., description="HEX colour, e.g. #667eea")
+    name: Optional[str] = None
+    usage: Optional[str] = Field(default=None, description="Where the colour is used (backgrounds, CTAs...)")
+
+
+class ContentSample(BaseModel):
+    """Generated content to showcase (e.g. a /content result)."""
+    content_type: str = "sample"
+    content: str
 
 
 class BrandGuideRequest(BaseModel):
@@ -29,126 +55,203 @@ class BrandGuideRequest(BaseModel):
     secondary_color: Optional[str] = None
     font_primary: Optional[str] = None
     font_secondary: Optional[str] = None
+    logo_url: Optional[str] = Field(default=None, description="image_url returned by /logo")
+    palette: Optional[List[PaletteColor]] = None
+    palette_text: Optional[str] = Field(default=None, description="/design/palette recommendations (HEX codes are extracted)")
+    content_samples: Optional[List[ContentSample]] = Field(default=None, max_length=20)
+    sentiment_summary: Optional[str] = Field(default=None, description="Audience sentiment analysis to summarise")
+
+
+def _logo_path(logo_url: Optional[str]) -> Optional[str]:
+    """Blob-store file of a logo generated by /logo (other URLs are ignored)."""
+    match = LOGO_URL_RE.search(logo_url or "")
+    store = get_blob_store()
+    if match is None or not store.exists(match.group(1)):
+        return None
+    return store.path(match.group(1))
+
+
+async def _render_into_cache(data: dict, generated_on: str, key: str) -> None:
+    """Render the PDF straight to a file and commit it to the export cache."""
+    cache = get_export_cache()
+    tmp_path = cache.temp_path(key)
+    try:
+        # Rendered in a worker process so the event loop stays responsive
+        await get_pdf_renderer().render_brand_guide(data, generated_on, tmp_path)
+        await cache.commit(key, tmp_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+async def _open_brand_guide(data: BrandGuideRequest, payload: dict, generated_on: str, key: str) -> BinaryIO:
+    """Open the cached PDF for key, rendering it first on a miss."""
+    cache = get_export_cache()
+    fh = await cache.open(key)
+    if fh is None:
+        render_data = {**payload, "logo_path": _logo_path(data.logo_url)}
+        # Concurrent identical downloads share one render
+        await _inflight.do(key, lambda: _render_into_cache(render_data, generated_on, key))
+        fh = await cache.open(key, count=False)
+        if fh is None:
+            raise RuntimeError("rendered PDF is missing from the export cache")
+    return fh
+
+
+def _pdf_filename(brand_name: str) -> str:
+    # ASCII only: the name also goes into a latin-1 Content-Disposition header
+    safe = re.sub(r"[^\w-]+", "_", brand_name, flags=re.ASCII).strip("_") or "Brand"
+    return f"{safe}_Brand_Guide.pdf"
+
+
+def _attachment(filename: str) -> str:
+    """Content-Disposition for a download (filename from _pdf_filename or similar)."""
+    return f'attachment; filename="{filename}"'
+
+
+async def _iter_file(fh: BinaryIO) -> AsyncIterator[bytes]:
+    """Stream an open file in chunks, closing it at the end."""
+    try:
+        while chunk := await asyncio.to_thread(fh.read, STREAM_CHUNK_SIZE):
+            yield chunk
+    finally:
+        fh.close()
 
 
 @router.post("/brand-bible")
-async def generate_brand_bible(data: BrandGuideRequest):
-    """Generate a PDF brand guide."""
+async def generate_brand_bible(data: BrandGuideRequest, request: Request):
+    """
+    Generate a PDF brand guide.
     
-    buffer = BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=letter, 
-                            rightMargin=72, leftMargin=72,
-                            topMargin=72, bottomMargin=72)
+    Besides the basics, the guide includes whatever generated assets are
+    sent: the logo (`logo_url` from `/logo`), palette swatches (`palette`
+    and/or the `/design/palette` recommendations as `palette_text`),
+    typography specimens, content samples and a sentiment summary.
     
-    styles = getSampleStyleSheet()
+    The response carries a strong ETag; send it back in `If-None-Match` to
+    get 304 Not Modified when nothing (including the month) has changed.
+    Unchanged repeat downloads are streamed from the render cache.
+    """
+    payload = data.model_dump()
+    generated_on = datetime.date.today().strftime('%B %Y')
+    key = brand_guide_key(payload, generated_on)
+    etag = f'"{key}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
     
-    # Custom styles
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=28,
-        spaceAfter=30,
-        textColor=colors.HexColor('#667eea')
-    )
+    # If-None-Match uses the weak comparison (RFC 9110 13.1.2): W/ is ignored
+    # and "*" matches any current representation
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        if "*" in tags or etag in tags:
+            return Response(status_code=304, headers=headers)
     
-    heading_style = ParagraphStyle(
-        'CustomHeading',
-        parent=styles['Heading2'],
-        fontSize=16,
-        spaceAfter=12,
-        textColor=colors.HexColor('#333333')
-    )
+    try:
+        fh = await _open_brand_guide(data, payload, generated_on, key)
+    except AIServiceError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e), headers=e.headers)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"PDF generation failed: {str(e)}")
     
-    body_style = ParagraphStyle(
-        'CustomBody',
-        parent=styles['Normal'],
-        fontSize=11,
-        spaceAfter=8,
-        leading=16
+    return StreamingResponse(
+        _iter_file(fh),
+        media_type="application/pdf",
+        headers={
+            **headers,
+            "Content-Length": str(os.fstat(fh.fileno()).st_size),
+            "Content-Disposition": _attachment(_pdf_filename(data.brand_name))
+        }
     )
+
+
+class BulkBrandGuideRequest(BaseModel):
+    """Brand guides to export as one ZIP archive."""
+    guides: List[BrandGuideRequest] = Field(..., min_length=1)
+
+
+async def _render_entry(index: int, data: BrandGuideRequest, generated_on: str, semaphore: asyncio.Semaphore) -> Tuple[int, str, Optional[BinaryIO], Optional[str]]:
+    """Render one guide of a bulk export: (index, key, open PDF or None, error)."""
+    payload = data.model_dump()
+    key = brand_guide_key(payload, generated_on)
+    async with semaphore:
+        try:
+            return index, key, await _open_brand_guide(data, payload, generated_on, key), None
+        except AIServiceError as e:
+            return index, key, None, str(e)
+        except Exception as e:
+            return index, key, None, f"PDF generation failed: {str(e)}"
+
+
+async def _bulk_archive(guides: List[BrandGuideRequest], generated_on: str) -> AsyncIterator[bytes]:
+    """
+    Stream a ZIP of brand guides, each entry written as soon as its PDF is
+    ready, followed by manifest.json listing every guide's outcome.
+    """
+    semaphore = asyncio.Semaphore(get_settings().bulk_export_concurrency)
+    tasks = [
+        asyncio.create_task(_render_entry(index, guide, generated_on, semaphore))
+        for index, guide in enumerate(guides, 1)
+    ]
+    archive = ZipStream()
+    entries = []
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            index, key, fh, error = await next_done
+            entry = {"index": index, "brand_name": guides[index - 1].brand_name}
+            if fh is None:
+                entry.update(status="failed", error=error)
+            else:
+                # Indexed names keep entries unique and in request order when listed
+                name = f"{index:03d}_{_pdf_filename(guides[index - 1].brand_name)}"
+                try:
+                    size = os.fstat(fh.fileno()).st_size
+                    async for chunk in archive.write_file(name, fh):
+                        yield chunk
+                finally:
+                    fh.close()
+                entry.update(status="ok", file=name, bytes=size, etag=f'"{key}"')
+            entries.append(entry)
+        
+        entries.sort(key=lambda entry: entry["index"])
+        failed = sum(1 for entry in entries if entry["status"] == "failed")
+        manifest = {
+            "generated_on": generated_on,
+            "total": len(entries),
+            "succeeded": len(entries) - failed,
+            "failed": failed,
+            "entries": entries
+        }
+        yield archive.write_bytes("manifest.json", json.dumps(manifest, indent=2).encode("utf-8"))
+        yield archive.close()
+    finally:
+        # Client went away (or we are done): stop pending renders, release open PDFs
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+            elif not task.cancelled() and task.result()[2] is not None:
+                task.result()[2].close()
+
+
+@router.post("/brand-bibles")
+async def export_brand_bibles(data: BulkBrandGuideRequest):
+    """
+    Export many brand guides as one ZIP archive.
     
-    story = []
-    
-    # Title
-    story.append(Paragraph(f"{data.brand_name} Brand Guide", title_style))
-    story.append(Paragraph(f"Generated by BizForge • {datetime.date.today().strftime('%B %Y')}", 
-                           styles['Italic']))
-    story.append(Spacer(1, 30))
-    
-    # Tagline
-    if data.tagline:
-        story.append(Paragraph("Tagline", heading_style))
-        story.append(Paragraph(f'"{data.tagline}"', body_style))
-        story.append(Spacer(1, 20))
-    
-    # About
-    if data.description:
-        story.append(Paragraph("Brand Description", heading_style))
-        story.append(Paragraph(data.description, body_style))
-        story.append(Spacer(1, 20))
-    
-    # Industry
-    if data.industry:
-        story.append(Paragraph("Industry", heading_style))
-        story.append(Paragraph(data.industry.title(), body_style))
-        story.append(Spacer(1, 20))
-    
-    # Brand Voice
-    if data.brand_voice:
-        story.append(Paragraph("Brand Voice DNA", heading_style))
-        voice_data = [
-            ["Personality", data.brand_voice.get('personality', 'Not specified')],
-            ["Tone", data.brand_voice.get('tone', 'Not specified')],
-            ["Target Audience", data.brand_voice.get('target_audience', 'Not specified')],
-        ]
-        voice_table = Table(voice_data, colWidths=[2*inch, 4*inch])
-        voice_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#f8f9fa')),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.HexColor('#333333')),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
-            ('TOPPADDING', (0, 0), (-1, -1), 10),
-            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#dee2e6')),
-        ]))
-        story.append(voice_table)
-        story.append(Spacer(1, 20))
-    
-    # Colors
-    if data.primary_color or data.secondary_color:
-        story.append(Paragraph("Color Palette", heading_style))
-        colors_text = []
-        if data.primary_color:
-            colors_text.append(f"Primary: {data.primary_color}")
-        if data.secondary_color:
-            colors_text.append(f"Secondary: {data.secondary_color}")
-        story.append(Paragraph(" | ".join(colors_text), body_style))
-        story.append(Spacer(1, 20))
-    
-    # Typography
-    if data.font_primary or data.font_secondary:
-        story.append(Paragraph("Typography", heading_style))
-        if data.font_primary:
-            story.append(Paragraph(f"Primary Font: {data.font_primary}", body_style))
-        if data.font_secondary:
-            story.append(Paragraph(f"Secondary Font: {data.font_secondary}", body_style))
-        story.append(Spacer(1, 20))
-    
-    # Footer
-    story.append(Spacer(1, 40))
-    story.append(Paragraph("—", styles['Normal']))
-    story.append(Paragraph("This brand guide was generated using BizForge AI Branding Suite.", 
-                           styles['Italic']))
-    
-    # Build PDF
-    doc.build(story)
-    buffer.seek(0)
+    Guides are rendered in parallel across the PDF worker processes and the
+    archive is streamed entry by entry as each PDF completes, so entries
+    appear in completion order (file names carry the request index). The
+    last entry, `manifest.json`, lists every guide with its status; a guide
+    that fails to render is reported there instead of failing the export.
+    """
+    max_guides = get_settings().bulk_export_max_guides
+    if len(data.guides) > max_guides:
+        raise HTTPException(status_code=413, detail=f"At most {max_guides} brand guides per export")
     
-    filename = f"{data.brand_name.replace(' ', '_')}_Brand_Guide.pdf"
+    generated_on = datetime.date.today().strftime('%B %Y')
+    filename = f"Brand_Guides_{datetime.date.today().isoformat()}.zip"
     
     return StreamingResponse(
-        buffer,
-        media_type="application/pdf",
-        headers={"Content-Disposition": f"attachment; filename={filename}"}
+        _bulk_archive(data.guides, generated_on),
+        media_type="application/zip",
+        headers={"Content-Disposition": _attachment(filename)}
     )
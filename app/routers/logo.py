@@ -1,17 +1,62 @@
 """
 Logo Generator Router
-API endpoint for generating logos using Stability AI SDXL.
+API endpoints for generating logos using Stability AI SDXL (directly or as
+background jobs) and serving the generated images.
 """
 
-from fastapi import APIRouter, HTTPException
-from app.schemas.models import LogoPromptRequest, LogoPromptResponse, ErrorResponse
+import asyncio
+import re
+from typing import Optional, Tuple
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import FileResponse, Response, StreamingResponse
+from app.schemas.models import (
+    LogoPromptRequest, LogoPromptResponse, LogoJobResponse, LogoVariantsResponse, ErrorResponse
+)
 from app.config import get_settings
-import base64
-import httpx
+from app.services.blob_store import get_blob_store
+from app.services.errors import AIServiceError
+from app.services.logo_derivatives import get_logo_derivatives
+from app.services.logo_jobs import (
+    LOGO_MODEL_NAME, LogoJobState, build_logo_payload, get_logo_job_manager, image_url, render_logo,
+    variant_urls
+)
+from app.services.streaming import SSE_HEADERS, format_sse
 
 router = APIRouter()
 settings = get_settings()
 
+# Served image types by file extension
+IMAGE_TYPES = {"png": "image/png", "webp": "image/webp", "ico": "image/x-icon"}
+
+# Blobs never change, so clients and CDNs may keep them forever
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def _parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single "bytes=" range into (start, end) inclusive.
+    Returns None for unsupported forms (e.g. multiple ranges), which are
+    answered with the full image; raises ValueError if unsatisfiable.
+    """
+    match = _RANGE_RE.match(header.strip())
+    if match is None or match.groups() == ("", ""):
+        return None
+    first, last = match.groups()
+    if first == "":
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            raise ValueError("empty suffix range")
+        return max(0, size - length), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError("range not satisfiable")
+    return start, end
+
 
 @router.post(
     "/logo/prompt",
@@ -23,49 +68,22 @@ settings = get_settings()
 async def generate_logo_prompt(request: LogoPromptRequest):
     """
     Generate logo design using Stability AI SDXL.
+    
+    Holds the request open while the image renders; use `/logo/jobs` to
+    render in the background instead.
     """
     try:
-        # Construct optimized logo prompt
-        image_prompt = f"{request.style} logo for {request.brand_name}, {request.industry}, vector art, minimal, clean white background, high quality, professional design, centered"
-        
         image_url = ""
+        variants = None
         model_used = "unknown"
         
         # Primary: Stability AI SDXL (requires STABILITY_API_KEY)
         if settings.stability_api_key:
             try:
-                # print(f"🎨 Generating logo with Stability AI SDXL...")
-                stability_api_url = "https://api.stability.ai/v1/generation/stable-diffusion-xl-1024-v1-0/text-to-image"
-                headers = {
-                    "Content-Type": "application/json",
-                    "Accept": "application/json",
-                    "Authorization": f"Bearer {settings.stability_api_key}",
-                }
-                payload = {
-                    "text_prompts": [
-                        {"text": image_prompt, "weight": 1},
-                        {"text": "blurry, low quality, distorted, text", "weight": -1}  # Negative prompt
-                    ],
-                    "cfg_scale": 7,
-                    "height": 1024,
-                    "width": 1024,
-                    "samples": 1,
-                    "steps": 30,
-                    "style_preset": "digital-art"
-                }
-                
-                async with httpx.AsyncClient() as client:
-                    response = await client.post(stability_api_url, headers=headers, json=payload, timeout=60.0)
-                    
-                    if response.status_code == 200:
-                        data = response.json()
-                        base64_image = data["artifacts"][0]["base64"]
-                        image_url = f"data:image/png;base64,{base64_image}"
-                        model_used = "Stability AI SDXL"
-                        # print(f"✅ Stability AI SDXL generated logo successfully")
-                    else:
-                        error_text = response.text[:300] if response.text else "Unknown error"
-                        print(f"⚠️ Stability AI Error {response.status_code}: {error_text}")
+                # Shared pooled client; fails fast (placeholder below) while
+                # Stability AI is degraded or the pool is saturated
+                image_url, variants = await render_logo(build_logo_payload(request))
+                model_used = LOGO_MODEL_NAME
             except Exception as e:
                 print(f"❌ Stability AI Exception: {e}")
         
@@ -79,6 +97,7 @@ async def generate_logo_prompt(request: LogoPromptRequest):
             success=True,
             prompts=None,
             image_url=image_url,
+            variants=variants,
             model_used=model_used
         )
     except Exception as e:
@@ -86,3 +105,177 @@ async def generate_logo_prompt(request: LogoPromptRequest):
             status_code=500,
             detail=f"Logo generation failed: {str(e)}"
         )
+
+
+def _job_response(state: LogoJobState, deduplicated: bool = False) -> LogoJobResponse:
+    return LogoJobResponse(
+        success=state.status != "failed",
+        job_id=state.job_id,
+        status=state.status,
+        preview_url=state.preview_url,
+        image_url=state.image_url,
+        variants=state.variants or None,
+        model_used=state.model_used,
+        error=state.error,
+        deduplicated=deduplicated
+    )
+
+
+@router.post(
+    "/logo/jobs",
+    response_model=LogoJobResponse,
+    status_code=202,
+    responses={503: {"model": ErrorResponse}},
+    summary="Start Logo Job",
+    description="Queue a logo for background rendering and return its job ID immediately."
+)
+async def create_logo_job(request: LogoPromptRequest, progressive: bool = False):
+    """
+    Queue a logo render.
+    
+    - **progressive**: Render a fast low-step preview first (`preview_ready`
+      with `preview_url`), then the full-quality image with the same seed
+    
+    Follow progress by polling `/logo/jobs/{job_id}` or by subscribing to
+    `/logo/jobs/{job_id}/events` (SSE). An identical prompt returns the job
+    still queued or rendering (`deduplicated: true`); once that job has
+    finished, the same prompt renders a new variation.
+    """
+    if not settings.stability_api_key:
+        raise HTTPException(status_code=503, detail="Logo generation is not configured (STABILITY_API_KEY)")
+    try:
+        state, deduplicated = get_logo_job_manager().create(request, progressive=progressive)
+    except AIServiceError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e), headers=e.headers)
+    return _job_response(state, deduplicated)
+
+
+@router.get(
+    "/logo/jobs/{job_id}",
+    response_model=LogoJobResponse,
+    responses={404: {"model": ErrorResponse}},
+    summary="Logo Job Status"
+)
+async def get_logo_job(job_id: str):
+    """Get the status (and, once done, the image URL) of a logo job."""
+    state = get_logo_job_manager().get(job_id)
+    if state is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return _job_response(state)
+
+
+@router.get(
+    "/logo/jobs/{job_id}/events",
+    responses={200: {"content": {"text/event-stream": {}}}, 404: {"model": ErrorResponse}},
+    summary="Logo Job Events",
+    description="Server-Sent Events: one event per status change (queued, previewing, preview_ready, rendering, done, failed)."
+)
+async def stream_logo_job(job_id: str):
+    """
+    Stream a logo job's status.
+    
+    Each event is named after the status and carries the same body as
+    `/logo/jobs/{job_id}`; the stream ends after `done` or `failed`.
+    """
+    manager = get_logo_job_manager()
+    if manager.get(job_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    async def events():
+        async for state in manager.events(job_id):
+            if state is None:
+                yield ": keep-alive\n\n"
+            else:
+                yield format_sse(state.status, _job_response(state).model_dump())
+    
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
+@router.get(
+    "/logo/images/{name}",
+    responses={
+        200: {"content": {"image/png": {}}},
+        206: {"description": "Partial content (Range request)"},
+        304: {"description": "Not modified"},
+        404: {"model": ErrorResponse}
+    },
+    summary="Get Logo Image",
+    description="Serve a generated image by content hash. Supports ETag revalidation and byte ranges."
+)
+async def get_logo_image(name: str, request: Request):
+    """
+    Serve a stored image.
+    
+    - **name**: `<sha256>.<ext>` as returned in `image_url`
+    """
+    digest, _, ext = name.partition(".")
+    content_type = IMAGE_TYPES.get(ext)
+    store = get_blob_store()
+    if content_type is None or not store.exists(digest):
+        raise HTTPException(status_code=404, detail="Image not found")
+    # The extension must name the stored format, or the long-lived cached
+    # response would carry the wrong Content-Type
+    if await asyncio.to_thread(store.image_type, digest) != ext:
+        raise HTTPException(status_code=404, detail="Image not found")
+    
+    etag = f'"{digest}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": IMMUTABLE_CACHE_CONTROL,
+        "Accept-Ranges": "bytes"
+    }
+    
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        if "*" in tags or etag in tags:
+            return Response(status_code=304, headers=headers)
+    
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and (if_range is None or if_range.strip() == etag):
+        size = store.size(digest)
+        try:
+            byte_range = _parse_range(range_header, size)
+        except ValueError:
+            return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+        if byte_range is not None:
+            start, end = byte_range
+            body = await asyncio.to_thread(store.read, digest, start, end - start + 1)
+            return Response(
+                content=body,
+                status_code=206,
+                media_type=content_type,
+                headers={**headers, "Content-Range": f"bytes {start}-{end}/{size}"}
+            )
+    
+    return FileResponse(store.path(digest), media_type=content_type, headers=headers)
+
+
+@router.get(
+    "/logo/images/{name}/variants",
+    response_model=LogoVariantsResponse,
+    responses={404: {"model": ErrorResponse}, 503: {"model": ErrorResponse}},
+    summary="Get Logo Variants",
+    description="Thumbnails (PNG/WebP), favicon and social-card images derived from a logo."
+)
+async def get_logo_variants(name: str):
+    """
+    List a logo's derived images, rendering them on first request.
+    
+    - **name**: the logo's `<sha256>` or `<sha256>.png`
+    
+    Pick the variant for the slot: `64.webp`-`512.webp` (or `.png`) for
+    previews, `favicon.ico`, and `og.png` / `twitter.png` / `square.png`
+    for social cards.
+    """
+    digest = name.partition(".")[0]
+    if not get_blob_store().exists(digest):
+        raise HTTPException(status_code=404, detail="Image not found")
+    if not get_logo_derivatives().available:
+        raise HTTPException(status_code=503, detail="Image processing (Pillow) is not installed")
+    try:
+        variants = await variant_urls(digest)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Variant generation failed: {str(e)}")
+    return LogoVariantsResponse(success=True, image_url=image_url(digest), variants=variants)
@@ -3,15 +3,44 @@ Sentiment Analysis Router
 API endpoint for analyzing text sentiment.
 """
 
-from fastapi import APIRouter, HTTPException
-from app.schemas.models import SentimentRequest, SentimentResponse, ErrorResponse
+import os
+from typing import Literal, Optional
+
+from fastapi import APIRouter, File, Form, Header, HTTPException, UploadFile
+from fastapi.responses import StreamingResponse
+from app.schemas.models import (
+    SentimentRequest, SentimentResponse, ErrorResponse,
+    SentimentBatchRequest, SentimentBatchResponse, SentimentBatchResult,
+    SentimentJobResponse
+)
 from app.services.ai_service import get_ai_service
+from app.services.errors import AIServiceError
+from app.services.cache import cache_allowed
+from app.services.sentiment_jobs import JobState, get_sentiment_job_manager
+from app.services.fast_sentiment import FAST_MODEL_NAME, needs_escalation, render_analysis, score_texts
 from app.config import get_settings
 
 router = APIRouter()
 settings = get_settings()
 
 
+def fast_path_response(request: SentimentRequest) -> Optional[SentimentResponse]:
+    """The local scorer's answer, unless the request's mode calls for the LLM."""
+    if request.mode == "full":
+        return None
+    local = score_texts([request.text])[0]
+    if request.mode == "auto" and needs_escalation(local, settings.fast_sentiment_threshold):
+        return None
+    return SentimentResponse(
+        success=True,
+        analysis=render_analysis(local),
+        model_used=FAST_MODEL_NAME,
+        sentiment=local.label,
+        confidence=local.confidence,
+        mode_used="fast"
+    )
+
+
 @router.post(
     "/sentiment/analyze",
     response_model=SentimentResponse,
@@ -19,12 +48,17 @@ settings = get_settings()
     summary="Analyze Sentiment",
     description="Analyze sentiment and emotional tone of text for brand and business insights."
 )
-async def analyze_sentiment(request: SentimentRequest):
+async def analyze_sentiment(
+    request: SentimentRequest,
+    cache_control: Optional[str] = Header(default=None)
+):
     """
     Analyze text sentiment for brand insights.
     
     - **text**: The text to analyze (customer reviews, social mentions, feedback, etc.)
     - **context**: Context for analysis (helps improve accuracy)
+    - **mode**: `fast` (local scorer), `full` (LLM) or `auto` (local first,
+      LLM only for low-confidence or mixed text)
     
     Returns:
     - Overall sentiment (Positive/Negative/Neutral/Mixed)
@@ -32,21 +66,207 @@ async def analyze_sentiment(request: SentimentRequest):
     - Brand implications
     - Key phrases
     - Actionable recommendations
+    
+    Fast-path answers carry `sentiment` and `confidence` and a short analysis.
     """
+    fast = fast_path_response(request)
+    if fast is not None:
+        return fast
+    
     try:
         ai_service = get_ai_service()
-        analysis = ai_service.analyze_sentiment(
+        analysis = await ai_service.analyze_sentiment(
             text=request.text,
-            context=request.context
+            context=request.context,
+            use_cache=cache_allowed(cache_control)
         )
         
         return SentimentResponse(
             success=True,
-            analysis=analysis,
-            model_used=settings.model_name
+            analysis=analysis.text,
+            model_used=analysis.model
+        )
+    except AIServiceError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e), headers=e.headers)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Sentiment analysis failed: {str(e)}"
+        )
+
+
+@router.post(
+    "/sentiment/analyze-batch",
+    response_model=SentimentBatchResponse,
+    responses={413: {"model": ErrorResponse}, 500: {"model": ErrorResponse}},
+    summary="Analyze Sentiment (Batch)",
+    description="Classify many short texts at once, packing several texts into each LLM call."
+)
+async def analyze_sentiment_batch(request: SentimentBatchRequest):
+    """
+    Classify the sentiment of many texts.
+    
+    - **texts**: The texts to classify (reviews, mentions, feedback, ...)
+    - **context**: Context for analysis
+    - **mode**: `fast`, `full` or `auto` (see /sentiment/analyze)
+    
+    Returns one structured result per text, in request order:
+    label (positive/negative/neutral/mixed), confidence (0-1), emotions
+    and key phrases. Texts the model could not classify are reported
+    individually with `success: false`.
+    """
+    if len(request.texts) > settings.sentiment_batch_max_texts:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Too many texts: {len(request.texts)} (max {settings.sentiment_batch_max_texts})"
         )
+    
+    try:
+        ai_service = get_ai_service()
+        models_used = set()
+        outcomes = await ai_service.analyze_sentiment_batch(
+            texts=request.texts,
+            context=request.context,
+            mode=request.mode,
+            models_used=models_used
+        )
+    except AIServiceError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e), headers=e.headers)
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Sentiment analysis failed: {str(e)}"
         )
+    
+    results = [
+        SentimentBatchResult(index=i, success=True, sentiment=outcome)
+        if not isinstance(outcome, str)
+        else SentimentBatchResult(index=i, success=False, error=outcome)
+        for i, outcome in enumerate(outcomes)
+    ]
+    return SentimentBatchResponse(
+        success=all(r.success for r in results),
+        results=results,
+        model_used=", ".join(sorted(models_used)) or FAST_MODEL_NAME
+    )
+
+
+# ============ Bulk sentiment jobs ============
+
+JOB_FORMATS = {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson"}
+
+
+def _job_response(state: JobState) -> SentimentJobResponse:
+    return SentimentJobResponse(
+        success=state.status != "failed",
+        job_id=state.job_id,
+        status=state.status,
+        format=state.format,
+        records_done=state.records_done,
+        records_failed=state.records_failed,
+        bytes_processed=state.offset,
+        bytes_total=state.bytes_total,
+        progress=round(state.offset / state.bytes_total, 4) if state.bytes_total else 1.0,
+        results_bytes=state.results_bytes,
+        error=state.error
+    )
+
+
+@router.post(
+    "/sentiment/jobs",
+    response_model=SentimentJobResponse,
+    status_code=202,
+    responses={400: {"model": ErrorResponse}, 413: {"model": ErrorResponse}},
+    summary="Start Bulk Sentiment Job",
+    description="Upload a CSV or NDJSON file of texts and analyze all of them in the background."
+)
+async def create_sentiment_job(
+    file: UploadFile = File(..., description="CSV (with header row) or NDJSON file"),
+    context: str = Form(default="general brand feedback"),
+    text_field: str = Form(default="text", description="Column / key holding the text"),
+    id_field: str = Form(default="id", description="Optional column / key echoed in results"),
+    mode: Literal["fast", "full", "auto"] = Form(default="auto", description="fast, full or auto"),
+    format: Optional[str] = Form(default=None, description="csv or ndjson (inferred from filename)")
+):
+    """
+    Start a bulk sentiment job.
+    
+    The upload is written to disk as it arrives and parsed as a stream, so
+    files of any size are processed with flat memory use. Poll
+    `/sentiment/jobs/{job_id}` for progress and download results as they
+    are committed from `/sentiment/jobs/{job_id}/results`.
+    """
+    fmt = format or JOB_FORMATS.get(os.path.splitext(file.filename or "")[1].lower())
+    if fmt not in ("csv", "ndjson"):
+        raise HTTPException(
+            status_code=400,
+            detail="Unsupported file format: upload .csv or .ndjson, or set format"
+        )
+    
+    try:
+        state = await get_sentiment_job_manager().create(
+            upload=file,
+            fmt=fmt,
+            context=context,
+            text_field=text_field,
+            id_field=id_field,
+            mode=mode
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    
+    return _job_response(state)
+
+
+@router.get(
+    "/sentiment/jobs/{job_id}",
+    response_model=SentimentJobResponse,
+    responses={404: {"model": ErrorResponse}},
+    summary="Bulk Sentiment Job Status"
+)
+async def get_sentiment_job(job_id: str):
+    """Get the status and progress of a bulk sentiment job."""
+    state = get_sentiment_job_manager().get(job_id)
+    if state is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return _job_response(state)
+
+
+@router.get(
+    "/sentiment/jobs/{job_id}/results",
+    responses={200: {"content": {"application/x-ndjson": {}}}, 404: {"model": ErrorResponse}},
+    summary="Download Bulk Sentiment Results",
+    description="Download committed results as NDJSON, starting at a byte offset."
+)
+async def get_sentiment_job_results(job_id: str, offset: int = 0):
+    """
+    Download results committed so far.
+    
+    - **offset**: Byte offset to start from. Pass the `X-Next-Offset` value
+      of the previous response to fetch only new results while the job runs.
+    """
+    manager = get_sentiment_job_manager()
+    state = manager.get(job_id)
+    if state is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    start = max(0, min(offset, state.results_bytes))
+    end = state.results_bytes
+    path = manager.results_path(state.job_id)
+    
+    def read_range():
+        with open(path, "rb") as fh:
+            fh.seek(start)
+            remaining = end - start
+            while remaining > 0:
+                chunk = fh.read(min(64 * 1024, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+    
+    return StreamingResponse(
+        read_range(),
+        media_type="application/x-ndjson",
+        headers={"X-Next-Offset": str(end), "X-Job-Status": state.status}
+    )
@@ -1,13 +1,22 @@
 """
 BizForge Users API Router
-Handles user sync and profile endpoints (no database - uses client-side storage).
+Handles user sync, profile, brand voice and generation history endpoints.
+
+Every endpoint acts as the user named by the Google ID token sent as
+`Authorization: Bearer <token>`; the token is verified against Google's
+keys and GOOGLE_CLIENT_ID.
 """
 
-from fastapi import APIRouter
-from pydantic import BaseModel, EmailStr
-from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from pydantic import BaseModel, EmailStr, Field
+from typing import Any, List, Optional
+
+from app.services.google_auth import SignInUnavailable, verify_google_id_token
+from app.services.user_store import get_user_repository
 
 router = APIRouter(prefix="/users", tags=["Users"])
+_bearer = HTTPBearer(auto_error=False, description="Google ID token from Google Sign-In")
 
 
 # ============ Schemas ============
@@ -28,46 +37,104 @@ class BrandVoice(BaseModel):
     tone: Optional[str] = None
 
 
+class GenerationCreate(BaseModel):
+    """A generation to add to the user's history."""
+    generation_type: str = Field(..., description="brand, content, logo, design, sentiment...")
+    input: Optional[dict] = Field(default=None, description="Request that produced the output")
+    output: Any = Field(..., description="Generated result")
+
+
+class Generation(GenerationCreate):
+    """A stored generation."""
+    id: str
+    created_at: float
+
+
+class GenerationPage(BaseModel):
+    """A page of generation history, newest first."""
+    generations: List[Generation]
+    next_cursor: Optional[str] = Field(default=None, description="Pass as `cursor` for the next page; null on the last page")
+
+
+# ============ Authentication ============
+
+async def current_google_id(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(_bearer)
+) -> str:
+    """The signed-in user's Google ID (`sub`), taken from a verified ID token."""
+    unauthorized = {"WWW-Authenticate": "Bearer"}
+    if credentials is None:
+        raise HTTPException(status_code=401, detail="Missing Google ID token", headers=unauthorized)
+    try:
+        claims = await verify_google_id_token(credentials.credentials)
+    except SignInUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=401, detail=f"Invalid Google ID token: {e}", headers=unauthorized)
+    return claims["sub"]
+
+
 # ============ Endpoints ============
 
 @router.post("/sync", response_model=dict)
-async def sync_user(user_data: UserSync):
-    """
-    Sync user on login.
-    Note: Database removed - user data is stored client-side in localStorage.
-    """
+async def sync_user(user_data: UserSync, google_id: str = Depends(current_google_id)):
+    """Sync user on login (creates the user on first sign-in)."""
+    if user_data.google_id != google_id:
+        raise HTTPException(status_code=403, detail="google_id does not match the signed-in user")
+    is_new = await get_user_repository().upsert_user(
+        user_data.google_id, user_data.email, user_data.name, user_data.picture
+    )
     return {
         "status": "ok",
-        "message": "User synced (client-side storage)",
-        "is_new": False
+        "message": "User created" if is_new else "User synced",
+        "is_new": is_new
     }
 
 
 @router.get("/me")
-async def get_current_user(google_id: str):
+async def get_current_user(google_id: str = Depends(current_google_id)):
     """Get current user's profile."""
-    # No database - return minimal success response
-    # Frontend handles user data via localStorage
-    return {
-        "status": "ok",
-        "message": "Use client-side storage for user data"
-    }
+    user = await get_user_repository().get_user(google_id)
+    if user is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    return {"status": "ok", "user": user}
 
 
 @router.put("/me/brand-voice")
-async def update_brand_voice(google_id: str, brand_voice: BrandVoice):
+async def update_brand_voice(brand_voice: BrandVoice, google_id: str = Depends(current_google_id)):
     """Update user's brand voice settings."""
-    # No database - frontend handles this via localStorage
-    return {"status": "ok", "message": "Brand voice updated (client-side)"}
+    await get_user_repository().set_brand_voice(google_id, brand_voice.model_dump())
+    return {"status": "ok", "message": "Brand voice updated"}
 
 
 @router.get("/me/brand-voice")
-async def get_brand_voice(google_id: str):
+async def get_brand_voice(google_id: str = Depends(current_google_id)):
     """Get user's brand voice settings."""
-    return {"brand_voice": None}
+    return {"brand_voice": await get_user_repository().get_brand_voice(google_id)}
 
 
-@router.get("/me/generations")
-async def get_generations(google_id: str, limit: int = 20):
-    """Get user's generation history."""
-    return {"generations": []}
+@router.post("/me/generations", response_model=Generation, status_code=201)
+async def add_generation(generation: GenerationCreate, google_id: str = Depends(current_google_id)):
+    """Add a generation to the user's history."""
+    return await get_user_repository().add_generation(
+        google_id, generation.generation_type, generation.input, generation.output
+    )
+
+
+@router.get("/me/generations", response_model=GenerationPage)
+async def get_generations(
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    google_id: str = Depends(current_google_id)
+):
+    """
+    Get user's generation history, newest first.
+
+    Pages are cursor-based: follow `next_cursor` until it is null. Every
+    page costs the same however deep into the history it is.
+    """
+    try:
+        generations, next_cursor = await get_user_repository().list_generations(google_id, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"generations": generations, "next_cursor": next_cursor}
@@ -3,7 +3,7 @@ BizForge Pydantic Schemas
 Request and Response models for clean API contracts.
 """
 
-from typing import List, Optional
+from typing import Annotated, Dict, List, Literal, Optional, Union
 from pydantic import BaseModel, Field
 
 
@@ -125,12 +125,17 @@ class SentimentRequest(BaseModel):
         default="general brand feedback",
         description="Context for analysis (e.g., customer review, social mention)"
     )
+    mode: Literal["fast", "full", "auto"] = Field(
+        default="auto",
+        description="fast: local scorer only; full: LLM analysis; auto: local first, LLM for low-confidence or mixed text"
+    )
 
     class Config:
         json_schema_extra = {
             "example": {
                 "text": "I absolutely love the new product design! It's intuitive and beautiful. However, the shipping took longer than expected.",
-                "context": "Customer product review"
+                "context": "Customer product review",
+                "mode": "auto"
             }
         }
 
@@ -140,6 +145,73 @@ class SentimentResponse(BaseModel):
     success: bool
     analysis: str
     model_used: str
+    sentiment: Optional[str] = Field(default=None, description="Label from the local scorer (fast path only)")
+    confidence: Optional[float] = Field(default=None, description="Local scorer confidence (fast path only)")
+    mode_used: str = Field(default="full", description="fast or full")
+
+
+class SentimentBatchRequest(BaseModel):
+    """Request model for packed multi-text sentiment analysis."""
+    texts: List[str] = Field(..., description="Texts to classify", min_length=1)
+    context: str = Field(
+        default="general brand feedback",
+        description="Context for analysis (e.g., customer review, social mention)"
+    )
+    mode: Literal["fast", "full", "auto"] = Field(
+        default="auto",
+        description="fast: local scorer only; full: LLM for every text; auto: LLM only for low-confidence or mixed texts"
+    )
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "texts": [
+                    "Absolutely love it, best purchase this year!",
+                    "Arrived broken and support never replied.",
+                    "It's fine. Does what it says."
+                ],
+                "context": "Customer product reviews",
+                "mode": "auto"
+            }
+        }
+
+
+class SentimentLabel(BaseModel):
+    """Structured sentiment for a single text."""
+    label: Literal["positive", "negative", "neutral", "mixed"]
+    confidence: float = Field(..., ge=0, le=1)
+    emotions: List[str] = Field(default=[])
+    key_phrases: List[str] = Field(default=[])
+
+
+class SentimentBatchResult(BaseModel):
+    """Outcome for one text of a batch (in request order)."""
+    index: int
+    success: bool
+    sentiment: Optional[SentimentLabel] = None
+    error: Optional[str] = None
+
+
+class SentimentBatchResponse(BaseModel):
+    """Response model for packed multi-text sentiment analysis."""
+    success: bool
+    results: List[SentimentBatchResult]
+    model_used: str
+
+
+class SentimentJobResponse(BaseModel):
+    """Status and progress of a bulk sentiment job."""
+    success: bool
+    job_id: str
+    status: str = Field(..., description="queued, running, completed or failed")
+    format: str
+    records_done: int
+    records_failed: int
+    bytes_processed: int
+    bytes_total: int
+    progress: float = Field(..., description="Fraction of the input processed (0-1)")
+    results_bytes: int = Field(..., description="Bytes of results available for download")
+    error: Optional[str] = None
 
 
 # ============== Design System / Color Palette ==============
@@ -220,9 +292,124 @@ class LogoPromptResponse(BaseModel):
     success: bool
     prompts: Optional[str] = None
     image_url: Optional[str] = None
+    variants: Optional[Dict[str, str]] = Field(
+        default=None, description="Derived image URLs by name (\"256.webp\", \"favicon.ico\", \"og.png\")"
+    )
     model_used: str
 
 
+class LogoJobResponse(BaseModel):
+    """Status of a background logo job."""
+    success: bool
+    job_id: str
+    status: str = Field(..., description="queued, previewing, preview_ready, rendering, done or failed")
+    preview_url: Optional[str] = Field(default=None, description="Low-step preview (progressive jobs)")
+    image_url: Optional[str] = Field(default=None, description="Set once the job is done")
+    variants: Optional[Dict[str, str]] = Field(default=None, description="Derived image URLs by name")
+    model_used: Optional[str] = None
+    error: Optional[str] = None
+    deduplicated: bool = Field(default=False, description="True if an identical prompt's job was returned")
+
+
+class LogoVariantsResponse(BaseModel):
+    """Derived images of a stored logo."""
+    success: bool
+    image_url: str
+    variants: Dict[str, str] = Field(..., description="Image URLs by variant name")
+
+
+# ============== Batch ==============
+
+class BrandNameBatchItem(BaseModel):
+    """Batch sub-request for brand name generation."""
+    type: Literal["brand_name"]
+    id: Optional[str] = Field(default=None, description="Client-supplied id echoed in the result")
+    request: BrandNameRequest
+
+
+class ContentBatchItem(BaseModel):
+    """Batch sub-request for marketing content generation."""
+    type: Literal["content"]
+    id: Optional[str] = Field(default=None, description="Client-supplied id echoed in the result")
+    request: ContentRequest
+
+
+class ChatBatchItem(BaseModel):
+    """Batch sub-request for a chatbot turn."""
+    type: Literal["chat"]
+    id: Optional[str] = Field(default=None, description="Client-supplied id echoed in the result")
+    request: ChatRequest
+
+
+class SentimentBatchItem(BaseModel):
+    """Batch sub-request for sentiment analysis."""
+    type: Literal["sentiment"]
+    id: Optional[str] = Field(default=None, description="Client-supplied id echoed in the result")
+    request: SentimentRequest
+
+
+class DesignBatchItem(BaseModel):
+    """Batch sub-request for design system recommendations."""
+    type: Literal["design"]
+    id: Optional[str] = Field(default=None, description="Client-supplied id echoed in the result")
+    request: DesignRequest
+
+
+BatchItem = Annotated[
+    Union[BrandNameBatchItem, ContentBatchItem, ChatBatchItem, SentimentBatchItem, DesignBatchItem],
+    Field(discriminator="type")
+]
+
+
+class BatchRequest(BaseModel):
+    """Request model for batch generation."""
+    items: List[BatchItem] = Field(..., description="Typed sub-requests", min_length=1)
+    concurrency: int = Field(default=4, description="Maximum sub-requests run at once", ge=1)
+    stream: bool = Field(
+        default=False,
+        description="Stream results as NDJSON in completion order instead of one JSON response"
+    )
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "items": [
+                    {
+                        "type": "brand_name",
+                        "id": "client-42",
+                        "request": {"industry": "sustainable fashion", "keywords": ["eco", "style"]}
+                    },
+                    {
+                        "type": "sentiment",
+                        "id": "review-7",
+                        "request": {"text": "Great product, but shipping was slow.", "context": "Customer review"}
+                    }
+                ],
+                "concurrency": 4,
+                "stream": False
+            }
+        }
+
+
+class BatchItemResult(BaseModel):
+    """Outcome of a single batch sub-request."""
+    index: int
+    id: Optional[str] = None
+    type: str
+    success: bool
+    result: Optional[dict] = None
+    error: Optional[str] = None
+
+
+class BatchResponse(BaseModel):
+    """Response model for batch generation (results in request order)."""
+    success: bool
+    total: int
+    succeeded: int
+    failed: int
+    results: List[BatchItemResult]
+
+
 # ============== Error Response ==============
 
 class ErrorResponse(BaseModel):
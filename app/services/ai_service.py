@@ -3,70 +3,445 @@ BizForge AI Service
 Centralized Groq Cloud integration for all AI-powered features.
 """
 
-from groq import Groq
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, NamedTuple, Optional, Union
+
+import asyncio
+import json
+import time
+
+import httpx
+from pydantic import ValidationError
+from groq import AsyncGroq, APIConnectionError, APIStatusError, AuthenticationError, PermissionDeniedError
+
 from app.config import get_settings
+from app.services.cache import get_response_cache, make_messages_key
+from app.services.coalescing import SingleFlight
+from app.services.conversation import ConversationCompactor
+from app.services.circuit_breaker import get_breaker
+from app.services.errors import CircuitOpenError, PromptTooLargeError, UpstreamUnavailableError
+from app.services.model_router import ModelRouter
+from app.services.rate_limit import RateLimitScheduler
+from app.services.tokens import (
+    DEFAULT_OUTPUT_BUDGETS, TokenBudgeter, count_message_tokens, count_tokens, parse_budget_overrides
+)
+from app.services.fast_sentiment import FAST_MODEL_NAME, needs_escalation, render_analysis, score_texts
+from app.schemas.models import SentimentLabel
 from app.prompts.templates import (
     SYSTEM_PROMPT,
     BRAND_NAME_PROMPT,
     MARKETING_CONTENT_PROMPT,
     CHAT_SYSTEM_PROMPT,
     SENTIMENT_ANALYSIS_PROMPT,
+    BATCH_SENTIMENT_PROMPT,
+    CONVERSATION_SUMMARY_PROMPT,
     DESIGN_PALETTE_PROMPT,
     LOGO_PROMPT_GENERATION
 )
 
 
+# Failures that another model would not fix
+NON_RETRYABLE_ERRORS = (PromptTooLargeError, AuthenticationError, PermissionDeniedError, CircuitOpenError)
+
+
+def _is_upstream_failure(error: BaseException) -> bool:
+    """Errors that count against the Groq circuit breaker (not 4xx/429)."""
+    return isinstance(error, APIConnectionError) or (
+        isinstance(error, APIStatusError) and error.status_code >= 500
+    )
+
+
+def _pack_outcome(pack: List[int], outcome) -> Dict[int, Union[SentimentLabel, str]]:
+    """A sentiment pack's results, or a per-item error if the pack raised."""
+    if isinstance(outcome, BaseException):
+        if not isinstance(outcome, Exception):
+            raise outcome  # cancellation
+        return {index: f"Sentiment analysis failed: {outcome}" for index in pack}
+    return outcome
+
+
+class Generation(NamedTuple):
+    """Generated text and the model that actually produced it."""
+    text: str
+    model: str
+
+
 class GroqAIService:
     """
     Centralized AI service for BizForge using Groq Cloud.
     All AI interactions are handled through this service.
+    
+    Uses the async Groq client so that in-flight generations never block
+    the event loop. The underlying httpx connection pool is shared by every
+    request and owned by the application lifespan (see init_ai_service).
     """
     
-    def __init__(self):
+    def __init__(self, http_client: Optional[httpx.AsyncClient] = None):
         """Initialize the Groq AI client."""
         self.settings = get_settings()
         
         if not self.settings.groq_api_key:
             raise ValueError("GROQ_API_KEY is required")
         
-        self.client = Groq(api_key=self.settings.groq_api_key)
+        self.http_client = http_client or _create_http_client()
+        self.client = AsyncGroq(
+            api_key=self.settings.groq_api_key,
+            http_client=self.http_client,
+            # Retries are coordinated by the rate-limit scheduler instead
+            max_retries=0
+        )
         self.model = self.settings.model_name
+        self.cache = get_response_cache()
+        self.inflight = SingleFlight()
+        self.breaker = get_breaker("groq")
+        self.router = ModelRouter(
+            routes=self.settings.model_routing,
+            failure_threshold=self.settings.route_failure_threshold,
+            cooldown=self.settings.route_cooldown,
+            hedging=self.settings.hedging_enabled,
+            min_samples=self.settings.hedge_min_samples,
+            min_hedge_delay=self.settings.hedge_min_delay_ms / 1000
+        )
+        self.scheduler = RateLimitScheduler(
+            rpm=self.settings.groq_rpm_limit,
+            tpm=self.settings.groq_tpm_limit,
+            weights={
+                "interactive": self.settings.priority_weight_interactive,
+                "standard": self.settings.priority_weight_standard,
+                "bulk": self.settings.priority_weight_bulk
+            },
+            bulk_headroom=self.settings.priority_bulk_headroom,
+            max_wait=self.settings.rate_limit_max_wait,
+            max_retries=self.settings.rate_limit_max_retries
+        )
+        self.budgets = TokenBudgeter(
+            budgets={
+                **DEFAULT_OUTPUT_BUDGETS,
+                **parse_budget_overrides(self.settings.output_token_budgets)
+            },
+            context_window=self.settings.model_context_tokens,
+            max_prompt_tokens=self.settings.max_prompt_tokens,
+            auto_tune=self.settings.token_budget_auto_tune
+        )
+        self.conversation = ConversationCompactor(
+            summarize=self._summarize_conversation,
+            token_budget=self.settings.chat_history_token_budget,
+            keep_turns=self.settings.chat_keep_turns,
+            fold_stride=self.settings.chat_summary_stride,
+            cache_size=self.settings.chat_summary_cache_size
+        )
 
-    def _generate(self, system_prompt: str, user_prompt: str, temperature: float = 0.7) -> str:
+    async def aclose(self) -> None:
+        """Close the shared connection pool."""
+        await self.http_client.aclose()
+
+    async def _generate(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float = 0.7,
+        task: Optional[str] = None,
+        use_cache: bool = True,
+        response_format: Optional[dict] = None,
+        budget_key: Optional[str] = None
+    ) -> Generation:
         """
         Core generation method using Groq.
+        
+        Tasks listed in RESPONSE_CACHE_TASKS are served from the response
+        cache when an identical generation was made before. use_cache=False
+        skips the lookup but still refreshes the cached entry. budget_key
+        selects the output token budget and model route (defaults to the task).
         """
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
-            temperature=temperature,
-            max_tokens=2048
-        )
-        return response.choices[0].message.content
+        route_key = budget_key or task or "default"
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt}
+        ]
+        key = make_messages_key(self._route_id(route_key), messages, temperature)
+        
+        cacheable = self.settings.response_cache_enabled and task in self.settings.cached_tasks
+        if cacheable and use_cache:
+            cached = await self.cache.get(key)
+            if cached is not None:
+                return Generation(*json.loads(cached))
+        
+        async def call() -> Generation:
+            result = await self._complete(messages, temperature, response_format, route_key)
+            if cacheable:
+                await self.cache.set(key, json.dumps(result))
+            return result
+        
+        try:
+            return await self._coalesce(key, call)
+        except (CircuitOpenError, UpstreamUnavailableError):
+            # Groq is down: a previously cached answer beats an error
+            cached = await self.cache.get(key) if cacheable else None
+            if cached is None:
+                raise
+            return Generation(*json.loads(cached))
     
-    def _chat_generate(self, messages: list, temperature: float = 0.7) -> str:
+    async def _chat_generate(
+        self,
+        messages: list,
+        temperature: float = 0.7,
+        budget_key: str = "chat"
+    ) -> Generation:
         """
         Chat generation with conversation history.
         """
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=messages,
-            temperature=temperature,
-            max_tokens=2048
+        key = make_messages_key(self._route_id(budget_key), messages, temperature)
+        return await self._coalesce(
+            key, lambda: self._complete(messages, temperature, budget_key=budget_key)
+        )
+    
+    def _route_id(self, route_key: str) -> str:
+        """Identifies a route's models in cache and coalescing keys."""
+        return "|".join(self.router.route(route_key)) or self.model
+    
+    async def _complete(
+        self,
+        messages: list,
+        temperature: float,
+        response_format: Optional[dict] = None,
+        budget_key: str = "default"
+    ) -> Generation:
+        """
+        Upstream chat completion, routed by budget key.
+        
+        Candidate models are tried in route order; a failing model hands
+        over to the next one. With hedging enabled, a call running past the
+        model's p95 latency is raced against the next candidate.
+        """
+        max_tokens, estimated = self.budgets.reserve(messages, budget_key)
+        models = self.router.candidates(budget_key) or [self.model]
+        
+        async def attempt(model: str) -> Generation:
+            started = time.monotonic()
+            try:
+                result = await self._complete_with(
+                    model, messages, temperature, response_format, budget_key, max_tokens, estimated
+                )
+            except (asyncio.CancelledError, CircuitOpenError):
+                raise
+            except Exception:
+                self.router.record_failure(model)
+                raise
+            self.router.record_success(budget_key, model, time.monotonic() - started)
+            return result
+        
+        last_error: Optional[Exception] = None
+        for i, model in enumerate(models):
+            if i:
+                self.router.fallbacks += 1
+            backup = models[i + 1] if i + 1 < len(models) else model
+            try:
+                return await self._hedged(budget_key, model, backup, attempt)
+            except NON_RETRYABLE_ERRORS:
+                raise
+            except Exception as e:
+                last_error = e
+        raise last_error
+    
+    async def _hedged(
+        self,
+        budget_key: str,
+        model: str,
+        backup: str,
+        attempt: Callable[[str], Awaitable[Generation]]
+    ) -> Generation:
+        """Run attempt(model); past its p95 latency, race attempt(backup) against it."""
+        delay = self.router.hedge_delay(budget_key, model)
+        if delay is None:
+            return await attempt(model)
+        
+        first = asyncio.ensure_future(attempt(model))
+        pending = {first}
+        try:
+            done, _ = await asyncio.wait(pending, timeout=delay)
+            # Only hedge while the backup has spare capacity, never into a queue
+            if not done and not self.scheduler.queued(backup):
+                self.router.hedges += 1
+                pending.add(asyncio.ensure_future(attempt(backup)))
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is not first:
+                            self.router.hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+    
+    async def _complete_with(
+        self,
+        model: str,
+        messages: list,
+        temperature: float,
+        response_format: Optional[dict],
+        budget_key: str,
+        max_tokens: int,
+        estimated: int
+    ) -> Generation:
+        """Single upstream chat completion call on one model."""
+        reserved = estimated + max_tokens
+        extra = {"response_format": response_format} if response_format else {}
+        self.breaker.check()
+        raw = await self.scheduler.run(
+            model,
+            reserved,
+            lambda: self.breaker.call(
+                lambda: self.client.chat.completions.with_raw_response.create(
+                    model=model,
+                    messages=messages,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    **extra
+                ),
+                is_failure=_is_upstream_failure
+            )
         )
-        return response.choices[0].message.content
+        response = await raw.parse()
+        choice = response.choices[0]
+        usage = response.usage
+        self.scheduler.settle(model, reserved, usage.total_tokens if usage else None)
+        self.budgets.record(
+            budget_key,
+            estimated,
+            usage.prompt_tokens if usage else None,
+            usage.completion_tokens if usage else None,
+            choice.finish_reason
+        )
+        return Generation(choice.message.content, response.model or model)
+    
+    async def _coalesce(
+        self,
+        key: str,
+        call: Callable[[], Awaitable[Generation]]
+    ) -> Generation:
+        """Share one upstream call between concurrent identical requests."""
+        if not self.settings.request_coalescing_enabled:
+            return await call()
+        return await self.inflight.do(key, call)
+    
+    def stats(self) -> dict:
+        """Runtime statistics for the AI service layer."""
+        return {
+            "coalescing": self.inflight.stats(),
+            "conversation": self.conversation.stats(),
+            "tokens": self.budgets.stats(),
+            "rate_limit": self.scheduler.stats(),
+            "routing": self.router.stats()
+        }
+    
+    async def _chat_stream(
+        self,
+        messages: list,
+        temperature: float = 0.7,
+        budget_key: str = "chat"
+    ) -> AsyncIterator[dict]:
+        """
+        Streaming chat generation.
+        
+        Yields {"type": "token", "content": ...} events as tokens arrive,
+        followed by a single {"type": "done", ...} event carrying the model,
+        token usage and finish reason. Closing the iterator early (e.g. on
+        client disconnect) closes the upstream connection.
+        """
+        max_tokens, estimated = self.budgets.reserve(messages, budget_key)
+        reserved = estimated + max_tokens
+        stream, model = await self._open_stream(messages, temperature, budget_key, max_tokens, reserved)
+        model_used = model
+        finish_reason = None
+        usage = None
+        streamed = 0
+        try:
+            async for chunk in stream:
+                model_used = chunk.model or model_used
+                if chunk.x_groq and chunk.x_groq.usage:
+                    usage = chunk.x_groq.usage.model_dump(exclude_none=True)
+                if not chunk.choices:
+                    continue
+                choice = chunk.choices[0]
+                if choice.finish_reason:
+                    finish_reason = choice.finish_reason
+                if choice.delta and choice.delta.content:
+                    streamed += 1
+                    yield {"type": "token", "content": choice.delta.content}
+        finally:
+            # Also runs when the client disconnects mid-stream: usage is then
+            # unknown, so refund down to the prompt plus the chunks streamed
+            # (about one token each) and leave the budget tuning untouched
+            self.scheduler.settle(
+                model, reserved, usage.get("total_tokens") if usage else estimated + streamed
+            )
+            self.budgets.record(
+                budget_key,
+                estimated,
+                usage.get("prompt_tokens") if usage else None,
+                usage.get("completion_tokens") if usage else None,
+                finish_reason
+            )
+            await stream.response.aclose()
+        
+        yield {
+            "type": "done",
+            "model_used": model_used,
+            "usage": usage,
+            "finish_reason": finish_reason
+        }
+    
+    async def _open_stream(
+        self,
+        messages: list,
+        temperature: float,
+        budget_key: str,
+        max_tokens: int,
+        reserved: int
+    ) -> tuple:
+        """Open a completion stream on the first route candidate that accepts it."""
+        last_error: Optional[Exception] = None
+        for i, model in enumerate(self.router.candidates(budget_key) or [self.model]):
+            if i:
+                self.router.fallbacks += 1
+            try:
+                self.breaker.check()
+                raw = await self.scheduler.run(
+                    model,
+                    reserved,
+                    lambda: self.breaker.call(
+                        lambda: self.client.chat.completions.with_raw_response.create(
+                            model=model,
+                            messages=messages,
+                            temperature=temperature,
+                            max_tokens=max_tokens,
+                            stream=True
+                        ),
+                        is_failure=_is_upstream_failure
+                    )
+                )
+            except NON_RETRYABLE_ERRORS:
+                raise
+            except Exception as e:
+                self.router.record_failure(model)
+                last_error = e
+                continue
+            self.router.record_success(budget_key, model)
+            return await raw.parse(), model
+        raise last_error
     
-    def generate_brand_names(
+    async def generate_brand_names(
         self,
         industry: str,
         keywords: list,
         style: str = "modern",
         target_audience: str = "general",
-        context: str = ""
-    ) -> str:
+        context: str = "",
+        use_cache: bool = True
+    ) -> Generation:
         """Generate creative brand name suggestions."""
         user_prompt = BRAND_NAME_PROMPT.format(
             industry=industry,
@@ -75,9 +450,31 @@ class GroqAIService:
             target_audience=target_audience,
             context=context if context else "None specified"
         )
-        return self._generate(SYSTEM_PROMPT, user_prompt, temperature=0.8)
+        return await self._generate(
+            SYSTEM_PROMPT, user_prompt, temperature=0.8, task="brand_name", use_cache=use_cache
+        )
     
-    def generate_marketing_content(
+    async def generate_marketing_content(
+        self,
+        brand_name: str,
+        brand_description: str,
+        content_type: str,
+        target_audience: str,
+        tone: str = "professional",
+        key_message: str = "",
+        cta: str = "",
+        use_cache: bool = True
+    ) -> Generation:
+        """Generate marketing content for various channels."""
+        user_prompt = self._marketing_content_prompt(
+            brand_name, brand_description, content_type, target_audience, tone, key_message, cta
+        )
+        return await self._generate(
+            SYSTEM_PROMPT, user_prompt, temperature=0.7, task="content", use_cache=use_cache,
+            budget_key=self._content_budget_key(content_type)
+        )
+    
+    def stream_marketing_content(
         self,
         brand_name: str,
         brand_description: str,
@@ -86,9 +483,42 @@ class GroqAIService:
         tone: str = "professional",
         key_message: str = "",
         cta: str = ""
+    ) -> AsyncIterator[dict]:
+        """Stream marketing content token by token (see _chat_stream)."""
+        user_prompt = self._marketing_content_prompt(
+            brand_name, brand_description, content_type, target_audience, tone, key_message, cta
+        )
+        messages = [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": user_prompt}
+        ]
+        return self._chat_stream(
+            messages, temperature=0.7, budget_key=self._content_budget_key(content_type)
+        )
+    
+    def _content_budget_key(self, content_type: str) -> str:
+        """
+        Budget key for a content type: "content:<type>" for types with their
+        own budget or route, "content" for anything else. content_type is
+        client input, so unknown values must not create new stats entries.
+        """
+        key = f"content:{content_type}"
+        if key in self.budgets.budgets or key in self.router.routes:
+            return key
+        return "content"
+    
+    @staticmethod
+    def _marketing_content_prompt(
+        brand_name: str,
+        brand_description: str,
+        content_type: str,
+        target_audience: str,
+        tone: str,
+        key_message: str,
+        cta: str
     ) -> str:
-        """Generate marketing content for various channels."""
-        user_prompt = MARKETING_CONTENT_PROMPT.format(
+        """Render the marketing content prompt."""
+        return MARKETING_CONTENT_PROMPT.format(
             brand_name=brand_name,
             brand_description=brand_description,
             content_type=content_type,
@@ -97,15 +527,45 @@ class GroqAIService:
             key_message=key_message if key_message else "Not specified",
             cta=cta if cta else "Not specified"
         )
-        return self._generate(SYSTEM_PROMPT, user_prompt, temperature=0.7)
     
-    def chat(
+    async def chat(
         self,
         message: str,
         conversation_history: list = None,
         business_context: str = ""
-    ) -> str:
+    ) -> Generation:
         """Branding consultant chatbot interaction."""
+        messages = await self._chat_messages(message, conversation_history, business_context)
+        return await self._chat_generate(messages, temperature=0.7)
+    
+    async def stream_chat(
+        self,
+        message: str,
+        conversation_history: list = None,
+        business_context: str = ""
+    ) -> AsyncIterator[dict]:
+        """Stream a chatbot reply token by token (see _chat_stream)."""
+        messages = await self._chat_messages(message, conversation_history, business_context)
+        events = self._chat_stream(messages, temperature=0.7)
+        try:
+            async for event in events:
+                yield event
+        finally:
+            await events.aclose()
+    
+    async def _chat_messages(
+        self,
+        message: str,
+        conversation_history: list = None,
+        business_context: str = ""
+    ) -> list:
+        """
+        Build the chat message list: system prompt, context, history, message.
+        
+        History that does not fit CHAT_HISTORY_TOKEN_BUDGET is compacted:
+        the last CHAT_KEEP_TURNS turns stay verbatim and older turns are
+        replaced by a cached rolling summary.
+        """
         messages = [{"role": "system", "content": CHAT_SYSTEM_PROMPT}]
         
         # Add business context if provided
@@ -117,34 +577,195 @@ class GroqAIService:
         
         # Add conversation history
         if conversation_history:
-            for msg in conversation_history:
+            history = [
+                {"role": msg.get("role", "user"), "content": msg.get("content", "")}
+                for msg in conversation_history
+            ]
+            reserved = count_message_tokens(messages + [{"role": "user", "content": message}])
+            summary, history = await self.conversation.compact(history, reserved)
+            if summary:
                 messages.append({
-                    "role": msg.get("role", "user"),
-                    "content": msg.get("content", "")
+                    "role": "system",
+                    "content": f"Summary of the earlier conversation: {summary}"
                 })
+            messages.extend(history)
         
         # Add current message
         messages.append({"role": "user", "content": message})
         
-        return self._chat_generate(messages, temperature=0.7)
+        return messages
+    
+    async def _summarize_conversation(self, summary: str, turns: List[dict]) -> str:
+        """Fold conversation turns into the rolling summary."""
+        user_prompt = CONVERSATION_SUMMARY_PROMPT.format(
+            summary=summary if summary else "None yet",
+            turns="\n".join(f"{m['role']}: {m['content']}" for m in turns)
+        )
+        summary = await self._generate(SYSTEM_PROMPT, user_prompt, temperature=0.2, task="chat_summary")
+        return summary.text
     
-    def analyze_sentiment(self, text: str, context: str = "general brand feedback") -> str:
-        """Analyze sentiment of text for brand insights."""
+    async def analyze_sentiment(
+        self,
+        text: str,
+        context: str = "general brand feedback",
+        use_cache: bool = True
+    ) -> Generation:
+        """
+        Analyze sentiment of text for brand insights.
+        While the Groq breaker is open, the local fast-path model answers.
+        """
         user_prompt = SENTIMENT_ANALYSIS_PROMPT.format(
             text=text,
             context=context
         )
-        return self._generate(SYSTEM_PROMPT, user_prompt, temperature=0.3)
+        try:
+            return await self._generate(
+                SYSTEM_PROMPT, user_prompt, temperature=0.3, task="sentiment", use_cache=use_cache
+            )
+        except CircuitOpenError:
+            return Generation(render_analysis(score_texts([text])[0]), FAST_MODEL_NAME)
     
-    def generate_color_palette(
+    async def analyze_sentiment_batch(
+        self,
+        texts: List[str],
+        context: str = "general brand feedback",
+        mode: str = "full",
+        models_used: Optional[set] = None
+    ) -> List[Union[SentimentLabel, str]]:
+        """
+        Classify many texts with as few LLM calls as possible.
+        
+        In "fast" and "auto" mode texts are first scored by the local
+        lexicon model; "auto" sends only low-confidence or mixed texts on to
+        the LLM. LLM texts are packed into prompts up to a token budget and
+        the model is asked for strict JSON. Items that come back missing or
+        malformed are re-split and retried on their own, so one bad item
+        never forces the whole pack to be re-run. Returns a SentimentLabel
+        or an error message per text, in input order; the models that
+        answered are added to models_used when given.
+        """
+        if models_used is None:
+            models_used = set()
+        results: List[Union[SentimentLabel, str]] = ["Not analyzed"] * len(texts)
+        pending = list(range(len(texts)))
+        
+        if mode != "full":
+            threshold = self.settings.fast_sentiment_threshold
+            pending = []
+            for index, local in enumerate(score_texts(texts)):
+                if mode == "fast" or not needs_escalation(local, threshold):
+                    results[index] = SentimentLabel(
+                        label=local.label.lower(),
+                        confidence=local.confidence
+                    )
+                    models_used.add(FAST_MODEL_NAME)
+                else:
+                    pending.append(index)
+        
+        semaphore = asyncio.Semaphore(self.settings.sentiment_batch_concurrency)
+        
+        async def run(pack: List[int]) -> Dict[int, Union[SentimentLabel, str]]:
+            async with semaphore:
+                return await self._sentiment_pack(pack, texts, context, models_used)
+        
+        packs = self._sentiment_packs(texts, pending)
+        outcomes = await asyncio.gather(*[run(pack) for pack in packs], return_exceptions=True)
+        for pack, outcome in zip(packs, outcomes):
+            for index, value in _pack_outcome(pack, outcome).items():
+                results[index] = value
+        return results
+    
+    def _sentiment_packs(self, texts: List[str], indices: List[int]) -> List[List[int]]:
+        """Group text indices into packs bounded by token budget and item count."""
+        packs, pack, pack_tokens = [], [], 0
+        for index in indices:
+            text = texts[index]
+            # Text plus its JSON framing ({"id": ..., "text": ...})
+            tokens = count_tokens(text) + 8
+            if pack and (
+                pack_tokens + tokens > self.settings.sentiment_batch_token_budget
+                or len(pack) >= self.settings.sentiment_batch_max_items
+            ):
+                packs.append(pack)
+                pack, pack_tokens = [], 0
+            pack.append(index)
+            pack_tokens += tokens
+        if pack:
+            packs.append(pack)
+        return packs
+    
+    async def _sentiment_pack(
+        self,
+        pack: List[int],
+        texts: List[str],
+        context: str,
+        models_used: set,
+        attempt: int = 0
+    ) -> Dict[int, Union[SentimentLabel, str]]:
+        """Classify one pack, re-splitting the items that fail to parse."""
+        items = json.dumps(
+            [{"id": i, "text": texts[index]} for i, index in enumerate(pack)],
+            ensure_ascii=False
+        )
+        user_prompt = BATCH_SENTIMENT_PROMPT.format(context=context, items=items)
+        
+        try:
+            generation = await self._generate(
+                SYSTEM_PROMPT, user_prompt, temperature=0.2, task="sentiment_batch",
+                response_format={"type": "json_object"}
+            )
+        except CircuitOpenError:
+            # Groq is down: fall back to the local model's labels for this pack
+            models_used.add(FAST_MODEL_NAME)
+            return {
+                index: SentimentLabel(label=local.label.lower(), confidence=local.confidence)
+                for index, local in zip(pack, score_texts([texts[index] for index in pack]))
+            }
+        except Exception as e:
+            return {index: f"Sentiment analysis failed: {e}" for index in pack}
+        models_used.add(generation.model)
+        raw = generation.text
+        
+        parsed: Dict[int, SentimentLabel] = {}
+        try:
+            entries = json.loads(raw).get("results", [])
+        except (ValueError, AttributeError):
+            entries = []
+        for entry in entries if isinstance(entries, list) else []:
+            try:
+                i = int(entry["id"])
+                if 0 <= i < len(pack):
+                    parsed[pack[i]] = SentimentLabel.model_validate(entry)
+            except (KeyError, TypeError, ValueError, ValidationError):
+                continue
+        
+        failed = [index for index in pack if index not in parsed]
+        if not failed:
+            return parsed
+        if attempt >= self.settings.sentiment_batch_max_retries:
+            parsed.update({index: "Model returned no valid result for this text" for index in failed})
+            return parsed
+        
+        # Retry only the failures, split in halves so a single poison item is isolated
+        half = max(1, len(failed) // 2)
+        retries = [failed[:half], failed[half:]] if len(failed) > 1 else [failed]
+        outcomes = await asyncio.gather(*[
+            self._sentiment_pack(sub, texts, context, models_used, attempt + 1) for sub in retries
+        ], return_exceptions=True)
+        for sub, outcome in zip(retries, outcomes):
+            parsed.update(_pack_outcome(sub, outcome))
+        return parsed
+    
+    async def generate_color_palette(
         self,
         brand_name: str,
         industry: str,
         brand_personality: str,
         target_audience: str,
         mood: str = "professional",
-        existing_colors: str = ""
-    ) -> str:
+        existing_colors: str = "",
+        use_cache: bool = True
+    ) -> Generation:
         """Generate color palette and design system recommendations."""
         user_prompt = DESIGN_PALETTE_PROMPT.format(
             brand_name=brand_name,
@@ -154,17 +775,20 @@ class GroqAIService:
             mood=mood,
             existing_colors=existing_colors if existing_colors else "None specified"
         )
-        return self._generate(SYSTEM_PROMPT, user_prompt, temperature=0.6)
+        return await self._generate(
+            SYSTEM_PROMPT, user_prompt, temperature=0.6, task="design", use_cache=use_cache
+        )
     
-    def generate_logo_prompt(
+    async def generate_logo_prompt(
         self,
         brand_name: str,
         industry: str,
         brand_values: str,
         style: str = "modern minimalist",
         icon_preferences: str = "",
-        colors: str = ""
-    ) -> str:
+        colors: str = "",
+        use_cache: bool = True
+    ) -> Generation:
         """Generate text-to-image prompts for logo design."""
         user_prompt = LOGO_PROMPT_GENERATION.format(
             brand_name=brand_name,
@@ -174,7 +798,22 @@ class GroqAIService:
             icon_preferences=icon_preferences if icon_preferences else "Open to suggestions",
             colors=colors if colors else "Open to suggestions"
         )
-        return self._generate(SYSTEM_PROMPT, user_prompt, temperature=0.8)
+        return await self._generate(
+            SYSTEM_PROMPT, user_prompt, temperature=0.8, task="logo_prompt", use_cache=use_cache
+        )
+
+
+def _create_http_client() -> httpx.AsyncClient:
+    """Create the pooled HTTP client used for all Groq requests."""
+    settings = get_settings()
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=settings.groq_max_connections,
+            max_keepalive_connections=settings.groq_max_keepalive_connections,
+            keepalive_expiry=settings.groq_keepalive_expiry
+        ),
+        timeout=httpx.Timeout(settings.groq_timeout, connect=settings.groq_connect_timeout)
+    )
 
 
 # Singleton instance
@@ -187,3 +826,28 @@ def get_ai_service() -> GroqAIService:
     if _ai_service is None:
         _ai_service = GroqAIService()
     return _ai_service
+
+
+def get_ai_service_stats() -> dict:
+    """Stats for the running AI service, or {} if it has not been created."""
+    return _ai_service.stats() if _ai_service is not None else {}
+
+
+async def init_ai_service() -> None:
+    """
+    Create the AI service on application startup.
+    Failures (e.g. a missing API key) are deferred to the first request,
+    matching the lazy behaviour of get_ai_service.
+    """
+    try:
+        get_ai_service()
+    except ValueError as e:
+        print(f"⚠️ AI service not initialized: {e}")
+
+
+async def close_ai_service() -> None:
+    """Release the shared connection pool on application shutdown."""
+    global _ai_service
+    if _ai_service is not None:
+        await _ai_service.aclose()
+        _ai_service = None
@@ -0,0 +1,93 @@
+"""
+BizForge Blob Store
+Content-addressed storage for generated images.
+
+A blob is stored once under the SHA-256 of its bytes:
+    <root>/<first two hex digits>/<digest>
+
+Because a digest always names the same bytes, blobs are immutable: the
+digest doubles as a strong ETag and responses can be cached forever by
+browsers and CDNs. Writes go to a temporary file that is renamed into
+place, so readers never see a partial blob.
+"""
+
+import hashlib
+import os
+import re
+import uuid
+from typing import Optional
+
+from app.config import get_settings
+
+_DIGEST_RE = re.compile(r"^[0-9a-f]{64}$")
+
+
+def is_digest(value: str) -> bool:
+    """True if value looks like a blob digest (lowercase SHA-256 hex)."""
+    return bool(_DIGEST_RE.match(value))
+
+
+def sniff_image_type(head: bytes) -> Optional[str]:
+    """File extension (png, webp, ico) of an image from its first bytes."""
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "png"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "webp"
+    if head.startswith(b"\x00\x00\x01\x00"):
+        return "ico"
+    return None
+
+
+class BlobStore:
+    """Immutable blobs on local disk, addressed by SHA-256."""
+
+    def __init__(self, root: str):
+        self.root = root
+        self.writes = 0
+        self.duplicates = 0
+
+    def path(self, digest: str) -> str:
+        return os.path.join(self.root, digest[:2], digest)
+
+    def exists(self, digest: str) -> bool:
+        return is_digest(digest) and os.path.isfile(self.path(digest))
+
+    def put(self, data: bytes) -> str:
+        """Store data (if not already present) and return its digest. Blocking."""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.path(digest)
+        if os.path.isfile(path):
+            self.duplicates += 1
+            return digest
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+        self.writes += 1
+        return digest
+
+    def read(self, digest: str, start: int = 0, length: Optional[int] = None) -> bytes:
+        """Read a blob, or a byte range of it. Blocking."""
+        with open(self.path(digest), "rb") as f:
+            f.seek(start)
+            return f.read() if length is None else f.read(length)
+
+    def image_type(self, digest: str) -> Optional[str]:
+        """Extension matching the blob's image format, or None. Blocking."""
+        return sniff_image_type(self.read(digest, 0, 12))
+
+    def size(self, digest: str) -> int:
+        return os.path.getsize(self.path(digest))
+
+
+# Singleton instance
+_blob_store: Optional[BlobStore] = None
+
+
+def get_blob_store() -> BlobStore:
+    """Get or create the blob store singleton."""
+    global _blob_store
+    if _blob_store is None:
+        _blob_store = BlobStore(get_settings().blob_store_dir)
+    return _blob_store
@@ -0,0 +1,216 @@
+"""
+BizForge Response Cache
+Exact-match cache for LLM generations with an in-memory LRU tier and an
+optional on-disk SQLite tier.
+"""
+
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from app.config import get_settings
+
+
+def _normalize(text: str) -> str:
+    """Collapse whitespace so formatting-only differences share a key."""
+    return " ".join(text.split())
+
+
+def make_messages_key(model: str, messages: list, temperature: float) -> str:
+    """Build a key from the model, normalized message list and temperature."""
+    payload = json.dumps([
+        model.strip().lower(),
+        [[m.get("role", ""), _normalize(m.get("content", ""))] for m in messages],
+        round(float(temperature), 2)
+    ])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def cache_allowed(cache_control: Optional[str]) -> bool:
+    """
+    Whether a cached response may be served for this request.
+    Clients opt out with `Cache-Control: no-cache` (or `no-store`).
+    """
+    if not cache_control:
+        return True
+    directives = {d.strip().lower() for d in cache_control.split(",")}
+    return not ({"no-cache", "no-store"} & directives)
+
+
+class _SQLiteTier:
+    """Persistent second tier; calls are run in a worker thread."""
+    
+    def __init__(self, path: str, max_entries: int):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS response_cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_response_cache_accessed "
+            "ON response_cache (accessed_at)"
+        )
+        self._conn.commit()
+    
+    def get(self, key: str) -> Optional[Tuple[str, float]]:
+        """The stored value and its expiry time, or None."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM response_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] < now:
+                self._conn.execute("DELETE FROM response_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute(
+                "UPDATE response_cache SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+            return row[0], row[1]
+    
+    def set(self, key: str, value: str, expires_at: float) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO response_cache (key, value, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, value, expires_at, now)
+            )
+            self._conn.execute("DELETE FROM response_cache WHERE expires_at < ?", (now,))
+            self._conn.execute(
+                "DELETE FROM response_cache WHERE key IN ("
+                "SELECT key FROM response_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+            self._conn.commit()
+    
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class ResponseCache:
+    """
+    Two-tier exact-match cache for generated text.
+    
+    The memory tier is an LRU bounded by entry count and total bytes, with a
+    per-entry TTL. Memory misses fall through to the SQLite tier (if
+    configured) and are promoted back into memory on a hit.
+    """
+    
+    def __init__(
+        self,
+        ttl: float,
+        max_entries: int,
+        max_bytes: int,
+        sqlite_path: str = "",
+        sqlite_max_entries: int = 10000
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._bytes = 0
+        self._disk = _SQLiteTier(sqlite_path, sqlite_max_entries) if sqlite_path else None
+        
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+    
+    async def get(self, key: str) -> Optional[str]:
+        """Return the cached value for key, or None on a miss."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            value, expires_at, size = entry
+            if expires_at >= time.time():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                self.bytes_saved += size
+                return value
+            self._evict(key)
+        
+        if self._disk is not None:
+            row = await asyncio.to_thread(self._disk.get, key)
+            if row is not None:
+                # Promoted with its original expiry: a hit does not extend the TTL
+                value, expires_at = row
+                self._store(key, value, expires_at)
+                self.hits += 1
+                self.disk_hits += 1
+                self.bytes_saved += len(value.encode("utf-8"))
+                return value
+        
+        self.misses += 1
+        return None
+    
+    async def set(self, key: str, value: str) -> None:
+        """Store a value in every configured tier."""
+        expires_at = time.time() + self.ttl
+        self._store(key, value, expires_at)
+        if self._disk is not None:
+            await asyncio.to_thread(self._disk.set, key, value, expires_at)
+    
+    def _store(self, key: str, value: str, expires_at: float) -> None:
+        size = len(value.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._evict(key)
+        self._entries[key] = (value, expires_at, size)
+        self._bytes += size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            self._evict(next(iter(self._entries)))
+    
+    def _evict(self, key: str) -> None:
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+    
+    def stats(self) -> dict:
+        """Hit/miss counters and current memory usage."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "bytes_saved": self.bytes_saved,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "disk_enabled": self._disk is not None
+        }
+    
+    def close(self) -> None:
+        """Close the on-disk tier."""
+        if self._disk is not None:
+            self._disk.close()
+
+
+# Singleton instance
+_response_cache = None
+
+
+def get_response_cache() -> ResponseCache:
+    """Get or create the response cache singleton."""
+    global _response_cache
+    if _response_cache is None:
+        settings = get_settings()
+        _response_cache = ResponseCache(
+            ttl=settings.response_cache_ttl,
+            max_entries=settings.response_cache_max_entries,
+            max_bytes=settings.response_cache_max_bytes,
+            sqlite_path=settings.response_cache_sqlite_path,
+            sqlite_max_entries=settings.response_cache_sqlite_max_entries
+        )
+    return _response_cache
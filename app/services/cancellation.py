@@ -0,0 +1,147 @@
+"""
+BizForge Request Cancellation
+Stop server-side work nobody is waiting for.
+
+The middleware runs each AI request in its own task and cancels it when the
+client disconnects or when the request's deadline passes. Cancellation
+propagates through the AI service like any asyncio cancellation: queued
+calls leave the rate-limit queue, coalesced calls stop once their last
+waiter is gone, and in-flight httpx requests to Groq / Stability AI are
+closed.
+
+Clients bound the total server-side time with the X-Deadline-Ms header
+(milliseconds from receipt). The deadline is also available to the service
+layer (see remaining_time) so queued work can give up early.
+"""
+
+import asyncio
+import json
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+DEADLINE_HEADER = "x-deadline-ms"
+
+# Endpoints whose work is cancelled on disconnect / deadline (AI calls only;
+# user and export endpoints are left to finish)
+CANCELLABLE_PREFIXES = (
+    "/api/brand",
+    "/api/content",
+    "/api/chat",
+    "/api/sentiment",
+    "/api/design",
+    "/api/logo",
+    "/api/batch",
+)
+
+_deadline: ContextVar[Optional[float]] = ContextVar("deadline", default=None)
+
+_stats = {"cancelled_on_disconnect": 0, "deadline_exceeded": 0}
+
+
+def set_deadline(seconds: Optional[float]) -> None:
+    """Bound the current context's work to seconds from now (None: no deadline)."""
+    _deadline.set(time.monotonic() + seconds if seconds is not None else None)
+
+
+def get_deadline() -> Optional[float]:
+    """The current context's deadline (time.monotonic() value), or None."""
+    return _deadline.get()
+
+
+def set_deadline_at(deadline: Optional[float]) -> None:
+    """Set the current context's deadline as a time.monotonic() value (None: no deadline)."""
+    _deadline.set(deadline)
+
+
+def remaining_time() -> Optional[float]:
+    """Seconds left before the current request's deadline, or None."""
+    deadline = _deadline.get()
+    return None if deadline is None else max(0.0, deadline - time.monotonic())
+
+
+def get_cancellation_stats() -> dict:
+    """Counters for /health."""
+    return dict(_stats)
+
+
+def _parse_deadline(headers: Headers) -> Optional[float]:
+    try:
+        value = float(headers.get(DEADLINE_HEADER, ""))
+    except ValueError:
+        return None
+    return value / 1000 if value > 0 else None
+
+
+class CancellationMiddleware:
+    """Cancels AI requests on client disconnect or when X-Deadline-Ms runs out."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not scope["path"].startswith(CANCELLABLE_PREFIXES):
+            await self.app(scope, receive, send)
+            return
+
+        timeout = _parse_deadline(Headers(scope=scope))
+        set_deadline(timeout)
+
+        # Messages are handed over one at a time, so request bodies are never
+        # read ahead of the app; only after the body is done does the pump
+        # notice a disconnect.
+        inbox: asyncio.Queue = asyncio.Queue(maxsize=1)
+        disconnected = asyncio.Event()
+        started = False
+
+        async def pump() -> None:
+            while True:
+                message = await receive()
+                if message["type"] == "http.disconnect":
+                    disconnected.set()
+                await inbox.put(message)
+                if message["type"] == "http.disconnect":
+                    return
+
+        async def send_tracking(message: Message) -> None:
+            nonlocal started
+            started = True
+            await send(message)
+
+        app_task = asyncio.ensure_future(self.app(scope, inbox.get, send_tracking))
+        pump_task = asyncio.ensure_future(pump())
+        watch_task = asyncio.ensure_future(disconnected.wait())
+        try:
+            done, _ = await asyncio.wait(
+                {app_task, watch_task}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+            if app_task in done:
+                app_task.result()
+                return
+            app_task.cancel()
+            await asyncio.gather(app_task, return_exceptions=True)
+            if watch_task in done:
+                _stats["cancelled_on_disconnect"] += 1
+                return
+            _stats["deadline_exceeded"] += 1
+            if not started:
+                await _send_json(send, 504, {"detail": "Request deadline exceeded"})
+        finally:
+            for task in (app_task, pump_task, watch_task):
+                task.cancel()
+
+
+async def _send_json(send: Send, status: int, body: dict) -> None:
+    payload = json.dumps(body).encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(payload)).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": payload})
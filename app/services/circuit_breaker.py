@@ -0,0 +1,179 @@
+"""
+BizForge Circuit Breakers
+Fail fast while an upstream (Groq, Stability AI) is degraded.
+
+A breaker watches a rolling time window of calls. When enough calls have
+been seen and the failure rate or the slow-call rate crosses its threshold,
+the breaker opens: calls are rejected immediately (callers serve a
+fallback) instead of waiting on a doomed upstream. After open_seconds it
+goes half-open and lets a few probe calls through; if they succeed it
+closes again, otherwise it re-opens.
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, Tuple, TypeVar
+
+from app.config import get_settings
+from app.services.errors import CircuitOpenError
+
+T = TypeVar("T")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Closed / open / half-open breaker over a rolling window of call outcomes."""
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate: float = 0.5,
+        slow_call_seconds: float = 30.0,
+        slow_call_rate: float = 0.8,
+        window_seconds: float = 60.0,
+        min_calls: int = 10,
+        open_seconds: float = 30.0,
+        half_open_calls: int = 2
+    ):
+        self.name = name
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate = slow_call_rate
+        self.window_seconds = window_seconds
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self.half_open_calls = half_open_calls
+        self.state = CLOSED
+        self.opened_at = 0.0
+        # (timestamp, failed, slow) per finished call
+        self._calls: Deque[Tuple[float, bool, bool]] = deque()
+        self._probes = 0
+        self._probe_successes = 0
+        self.times_opened = 0
+        self.rejected = 0
+
+    def _prune(self, now: float) -> None:
+        while self._calls and self._calls[0][0] < now - self.window_seconds:
+            self._calls.popleft()
+
+    def _rates(self) -> Tuple[float, float]:
+        if not self._calls:
+            return 0.0, 0.0
+        failed = sum(1 for _, f, _ in self._calls if f)
+        slow = sum(1 for _, _, s in self._calls if s)
+        return failed / len(self._calls), slow / len(self._calls)
+
+    def retry_after(self) -> float:
+        """Seconds until an open breaker lets a probe through."""
+        return max(0.0, self.opened_at + self.open_seconds - time.monotonic())
+
+    def check(self) -> None:
+        """Raise CircuitOpenError if calls are currently being rejected."""
+        if self.state == OPEN and self.retry_after() <= 0:
+            self.state = HALF_OPEN
+            self._probes = 0
+            self._probe_successes = 0
+        if self.state == OPEN or (self.state == HALF_OPEN and self._probes >= self.half_open_calls):
+            self.rejected += 1
+            raise CircuitOpenError(
+                f"Upstream '{self.name}' is temporarily unavailable, please retry later",
+                retry_after=self.retry_after() or self.open_seconds
+            )
+
+    async def call(
+        self,
+        fn: Callable[[], Awaitable[T]],
+        is_failure: Callable[[BaseException], bool] = lambda e: True
+    ) -> T:
+        """Run fn() through the breaker, recording its outcome and latency."""
+        self.check()
+        probe = self.state == HALF_OPEN
+        if probe:
+            self._probes += 1
+        started = time.monotonic()
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            if probe:
+                self._probes -= 1
+            raise
+        except BaseException as e:
+            self.record(not is_failure(e), time.monotonic() - started, probe)
+            raise
+        self.record(True, time.monotonic() - started, probe)
+        return result
+
+    def record(self, ok: bool, latency: float, probe: bool = False) -> None:
+        """Record a call outcome and move between states."""
+        now = time.monotonic()
+        slow = latency >= self.slow_call_seconds
+        if probe and self.state == HALF_OPEN:
+            if not ok or slow:
+                self._open(now)
+                return
+            self._probe_successes += 1
+            if self._probe_successes >= self.half_open_calls:
+                self.state = CLOSED
+                self._calls.clear()
+            return
+
+        self._calls.append((now, not ok, slow))
+        self._prune(now)
+        if self.state == CLOSED and len(self._calls) >= self.min_calls:
+            failure_rate, slow_rate = self._rates()
+            if failure_rate >= self.failure_rate or slow_rate >= self.slow_call_rate:
+                self._open(now)
+
+    def _open(self, now: float) -> None:
+        self.state = OPEN
+        self.opened_at = now
+        self.times_opened += 1
+
+    def stats(self) -> dict:
+        """Current state and rolling-window rates."""
+        self._prune(time.monotonic())
+        failure_rate, slow_rate = self._rates()
+        return {
+            "state": self.state,
+            "calls": len(self._calls),
+            "failure_rate": round(failure_rate, 3),
+            "slow_call_rate": round(slow_rate, 3),
+            "times_opened": self.times_opened,
+            "rejected": self.rejected,
+            "retry_after": round(self.retry_after(), 1) if self.state == OPEN else 0.0
+        }
+
+
+# Breakers by upstream name
+_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    """Get or create the breaker for an upstream ("groq" or "stability")."""
+    breaker = _breakers.get(name)
+    if breaker is None:
+        settings = get_settings()
+        slow_call_seconds = {
+            "groq": settings.groq_slow_call_seconds,
+            "stability": settings.stability_slow_call_seconds,
+        }.get(name, settings.groq_slow_call_seconds)
+        breaker = _breakers[name] = CircuitBreaker(
+            name=name,
+            failure_rate=settings.breaker_failure_rate,
+            slow_call_seconds=slow_call_seconds,
+            slow_call_rate=settings.breaker_slow_call_rate,
+            window_seconds=settings.breaker_window_seconds,
+            min_calls=settings.breaker_min_calls,
+            open_seconds=settings.breaker_open_seconds,
+            half_open_calls=settings.breaker_half_open_calls
+        )
+    return breaker
+
+
+def get_breaker_stats() -> dict:
+    """State of every breaker, for /health."""
+    return {name: breaker.stats() for name, breaker in _breakers.items()}
@@ -0,0 +1,121 @@
+"""
+BizForge Request Coalescing
+Single-flight execution: concurrent identical requests share one upstream call.
+"""
+
+import asyncio
+import collections.abc
+import contextvars
+from typing import Any, Awaitable, Callable, Coroutine, Dict, Optional, TypeVar
+
+from app.services.cancellation import get_deadline, set_deadline_at
+from app.services.priority import PRIORITIES, get_priority, set_priority
+
+T = TypeVar("T")
+
+
+class _InContext(collections.abc.Coroutine):
+    """
+    Runs every step of a coroutine inside one shared context.
+    
+    Tasks copy the context they are created in, so a context updated after
+    the task starts is not seen by it; create_task(context=...) only exists
+    from Python 3.11. Wrapping the coroutine keeps the task on the live
+    context on 3.10 as well.
+    """
+    
+    def __init__(self, coro: Coroutine[Any, Any, T], context: contextvars.Context):
+        self._coro = coro
+        self._context = context
+    
+    def send(self, value):
+        return self._context.run(self._coro.send, value)
+    
+    def throw(self, *args):
+        return self._context.run(self._coro.throw, *args)
+    
+    def close(self):
+        return self._context.run(self._coro.close)
+    
+    def __await__(self):
+        return self._coro.__await__()
+
+
+class _Flight:
+    """An in-flight upstream call and the callers awaiting it."""
+    
+    def __init__(self):
+        # The call runs in its own context, not the leader's: its priority
+        # and deadline are those of the most demanding waiter
+        self.context = contextvars.copy_context()
+        self.priority = PRIORITIES[-1]
+        self.deadline: Optional[float] = 0.0
+        self.task: Optional[asyncio.Task] = None
+        self.waiters = 0
+    
+    def join(self) -> None:
+        """Raise the call's priority / extend its deadline for the current caller."""
+        self.waiters += 1
+        priority = get_priority()
+        if PRIORITIES.index(priority) < PRIORITIES.index(self.priority):
+            self.priority = priority
+            self.context.run(set_priority, priority)
+        deadline = get_deadline()
+        if self.deadline is not None and (deadline is None or deadline > self.deadline):
+            self.deadline = deadline
+            self.context.run(set_deadline_at, deadline)
+
+
+class SingleFlight:
+    """
+    Deduplicates concurrent calls by key.
+    
+    The first caller for a key starts the upstream call as a detached task;
+    callers that arrive while it is running await the same task. The task
+    runs at the highest priority and the latest deadline among its waiters,
+    so a follower is never held back by the leader's priority class or
+    deadline. Each waiter is shielded, so one waiter disconnecting does not
+    cancel the shared call; the call is cancelled only once every waiter
+    has gone away.
+    """
+    
+    def __init__(self):
+        self._flights: Dict[str, _Flight] = {}
+        self.leaders = 0
+        self.coalesced = 0
+    
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run fn() for key, or join the call already in flight for key."""
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight()
+            flight.join()
+            flight.task = asyncio.get_running_loop().create_task(_InContext(fn(), flight.context))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _: self._forget(key, flight))
+            self.leaders += 1
+        else:
+            flight.join()
+            self.coalesced += 1
+        
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                # Last waiter left (cancelled): nobody wants the result any more.
+                # Forget it first so new callers start a fresh call.
+                self._forget(key, flight)
+                flight.task.cancel()
+    
+    def _forget(self, key: str, flight: _Flight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+    
+    def stats(self) -> dict:
+        """Counters for coalesced calls."""
+        return {
+            "in_flight": len(self._flights),
+            "upstream_calls": self.leaders,
+            "coalesced": self.coalesced
+        }
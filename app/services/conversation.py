@@ -0,0 +1,151 @@
+"""
+BizForge Conversation Compaction
+Keeps chatbot prompts within a token budget for long consulting sessions.
+
+Older turns are folded into a rolling summary while the most recent turns
+are sent verbatim. Summaries are computed incrementally, a few messages at
+a time, and cached by a hash chain over the conversation prefix they
+cover: each new turn only folds its own messages into the previous summary
+instead of re-summarizing the whole session.
+"""
+
+import hashlib
+from collections import OrderedDict
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+from app.services.tokens import MESSAGE_OVERHEAD_TOKENS, count_tokens
+
+
+def _messages_tokens(messages: List[dict]) -> int:
+    return sum(count_tokens(m.get("content", "")) + MESSAGE_OVERHEAD_TOKENS for m in messages)
+
+
+def _prefix_hashes(messages: List[dict]) -> List[str]:
+    """hashes[i] identifies messages[:i] (hashes[0] is the empty prefix)."""
+    hashes = [""]
+    for msg in messages:
+        digest = hashlib.sha256()
+        digest.update(hashes[-1].encode())
+        digest.update(msg.get("role", "").encode())
+        digest.update(b"\0")
+        digest.update(msg.get("content", "").encode())
+        hashes.append(digest.hexdigest())
+    return hashes
+
+
+class ConversationCompactor:
+    """
+    Token-budgeted history manager.
+    
+    summarize(previous_summary, messages) must return a new summary that
+    covers previous_summary plus messages.
+    """
+    
+    def __init__(
+        self,
+        summarize: Callable[[str, List[dict]], Awaitable[str]],
+        token_budget: int,
+        keep_turns: int,
+        fold_stride: int,
+        cache_size: int
+    ):
+        self.summarize = summarize
+        self.token_budget = token_budget
+        self.keep_messages = keep_turns * 2
+        self.fold_stride = max(1, fold_stride)
+        self.cache_size = cache_size
+        self._summaries: "OrderedDict[str, str]" = OrderedDict()
+        
+        self.compactions = 0
+        self.summary_calls = 0
+        self.summary_cache_hits = 0
+        self.summary_failures = 0
+    
+    async def compact(
+        self,
+        history: List[dict],
+        reserved_tokens: int = 0
+    ) -> Tuple[Optional[str], List[dict]]:
+        """
+        Fit history into the budget.
+        
+        reserved_tokens covers what is always sent (system prompt, business
+        context, current message). Returns (summary or None, verbatim
+        messages to send after it).
+        """
+        budget = self.token_budget - reserved_tokens
+        if _messages_tokens(history) <= budget or len(history) <= self.keep_messages:
+            return None, history
+        
+        self.compactions += 1
+        older = history[:-self.keep_messages] if self.keep_messages else history
+        # Fold in fixed strides so consecutive turns reuse the same summary
+        boundary = (len(older) // self.fold_stride) * self.fold_stride
+        try:
+            summary = await self._summary_for(history, boundary) if boundary else None
+            # Still too large (e.g. very long recent turns): fold the oldest
+            # verbatim messages into the summary as well, so nothing is lost
+            def over_budget() -> bool:
+                summary_tokens = count_tokens(summary) if summary else 0
+                return boundary < len(history) - 1 and _messages_tokens(history[boundary:]) + summary_tokens > budget
+            
+            while over_budget():
+                # Move the boundary as far as the current summary needs, then
+                # re-check against the summary that also covers those messages
+                while over_budget():
+                    boundary += 1
+                summary = await self._summary_for(history, boundary)
+        except Exception as e:
+            # The chat turn must not fail with the summarizer: fall back to
+            # the most recent messages that fit
+            self.summary_failures += 1
+            print(f"⚠️ Conversation summary failed, truncating history: {e}")
+            verbatim = history
+            while len(verbatim) > 1 and _messages_tokens(verbatim) > budget:
+                verbatim = verbatim[1:]
+            return None, verbatim
+        return summary, history[boundary:]
+    
+    async def _summary_for(self, history: List[dict], end: int) -> str:
+        """Summary covering history[:end], extending the longest cached prefix."""
+        hashes = _prefix_hashes(history[:end])
+        
+        start, summary = 0, ""
+        for i in range(end, 0, -1):
+            cached = self._summaries.get(hashes[i])
+            if cached is not None:
+                self._summaries.move_to_end(hashes[i])
+                start, summary = i, cached
+                break
+        
+        if start == end:
+            self.summary_cache_hits += 1
+            return summary
+        
+        # Fold the remaining messages, in as few calls as the budget allows
+        while start < end:
+            step_end, step_tokens = start, 0
+            while step_end < end and (step_end == start or step_tokens < self.token_budget):
+                step_tokens += _messages_tokens([history[step_end]])
+                step_end += 1
+            summary = await self.summarize(summary, history[start:step_end])
+            self.summary_calls += 1
+            start = step_end
+        self._remember(hashes[end], summary)
+        return summary
+    
+    def _remember(self, key: str, summary: str) -> None:
+        self._summaries[key] = summary
+        self._summaries.move_to_end(key)
+        while len(self._summaries) > self.cache_size:
+            self._summaries.popitem(last=False)
+    
+    def stats(self) -> dict:
+        """Counters for compaction and summary caching."""
+        return {
+            "compactions": self.compactions,
+            "summary_calls": self.summary_calls,
+            "summary_cache_hits": self.summary_cache_hits,
+            "summary_failures": self.summary_failures,
+            "cached_summaries": len(self._summaries)
+        }
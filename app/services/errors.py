@@ -0,0 +1,63 @@
+"""
+BizForge AI Service Errors
+Exceptions raised by the AI service layer, each mapped to an HTTP status.
+"""
+
+import math
+from typing import Dict, Optional
+
+
+class AIServiceError(Exception):
+    """Base class for AI service errors that routers translate to HTTP errors."""
+    status_code = 500
+    
+    def __init__(self, message: str = "", headers: Optional[Dict[str, str]] = None):
+        super().__init__(message)
+        self.headers = headers
+
+
+class PromptTooLargeError(AIServiceError):
+    """The rendered prompt does not fit the model context or the configured limit."""
+    status_code = 413
+
+
+class RateLimitedError(AIServiceError):
+    """The upstream rate limit did not free up in time; retry after retry_after seconds."""
+    status_code = 429
+    
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message, headers={"Retry-After": str(max(1, math.ceil(retry_after)))})
+        self.retry_after = retry_after
+
+
+class UpstreamUnavailableError(AIServiceError):
+    """The AI provider kept failing (5xx / connection errors) after retries."""
+    status_code = 503
+
+
+class CircuitOpenError(AIServiceError):
+    """The upstream's circuit breaker is open; calls fail fast until it recovers."""
+    status_code = 503
+    
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message, headers={"Retry-After": str(max(1, math.ceil(retry_after)))})
+        self.retry_after = retry_after
+
+
+class ImageGenerationError(AIServiceError):
+    """The image provider returned an error or no usable image."""
+    status_code = 502
+
+
+class JobQueueFullError(AIServiceError):
+    """Too many background jobs are waiting; retry after retry_after seconds."""
+    status_code = 503
+    
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message, headers={"Retry-After": str(max(1, math.ceil(retry_after)))})
+        self.retry_after = retry_after
+
+
+class RenderTimeoutError(AIServiceError):
+    """A document render did not finish within its time limit."""
+    status_code = 504
@@ -0,0 +1,140 @@
+"""
+BizForge Export Cache
+Disk cache for rendered documents, bounded by total size.
+
+Each entry is one file, <root>/<key>.<ext>, where the key is a hash of
+everything that determines the document. Renderers write to a temporary
+path that is committed into place, and hits are opened as files so they
+can be streamed without loading them into memory. Entries are evicted
+least recently used first once the cache grows past max_bytes. The index
+is rebuilt from the directory on start-up (by modification time, which is
+refreshed on every hit).
+"""
+
+import asyncio
+import os
+import uuid
+from collections import OrderedDict
+from typing import BinaryIO, List, Optional
+
+from app.config import get_settings
+
+
+class ExportCache:
+    """Size-bounded LRU cache of rendered files on local disk."""
+
+    def __init__(self, root: str, max_bytes: int, ext: str = "pdf"):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.ext = ext
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(root, exist_ok=True)
+        self._load()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, f"{key}.{self.ext}")
+
+    def _load(self) -> None:
+        suffix = f".{self.ext}"
+        files = []
+        for name in os.listdir(self.root):
+            if name.endswith((".tmp", ".part")):
+                # Left behind by an interrupted render
+                os.remove(os.path.join(self.root, name))
+            elif name.endswith(suffix):
+                stat = os.stat(os.path.join(self.root, name))
+                files.append((stat.st_mtime, name[:-len(suffix)], stat.st_size))
+        for _, key, size in sorted(files):
+            self._entries[key] = size
+            self._bytes += size
+        self._remove(self._pop_victims())
+
+    def _open(self, key: str) -> Optional[BinaryIO]:
+        path = self._path(key)
+        try:
+            fh = open(path, "rb")
+        except FileNotFoundError:
+            return None
+        os.utime(path)  # recency survives restarts
+        return fh
+
+    def _pop_victims(self) -> List[str]:
+        """
+        Drop least recently used entries from the index until within
+        max_bytes (the newest entry is always kept, however large).
+        """
+        victims = []
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            key, size = self._entries.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
+            victims.append(key)
+        return victims
+
+    def _remove(self, keys: List[str]) -> None:
+        for key in keys:
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                # Already gone, or still open for streaming (Windows)
+                pass
+
+    async def open(self, key: str, count: bool = True) -> Optional[BinaryIO]:
+        """
+        Open the cached file for key (caller closes it), or None on a miss.
+        count=False skips the hit/miss counters (e.g. re-opening after a render).
+        """
+        fh = await asyncio.to_thread(self._open, key) if key in self._entries else None
+        if fh is None:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)
+            self.misses += count
+            return None
+        self._entries.move_to_end(key)
+        self.hits += count
+        return fh
+
+    def temp_path(self, key: str) -> str:
+        """A fresh path for a renderer to write key's file to (see commit)."""
+        return f"{self._path(key)}.{uuid.uuid4().hex}.tmp"
+
+    async def commit(self, key: str, tmp_path: str) -> None:
+        """Move a rendered file into the cache, evicting least recently used entries."""
+        size = os.path.getsize(tmp_path)
+        await asyncio.to_thread(os.replace, tmp_path, self._path(key))
+        if key in self._entries:
+            self._bytes -= self._entries.pop(key)
+        self._entries[key] = size
+        self._bytes += size
+        victims = self._pop_victims()
+        if victims:
+            await asyncio.to_thread(self._remove, victims)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions
+        }
+
+
+# Singleton instance
+_export_cache: Optional[ExportCache] = None
+
+
+def get_export_cache() -> ExportCache:
+    """Get or create the export cache singleton."""
+    global _export_cache
+    if _export_cache is None:
+        settings = get_settings()
+        _export_cache = ExportCache(settings.export_cache_dir, settings.export_cache_max_bytes)
+    return _export_cache
@@ -0,0 +1,209 @@
+"""
+BizForge Fast Sentiment Scorer
+Local, lexicon-based sentiment scoring used as a first pass before the LLM.
+
+Scores a batch of texts in one vectorized pass: tokens are mapped to
+valences (with negation, intensifier and "but" clause handling), and the
+per-text aggregation is done with NumPy over the whole batch. Typical cost
+is a few microseconds per short text, versus seconds for an LLM call.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import List, Tuple
+
+import numpy as np
+
+
+# Reported as model_used for fast-path results
+FAST_MODEL_NAME = "bizforge-lexicon-v1"
+
+# Valence per word, roughly on a -3..+3 scale
+LEXICON = {
+    # positive
+    "love": 3.0, "loved": 3.0, "loves": 3.0, "adore": 3.0, "amazing": 3.0, "awesome": 3.0,
+    "excellent": 3.0, "outstanding": 3.0, "perfect": 3.0, "fantastic": 3.0, "wonderful": 3.0,
+    "incredible": 3.0, "superb": 3.0, "brilliant": 3.0, "best": 2.5, "beautiful": 2.5,
+    "great": 2.5, "delighted": 2.5, "impressed": 2.0, "impressive": 2.0, "happy": 2.0,
+    "glad": 2.0, "enjoy": 2.0, "enjoyed": 2.0, "recommend": 2.0, "recommended": 2.0,
+    "good": 1.8, "nice": 1.8, "pleased": 1.8, "satisfied": 1.8, "reliable": 1.5,
+    "friendly": 1.5, "helpful": 1.8, "intuitive": 1.5, "easy": 1.2, "fast": 1.2,
+    "quick": 1.2, "smooth": 1.2, "clean": 1.0, "comfortable": 1.5, "affordable": 1.2,
+    "worth": 1.5, "fine": 0.8, "okay": 0.3, "ok": 0.3, "thanks": 1.2,
+    "thank": 1.2, "fun": 1.8, "favorite": 2.0, "favourite": 2.0, "solid": 1.2,
+    "premium": 1.0, "elegant": 1.8, "stylish": 1.5, "durable": 1.5, "responsive": 1.2,
+    # negative
+    "hate": -3.0, "hated": -3.0, "terrible": -3.0, "awful": -3.0, "horrible": -3.0,
+    "worst": -3.0, "disgusting": -3.0, "scam": -3.0, "useless": -2.5, "garbage": -2.5,
+    "trash": -2.5, "broken": -2.5, "disappointed": -2.2, "disappointing": -2.2,
+    "angry": -2.2, "furious": -3.0, "refund": -1.5, "bad": -2.0, "poor": -2.0,
+    "rude": -2.2, "unhelpful": -2.0, "waste": -2.2, "wasted": -2.2, "fail": -2.0,
+    "failed": -2.0, "fails": -2.0, "problem": -1.5, "problems": -1.5, "issue": -1.2,
+    "issues": -1.2, "bug": -1.5, "buggy": -2.0, "slow": -1.5, "late": -1.5,
+    "delayed": -1.5, "expensive": -1.2, "overpriced": -2.0, "cheap": -1.0, "difficult": -1.2,
+    "confusing": -1.5, "annoying": -2.0, "frustrating": -2.2, "frustrated": -2.2,
+    "missing": -1.5, "damaged": -2.2, "defective": -2.5, "wrong": -1.5,
+    "unacceptable": -2.5, "sad": -1.8, "upset": -2.0, "crash": -2.0, "crashes": -2.0,
+    "break": -2.0, "breaks": -2.0, "broke": -2.0,
+    "mediocre": -1.2, "meh": -0.8, "boring": -1.5, "ugly": -2.0, "noisy": -1.2,
+}
+
+NEGATORS = {
+    "not", "no", "never", "none", "nobody", "nothing", "neither", "nor", "without",
+    "isn't", "wasn't", "aren't", "weren't", "don't", "doesn't", "didn't", "can't",
+    "cannot", "couldn't", "won't", "wouldn't", "shouldn't", "hardly", "barely",
+    "isnt", "wasnt", "dont", "doesnt", "didnt", "cant", "wont",
+}
+
+INTENSIFIERS = {
+    "very": 1.3, "really": 1.3, "extremely": 1.5, "so": 1.2, "super": 1.3,
+    "incredibly": 1.5, "absolutely": 1.4, "totally": 1.3, "completely": 1.3,
+    "highly": 1.3, "quite": 1.1, "slightly": 0.6, "somewhat": 0.7, "kinda": 0.7,
+    "bit": 0.7, "little": 0.8,
+}
+
+CONTRASTS = {"but", "however", "although", "though", "yet"}
+
+# Negation flips (and dampens) the next few sentiment-bearing tokens
+NEGATION_WINDOW = 3
+NEGATION_FACTOR = -0.75
+
+# Normalization constant for the compound score (as in VADER)
+ALPHA = 15.0
+
+TOKEN_RE = re.compile(r"[a-z']+|[!?.;]")
+
+# A "but" clause with no sentiment words leaves the outcome uncertain, and
+# so does one that overrides sentiment of the opposite polarity
+UNRESOLVED_CONTRAST_FACTOR = 0.6
+CONTRAST_FACTOR = 0.6
+
+
+@dataclass
+class FastSentiment:
+    """Local scoring result for one text."""
+    label: str  # Positive | Negative | Neutral | Mixed
+    confidence: float  # 0..1
+    compound: float  # -1..1
+    positive: float  # summed positive valence
+    negative: float  # summed negative valence (as a positive number)
+
+
+def _token_valences(text: str) -> Tuple[List[float], bool, bool]:
+    """
+    Per-token valences after negation, intensifier and contrast rules,
+    plus whether a contrast clause ("but ...") carried no sentiment words
+    and whether the text has a contrast at all.
+    """
+    tokens = TOKEN_RE.findall(text.lower())
+    valences = []
+    negate_left = 0
+    boost = 1.0
+    contrast_at = None
+    for token in tokens:
+        if token in CONTRASTS:
+            contrast_at = len(valences)
+            negate_left = 0
+            continue
+        if token in NEGATORS:
+            negate_left = NEGATION_WINDOW
+            continue
+        if token in INTENSIFIERS:
+            boost *= INTENSIFIERS[token]
+            continue
+        if token in ("!", "?", ".", ";"):
+            if token == "!" and valences:
+                valences[-1] *= 1.1
+            # Negation and intensifiers do not cross sentence boundaries
+            negate_left = 0
+            boost = 1.0
+            continue
+        valence = LEXICON.get(token)
+        if valence is None:
+            negate_left = max(0, negate_left - 1)
+            continue
+        valence *= boost
+        if negate_left:
+            valence *= NEGATION_FACTOR
+            negate_left = 0
+        boost = 1.0
+        valences.append(valence)
+    # Clause after "but" dominates the one before it
+    if contrast_at is None:
+        return valences, False, False
+    unresolved = contrast_at == len(valences)
+    valences = [v * 0.5 for v in valences[:contrast_at]] + [v * 1.5 for v in valences[contrast_at:]]
+    return valences, unresolved, True
+
+
+def score_texts(texts: List[str]) -> List[FastSentiment]:
+    """Score a batch of texts in one vectorized pass."""
+    if not texts:
+        return []
+
+    scored = [_token_valences(t) for t in texts]
+    lengths = np.fromiter((len(v) for v, _, _ in scored), dtype=np.int64, count=len(texts))
+    unresolved = np.fromiter((u for _, u, _ in scored), dtype=bool, count=len(texts))
+    contrasted = np.fromiter((c for _, _, c in scored), dtype=bool, count=len(texts))
+    flat = np.fromiter((x for v, _, _ in scored for x in v), dtype=np.float64, count=int(lengths.sum()))
+    owner = np.repeat(np.arange(len(texts)), lengths)
+
+    positive = np.bincount(owner, weights=np.clip(flat, 0, None), minlength=len(texts)).astype(np.float64)
+    negative = np.bincount(owner, weights=np.clip(-flat, 0, None), minlength=len(texts)).astype(np.float64)
+    total = positive - negative
+    compound = total / np.sqrt(total * total + ALPHA)
+
+    # Mixed: both polarities carry substantial weight
+    strength = positive + negative
+    balance = np.divide(
+        np.minimum(positive, negative), strength,
+        out=np.zeros_like(strength), where=strength > 0
+    )
+    mixed = (balance >= 0.3) & (np.minimum(positive, negative) >= 1.5)
+
+    # Confidence follows the polarity (which already grows with the summed
+    # valence) and shrinks quickly as the opposite polarity gains weight.
+    # Calibrated so that one strong word ("Love it!", "Terrible.") clears
+    # the default threshold while weak, negated-only, contrasted or mixed
+    # text escalates (see tests/test_fast_sentiment.py).
+    confidence = np.abs(compound) * (1.0 - balance) ** 2
+    neutral = (np.abs(compound) < 0.2) & ~mixed
+    evidence = 1.0 - np.exp(-lengths / 2.0)
+    confidence = np.where(neutral, 0.5 * (1.0 - np.abs(compound) / 0.2) * evidence + 0.2, confidence)
+    confidence = np.where(unresolved, confidence * UNRESOLVED_CONTRAST_FACTOR, confidence)
+    confidence = np.where(contrasted & (balance > 0), confidence * CONTRAST_FACTOR, confidence)
+    confidence = np.where(lengths == 0, 0.3, confidence)
+
+    labels = np.where(
+        mixed, "Mixed",
+        np.where(neutral | (lengths == 0), "Neutral", np.where(compound > 0, "Positive", "Negative"))
+    )
+
+    return [
+        FastSentiment(
+            label=str(labels[i]),
+            confidence=round(float(np.clip(confidence[i], 0.0, 1.0)), 4),
+            compound=round(float(compound[i]), 4),
+            positive=round(float(positive[i]), 3),
+            negative=round(float(negative[i]), 3)
+        )
+        for i in range(len(texts))
+    ]
+
+
+def needs_escalation(result: FastSentiment, threshold: float) -> bool:
+    """Whether a text should go to the LLM for a full analysis."""
+    return result.label == "Mixed" or result.confidence < threshold
+
+
+def render_analysis(result: FastSentiment) -> str:
+    """Short markdown analysis for fast-path responses."""
+    return (
+        f"**Overall Sentiment**: {result.label} "
+        f"(confidence {round(result.confidence * 100)}%)\n\n"
+        f"- Positive signal: {result.positive}\n"
+        f"- Negative signal: {result.negative}\n"
+        f"- Compound score: {result.compound}\n\n"
+        "_Scored by the local fast-path model. Request `mode=full` for "
+        "emotional breakdown, brand implications and recommendations._"
+    )
@@ -0,0 +1,57 @@
+"""
+BizForge Google Sign-In
+Verifies Google ID tokens (the `credential` handed to the frontend by
+Google Identity Services) so user endpoints trust only Google's signature,
+never a client-supplied user id.
+"""
+
+import asyncio
+
+from app.config import get_settings
+
+try:
+    from google.auth.exceptions import GoogleAuthError, TransportError
+    from google.auth.transport import requests as google_requests
+    from google.oauth2 import id_token
+except ImportError:  # optional dependency; only needed for the user endpoints
+    id_token = None
+
+# Reused so Google's signing certificates are fetched over a kept-alive session
+_request = None
+
+
+class SignInUnavailable(Exception):
+    """Tokens cannot be verified (not configured, or Google unreachable)."""
+
+
+def _verify(token: str, client_id: str) -> dict:
+    global _request
+    if _request is None:
+        _request = google_requests.Request()
+    try:
+        return id_token.verify_oauth2_token(token, _request, audience=client_id)
+    except TransportError as e:
+        raise SignInUnavailable(f"Could not fetch Google signing keys: {e}")
+    except GoogleAuthError as e:
+        # e.g. a validly signed token from the wrong issuer
+        raise ValueError(str(e))
+
+
+async def verify_google_id_token(token: str) -> dict:
+    """
+    Verify a Google ID token and return its claims.
+
+    Checks the signature, expiry, issuer and that the audience is
+    GOOGLE_CLIENT_ID. Raises ValueError for a token that fails any check
+    and SignInUnavailable when verification cannot be done at all.
+    """
+    client_id = get_settings().google_client_id
+    if not client_id:
+        raise SignInUnavailable("Google Sign-In is not configured (GOOGLE_CLIENT_ID)")
+    if id_token is None:
+        raise SignInUnavailable("google-auth is not installed")
+    # Verification may fetch Google's certificates, so it runs in a thread
+    claims = await asyncio.to_thread(_verify, token, client_id)
+    if not claims.get("sub"):
+        raise ValueError("Token has no subject")
+    return claims
@@ -0,0 +1,173 @@
+"""
+BizForge Logo Derivatives
+Resized variants of generated logos, rendered off the event loop.
+
+From one 1024px source logo the pipeline produces:
+    <size>.png / <size>.webp   512, 256, 128 and 64 px thumbnails
+    favicon.ico                16-64 px multi-size favicon
+    og.png, twitter.png        social-card images (logo centred on a canvas
+    square.png                 filled with the logo's background colour)
+
+Resizing runs in a process pool (Pillow holds the GIL for most of the
+work). Each variant is stored in the blob store, and a manifest per source
+digest (<blob root>/derivatives/<digest>.json) maps variant names to blob
+digests, so a logo's variants are computed once and then served from disk.
+Pillow is optional; without it no variants are produced.
+"""
+
+import asyncio
+import io
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional
+
+from app.config import get_settings
+from app.services.blob_store import BlobStore, get_blob_store
+from app.services.coalescing import SingleFlight
+
+try:
+    from PIL import Image
+except ImportError:  # optional dependency
+    Image = None
+
+THUMBNAIL_SIZES = (512, 256, 128, 64)
+FAVICON_SIZES = (16, 32, 48, 64)
+SOCIAL_CARDS = {
+    "og": (1200, 630),       # Open Graph (Facebook, LinkedIn)
+    "twitter": (1200, 600),  # Twitter / X summary_large_image
+    "square": (1080, 1080),  # Instagram
+}
+
+
+def _encode(image, fmt: str, **options) -> bytes:
+    buffer = io.BytesIO()
+    image.save(buffer, format=fmt, **options)
+    return buffer.getvalue()
+
+
+def render_derivatives(source_path: str) -> Dict[str, bytes]:
+    """Render every variant of a logo (runs in a worker process)."""
+    with Image.open(source_path) as opened:
+        source = opened.convert("RGBA")
+    variants: Dict[str, bytes] = {}
+
+    for size in THUMBNAIL_SIZES:
+        thumb = source.resize((size, size), Image.LANCZOS)
+        variants[f"{size}.png"] = _encode(thumb, "PNG", optimize=True)
+        variants[f"{size}.webp"] = _encode(thumb, "WEBP", quality=85, method=4)
+
+    variants["favicon.ico"] = _encode(
+        source.resize((64, 64), Image.LANCZOS), "ICO", sizes=[(s, s) for s in FAVICON_SIZES]
+    )
+
+    # Logos are generated on a plain background: extend it to the card size
+    background = source.getpixel((0, 0))
+    for name, (width, height) in SOCIAL_CARDS.items():
+        side = min(width, height)
+        card = Image.new("RGBA", (width, height), background)
+        card.paste(source.resize((side, side), Image.LANCZOS), ((width - side) // 2, (height - side) // 2))
+        variants[f"{name}.png"] = _encode(card.convert("RGB"), "PNG", optimize=True)
+
+    return variants
+
+
+class LogoDerivatives:
+    """Computes, caches and looks up logo variants by source digest."""
+
+    def __init__(self, store: BlobStore, workers: int):
+        self.store = store
+        self.workers = workers
+        self.root = os.path.join(store.root, "derivatives")
+        self._manifests: Dict[str, Dict[str, str]] = {}
+        self._inflight = SingleFlight()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self.rendered = 0
+        self.hits = 0
+
+    @property
+    def available(self) -> bool:
+        return Image is not None
+
+    def _manifest_path(self, digest: str) -> str:
+        return os.path.join(self.root, f"{digest}.json")
+
+    def _load_manifest(self, digest: str) -> Optional[Dict[str, str]]:
+        try:
+            with open(self._manifest_path(digest)) as fh:
+                return json.load(fh)
+        except FileNotFoundError:
+            return None
+
+    def _save_manifest(self, digest: str, manifest: Dict[str, str]) -> None:
+        os.makedirs(self.root, exist_ok=True)
+        path = self._manifest_path(digest)
+        tmp = path + ".tmp"
+        with open(tmp, "w") as fh:
+            json.dump(manifest, fh)
+        os.replace(tmp, path)
+
+    async def get(self, digest: str) -> Dict[str, str]:
+        """
+        Variant name -> blob digest for a stored logo, rendering the variants
+        on first use. Returns {} if Pillow is not installed.
+        """
+        if not self.available:
+            return {}
+        manifest = self._manifests.get(digest)
+        if manifest is None:
+            manifest = await asyncio.to_thread(self._load_manifest, digest)
+        if manifest is not None:
+            self.hits += 1
+        else:
+            # Concurrent requests for the same logo share one render
+            manifest = await self._inflight.do(digest, lambda: self._render(digest))
+        self._manifests[digest] = manifest
+        return manifest
+
+    async def _render(self, digest: str) -> Dict[str, str]:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        loop = asyncio.get_running_loop()
+        variants = await loop.run_in_executor(self._pool, render_derivatives, self.store.path(digest))
+
+        def store_all() -> Dict[str, str]:
+            manifest = {name: self.store.put(data) for name, data in variants.items()}
+            self._save_manifest(digest, manifest)
+            return manifest
+
+        manifest = await asyncio.to_thread(store_all)
+        self.rendered += 1
+        return manifest
+
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def stats(self) -> dict:
+        return {
+            "available": self.available,
+            "rendered": self.rendered,
+            "cache_hits": self.hits,
+            "pool_started": self._pool is not None
+        }
+
+
+# Singleton instance
+_logo_derivatives: Optional[LogoDerivatives] = None
+
+
+def get_logo_derivatives() -> LogoDerivatives:
+    """Get or create the logo derivative pipeline singleton."""
+    global _logo_derivatives
+    if _logo_derivatives is None:
+        _logo_derivatives = LogoDerivatives(get_blob_store(), get_settings().logo_derivative_workers)
+    return _logo_derivatives
+
+
+def close_logo_derivatives() -> None:
+    """Stop the derivative worker processes on application shutdown."""
+    if _logo_derivatives is not None:
+        _logo_derivatives.shutdown()
@@ -0,0 +1,394 @@
+"""
+BizForge Logo Jobs
+Background logo rendering with a bounded worker pool.
+
+A logo render can take up to a minute, so clients enqueue a job and follow
+its status (queued -> rendering -> done | failed) by polling or over SSE
+instead of holding a request open. A fixed number of workers render jobs
+from a bounded queue.
+
+Progressive jobs render twice with the same seed: a low-step preview
+(previewing -> preview_ready, with preview_url set; no derivatives) and
+then the full-quality image that replaces it (rendering -> done).
+Previews are taken from the queue ahead of full renders, so a new job's
+first look is not stuck behind other jobs' final renders.
+
+Jobs are keyed by their Stability AI payload: an identical prompt joins
+the job still queued or rendering rather than rendering it twice. Once a
+job has finished, the same prompt starts a new job (with a new seed), so
+users can always ask for another variation. Each job is persisted as
+<root>/<job_id>.json, and the image and its derivatives (thumbnails,
+favicon, social cards) live in the blob store, so finished results
+survive restarts and unfinished jobs are re-queued on startup.
+"""
+
+import asyncio
+import base64
+import hashlib
+import itertools
+import json
+import os
+import random
+import time
+import uuid
+from dataclasses import asdict, dataclass, field, replace
+from typing import AsyncIterator, Dict, List, NamedTuple, Optional, Set, Tuple
+
+from app.config import get_settings
+from app.schemas.models import LogoPromptRequest
+from app.services.blob_store import get_blob_store
+from app.services.cancellation import set_deadline
+from app.services.errors import ImageGenerationError, JobQueueFullError
+from app.services.logo_derivatives import get_logo_derivatives
+from app.services.stability import get_stability_client
+
+LOGO_MODEL_NAME = "Stability AI SDXL"
+
+TERMINAL_STATUSES = ("done", "failed")
+
+# Seconds between sweeps for expired finished jobs
+PRUNE_INTERVAL = 3600
+
+# Queue order: previews before full-quality renders
+PREVIEW_PHASE = 0
+FINAL_PHASE = 1
+
+
+def build_logo_payload(request: LogoPromptRequest) -> dict:
+    """Stability AI SDXL text-to-image payload for a logo request."""
+    image_prompt = f"{request.style} logo for {request.brand_name}, {request.industry}, vector art, minimal, clean white background, high quality, professional design, centered"
+    return {
+        "text_prompts": [
+            {"text": image_prompt, "weight": 1},
+            {"text": "blurry, low quality, distorted, text", "weight": -1}  # Negative prompt
+        ],
+        "cfg_scale": 7,
+        "height": 1024,
+        "width": 1024,
+        "samples": 1,
+        "steps": 30,
+        "style_preset": "digital-art"
+    }
+
+
+def image_url(digest: str, ext: str = "png") -> str:
+    """Public URL of a stored image."""
+    return f"{get_settings().api_prefix}/logo/images/{digest}.{ext}"
+
+
+class RenderedLogo(NamedTuple):
+    """A stored logo: its URL and the URLs of its variants by name ("256.webp")."""
+    image_url: str
+    variants: Dict[str, str]
+
+
+async def variant_urls(digest: str) -> Dict[str, str]:
+    """URLs of a stored logo's derivatives, rendering them on first use."""
+    manifest = await get_logo_derivatives().get(digest)
+    return {name: image_url(blob, name.rsplit(".", 1)[1]) for name, blob in manifest.items()}
+
+
+async def render_logo(payload: dict, derivatives: bool = True) -> RenderedLogo:
+    """
+    Render a payload with Stability AI and store the PNG, plus its
+    derivatives unless derivatives is False (previews).
+    """
+    if not get_settings().stability_api_key:
+        raise ImageGenerationError("STABILITY_API_KEY is not configured")
+    response = await get_stability_client().text_to_image(payload)
+    if response.status_code != 200:
+        error_text = response.text[:300] if response.text else "Unknown error"
+        raise ImageGenerationError(f"Stability AI error {response.status_code}: {error_text}")
+    png = base64.b64decode(response.json()["artifacts"][0]["base64"])
+    digest = await asyncio.to_thread(get_blob_store().put, png)
+    if not derivatives:
+        return RenderedLogo(image_url(digest), {})
+    try:
+        variants = await variant_urls(digest)
+    except Exception as e:
+        # The logo itself is fine; clients fall back to the full image
+        print(f"⚠️ Logo derivatives failed: {e}")
+        variants = {}
+    return RenderedLogo(image_url(digest), variants)
+
+
+def _payload_key(payload: dict) -> str:
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+@dataclass
+class LogoJobState:
+    """Persisted logo job (<job_id>.json)."""
+    job_id: str
+    key: str  # hash of the payload; identical prompts share a job
+    payload: dict
+    status: str = "queued"  # queued | previewing | preview_ready | rendering | done | failed
+    progressive: bool = False
+    seed: int = 0  # shared by the preview and the final render
+    preview_url: Optional[str] = None
+    image_url: Optional[str] = None
+    variants: Dict[str, str] = field(default_factory=dict)
+    model_used: Optional[str] = None
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    updated_at: float = field(default_factory=time.time)
+
+
+class LogoJobManager:
+    """Queues, renders, tracks and publishes logo jobs."""
+
+    def __init__(self, root: str, workers: int, max_queued: int, retention: float = 0.0):
+        self.root = root
+        self.workers = workers
+        self.max_queued = max_queued
+        self.retention = retention
+        self._pruned_at = 0.0
+        self._states: Dict[str, LogoJobState] = {}
+        self._by_key: Dict[str, LogoJobState] = {}
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._sequence = itertools.count()
+        self._workers: List[asyncio.Task] = []
+        self.deduplicated = 0
+        os.makedirs(root, exist_ok=True)
+
+    # ============ Persistence ============
+
+    def _path(self, job_id: str) -> str:
+        return os.path.join(self.root, f"{os.path.basename(job_id)}.json")
+
+    def _save(self, state: LogoJobState) -> None:
+        state.updated_at = time.time()
+        path = self._path(state.job_id)
+        tmp = path + ".tmp"
+        with open(tmp, "w") as fh:
+            json.dump(asdict(state), fh)
+        os.replace(tmp, path)
+
+    def _load(self) -> None:
+        for name in os.listdir(self.root):
+            if not name.endswith(".json"):
+                continue
+            with open(os.path.join(self.root, name)) as fh:
+                state = LogoJobState(**json.load(fh))
+            self._states[state.job_id] = state
+            if state.status not in TERMINAL_STATUSES:
+                self._by_key[state.key] = state
+
+    def get(self, job_id: str) -> Optional[LogoJobState]:
+        return self._states.get(job_id)
+
+    def prune(self) -> int:
+        """Delete finished jobs older than the retention period. Returns how many."""
+        self._pruned_at = time.monotonic()
+        if self.retention <= 0:
+            return 0
+        cutoff = time.time() - self.retention
+        expired = [
+            state.job_id for state in self._states.values()
+            if state.status in TERMINAL_STATUSES
+            and state.updated_at < cutoff
+            and state.job_id not in self._subscribers
+        ]
+        for job_id in expired:
+            del self._states[job_id]
+            try:
+                os.remove(self._path(job_id))
+            except FileNotFoundError:
+                pass
+        return len(expired)
+
+    # ============ Lifecycle ============
+
+    async def start(self) -> None:
+        """Load persisted jobs, re-queue unfinished ones and start the workers."""
+        self._queue = asyncio.PriorityQueue()
+        self._load()
+        self.prune()
+        for state in sorted(self._states.values(), key=lambda s: s.created_at):
+            if state.status not in TERMINAL_STATUSES:
+                print(f"🔁 Re-queueing logo job {state.job_id}")
+                preview_pending = state.progressive and state.preview_url is None
+                state.status = "queued"
+                self._enqueue(state, PREVIEW_PHASE if preview_pending else FINAL_PHASE)
+        self._workers = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+
+    async def shutdown(self) -> None:
+        """Stop the workers; unfinished jobs are re-queued on next start."""
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers.clear()
+
+    def create(self, request: LogoPromptRequest, progressive: bool = False) -> Tuple[LogoJobState, bool]:
+        """
+        Enqueue a logo job, or return the unfinished job for an identical
+        prompt. Returns (state, deduplicated).
+        """
+        payload = build_logo_payload(request)
+        key = _payload_key(payload)
+        existing = self._by_key.get(key)
+        if existing is not None:
+            self.deduplicated += 1
+            return existing, True
+        if self._queue.qsize() >= self.max_queued:
+            raise JobQueueFullError("Too many logo jobs queued, please retry later", retry_after=30)
+        if time.monotonic() - self._pruned_at >= PRUNE_INTERVAL:
+            self.prune()
+
+        seed = random.randint(1, 2 ** 32 - 1)
+        state = LogoJobState(
+            job_id=uuid.uuid4().hex,
+            key=key,
+            payload={**payload, "seed": seed},
+            progressive=progressive,
+            seed=seed
+        )
+        self._states[state.job_id] = state
+        self._by_key[key] = state
+        self._save(state)
+        self._enqueue(state, PREVIEW_PHASE if progressive else FINAL_PHASE)
+        return state, False
+
+    def _enqueue(self, state: LogoJobState, phase: int) -> None:
+        self._queue.put_nowait((phase, next(self._sequence), state.job_id))
+
+    # ============ Workers ============
+
+    async def _work(self) -> None:
+        # Jobs outlive the request that created them
+        set_deadline(None)
+        while True:
+            phase, _, job_id = await self._queue.get()
+            state = self._states[job_id]
+            try:
+                if phase == PREVIEW_PHASE:
+                    await self._preview(state)
+                    self._enqueue(state, FINAL_PHASE)
+                else:
+                    await self._render(state)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # e.g. the job's JSON could not be written: the job fails,
+                # the worker carries on with the next one
+                print(f"⚠️ Logo job {job_id} failed: {e}")
+                self._fail(state, str(e))
+
+    async def _render(self, state: LogoJobState) -> None:
+        """Render the full-quality image and finish the job."""
+        self._update(state, status="rendering")
+        try:
+            logo = await render_logo(state.payload)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self._fail(state, str(e))
+            return
+        self._finish(state)
+        try:
+            self._update(
+                state,
+                status="done",
+                image_url=logo.image_url,
+                variants=logo.variants,
+                model_used=LOGO_MODEL_NAME
+            )
+        except OSError as e:
+            # The image exists and followers were told the job is done: keep
+            # it done rather than failing it after the fact
+            print(f"⚠️ Could not save logo job {state.job_id}: {e}")
+
+    def _fail(self, state: LogoJobState, error: str) -> None:
+        self._finish(state)
+        try:
+            self._update(state, status="failed", error=error)
+        except OSError as e:
+            print(f"⚠️ Could not save logo job {state.job_id}: {e}")
+
+    def _finish(self, state: LogoJobState) -> None:
+        """Stop deduplicating against a job: the next identical prompt renders anew."""
+        if self._by_key.get(state.key) is state:
+            del self._by_key[state.key]
+
+    async def _preview(self, state: LogoJobState) -> None:
+        """Render the low-step preview; the job then waits for its final render."""
+        self._update(state, status="previewing")
+        payload = {**state.payload, "steps": get_settings().logo_preview_steps}
+        try:
+            # Derivatives are only worth computing for the final image
+            logo = await render_logo(payload, derivatives=False)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # The full render may still succeed
+            print(f"⚠️ Logo preview failed for job {state.job_id}: {e}")
+            self._update(state, status="queued")
+            return
+        self._update(state, status="preview_ready", preview_url=logo.image_url)
+
+    def _update(self, state: LogoJobState, **changes) -> None:
+        for name, value in changes.items():
+            setattr(state, name, value)
+        try:
+            self._save(state)
+        finally:
+            # Followers see the change even if it could not be persisted
+            for queue in self._subscribers.get(state.job_id, ()):
+                queue.put_nowait(replace(state))
+
+    # ============ Status events ============
+
+    async def events(self, job_id: str, heartbeat: float = 15.0) -> AsyncIterator[Optional[LogoJobState]]:
+        """
+        Yield the job's current state, then every change until it finishes.
+        None is yielded after heartbeat idle seconds (to keep streams alive).
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        self._subscribers.setdefault(job_id, set()).add(queue)
+        try:
+            state = replace(self._states[job_id])
+            yield state
+            while state.status not in TERMINAL_STATUSES:
+                try:
+                    state = await asyncio.wait_for(queue.get(), heartbeat)
+                except asyncio.TimeoutError:
+                    yield None
+                    continue
+                yield state
+        finally:
+            subscribers = self._subscribers.get(job_id)
+            if subscribers is not None:
+                subscribers.discard(queue)
+                if not subscribers:
+                    del self._subscribers[job_id]
+
+    def stats(self) -> dict:
+        """Queue depth and job counts by status, for /health."""
+        counts: Dict[str, int] = {}
+        for state in self._states.values():
+            counts[state.status] = counts.get(state.status, 0) + 1
+        return {
+            "workers": len(self._workers),
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "jobs": counts,
+            "deduplicated": self.deduplicated
+        }
+
+
+# Singleton instance
+_logo_job_manager: Optional[LogoJobManager] = None
+
+
+def get_logo_job_manager() -> LogoJobManager:
+    """Get or create the logo job manager singleton."""
+    global _logo_job_manager
+    if _logo_job_manager is None:
+        settings = get_settings()
+        _logo_job_manager = LogoJobManager(
+            settings.logo_jobs_dir,
+            workers=settings.logo_job_workers,
+            max_queued=settings.logo_job_max_queued,
+            retention=settings.logo_job_retention_seconds
+        )
+    return _logo_job_manager
@@ -0,0 +1,148 @@
+"""
+BizForge Model Routing
+Per-task model selection with live health and latency tracking.
+
+Each task (or budget key such as "content:tagline") maps to an ordered list
+of candidate models. Calls go to the first healthy candidate; a model that
+fails repeatedly is skipped for a cooldown period, after which it is tried
+again. Per route and model, recent upstream latencies are kept so a hedged
+request can be sent when a call runs past the usual p95.
+"""
+
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+
+class _ModelHealth:
+    """Error tracking for one model."""
+
+    def __init__(self):
+        self.requests = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.error_rate = 0.0  # EWMA over recent calls
+        self.cooldown_until = 0.0
+
+
+class ModelRouter:
+    """
+    Chooses candidate models per task and records how they perform.
+
+    hedge_delay() returns the task/model p95 latency once min_samples calls
+    have been observed (never less than min_hedge_delay), or None when
+    hedging is disabled or there is not enough data yet.
+    """
+
+    def __init__(
+        self,
+        routes: Dict[str, List[str]],
+        failure_threshold: int = 3,
+        cooldown: float = 30.0,
+        hedging: bool = False,
+        min_samples: int = 20,
+        min_hedge_delay: float = 0.5,
+        window: int = 200
+    ):
+        self.routes = {key: list(dict.fromkeys(models)) for key, models in routes.items() if models}
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.hedging = hedging
+        self.min_samples = min_samples
+        self.min_hedge_delay = min_hedge_delay
+        self.window = window
+        self._health: Dict[str, _ModelHealth] = {}
+        self._latency: Dict[Tuple[str, str], Deque[float]] = {}
+        self.fallbacks = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    def route(self, key: str) -> List[str]:
+        """Configured models for a key ("content:tagline" falls back to "content", then "default")."""
+        return self.routes.get(self._route_key(key), [])
+
+    def _route_key(self, key: str) -> str:
+        """The routing-table entry a key resolves to ("default" when none matches)."""
+        for candidate in (key, key.split(":", 1)[0]):
+            if candidate in self.routes:
+                return candidate
+        return "default"
+
+    def candidates(self, key: str) -> List[str]:
+        """Models to try for a key, in order: healthy ones first, cooling-down ones last."""
+        now = time.monotonic()
+        models = self.route(key)
+        healthy = [m for m in models if self._health_of(m).cooldown_until <= now]
+        return healthy + [m for m in models if m not in healthy]
+
+    def _health_of(self, model: str) -> _ModelHealth:
+        health = self._health.get(model)
+        if health is None:
+            health = self._health[model] = _ModelHealth()
+        return health
+
+    def record_success(self, key: str, model: str, latency: Optional[float] = None) -> None:
+        health = self._health_of(model)
+        health.requests += 1
+        health.consecutive_failures = 0
+        health.error_rate *= 0.9
+        if latency is None:
+            return
+        # Latency is tracked per routing-table entry, not per caller key, so
+        # keys that share a route share samples and the set stays bounded
+        key = self._route_key(key)
+        samples = self._latency.get((key, model))
+        if samples is None:
+            samples = self._latency[(key, model)] = deque(maxlen=self.window)
+        samples.append(latency)
+
+    def record_failure(self, model: str) -> None:
+        health = self._health_of(model)
+        health.requests += 1
+        health.failures += 1
+        health.consecutive_failures += 1
+        health.error_rate = 0.9 * health.error_rate + 0.1
+        if health.consecutive_failures >= self.failure_threshold:
+            health.cooldown_until = time.monotonic() + self.cooldown
+            health.consecutive_failures = 0
+
+    def _percentile(self, key: str, model: str, q: float) -> Optional[float]:
+        samples = self._latency.get((key, model))
+        if not samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+    def hedge_delay(self, key: str, model: str) -> Optional[float]:
+        """Seconds after which a call should be hedged, or None to not hedge."""
+        key = self._route_key(key)
+        if not self.hedging or len(self._latency.get((key, model), ())) < self.min_samples:
+            return None
+        return max(self.min_hedge_delay, self._percentile(key, model, 0.95))
+
+    def stats(self) -> dict:
+        """Per-model health and per-task latency percentiles."""
+        now = time.monotonic()
+        latency = {}
+        for (key, model), samples in self._latency.items():
+            latency.setdefault(key, {})[model] = {
+                "samples": len(samples),
+                "p50_ms": round(1000 * self._percentile(key, model, 0.5)),
+                "p95_ms": round(1000 * self._percentile(key, model, 0.95))
+            }
+        return {
+            "routes": self.routes,
+            "fallbacks": self.fallbacks,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "models": {
+                model: {
+                    "requests": h.requests,
+                    "failures": h.failures,
+                    "error_rate": round(h.error_rate, 3),
+                    "cooling_down_for": round(max(0.0, h.cooldown_until - now), 1)
+                }
+                for model, h in self._health.items()
+            },
+            "latency": latency
+        }
@@ -0,0 +1,508 @@
+"""
+BizForge PDF Renderer
+Brand-guide PDFs rendered in a process pool.
+
+ReportLab layout is pure-Python CPU work, so rendering in the request
+handler would stall every other request on the event loop. Documents are
+rendered in worker processes instead; each worker builds its paragraph and
+table styles and warms ReportLab's font metrics once, at start-up.
+
+Workers write the PDF straight to a file, which the API streams to the
+client, so the API process never holds whole documents in memory. The
+logo is downsampled once per render and that one image is reused for the
+cover and every page header.
+
+At most max_pending renders are queued or running; beyond that callers get
+JobQueueFullError (503). A render that takes longer than timeout seconds
+fails with RenderTimeoutError (504). A worker process cannot be interrupted
+mid-render, so a timed-out render that is already running retires its pool
+(the workers are terminated and a fresh pool takes new work); its slot
+stays counted until the worker is really gone. Workers write to a .part
+file that is renamed into place on success, so out_path never holds a
+partial document.
+
+Output is byte-for-byte reproducible (ReportLab's invariant mode), so a
+brand guide is fully identified by brand_guide_key and can be cached and
+served with a strong ETag.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+import tempfile
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional, Tuple
+from xml.sax.saxutils import escape
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.lib.units import inch
+from reportlab.pdfbase import pdfmetrics
+from reportlab.platypus import Image as RLImage
+from reportlab.platypus import PageBreak, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+from app.config import get_settings
+from app.services.errors import JobQueueFullError, RenderTimeoutError
+
+try:
+    from PIL import Image
+except ImportError:  # optional dependency; without it the logo is left out
+    Image = None
+
+FONTS = ("Helvetica", "Helvetica-Bold", "Helvetica-Oblique", "Times-Roman", "Courier")
+
+# Bump whenever the brand-guide layout changes, to invalidate cached PDFs
+BRAND_GUIDE_TEMPLATE_VERSION = "2"
+
+# The logo is downsampled to this size once per render (2.5in at ~240 dpi)
+LOGO_MAX_PIXELS = 600
+MAX_SWATCHES = 12
+
+HEX_COLOR_RE = re.compile(r"#?([0-9a-fA-F]{6}|[0-9a-fA-F]{3})")
+HEX_COLOR_IN_TEXT_RE = re.compile(r"#[0-9a-fA-F]{6}\b")
+
+SPECIMEN_TEXT = "The quick brown fox jumps over the lazy dog 0123456789"
+SPECIMEN_SIZES = (24, 14, 10)
+SERIF_HINTS = ("serif", "times", "georgia", "garamond", "playfair", "merriweather", "lora", "baskerville")
+MONO_HINTS = ("mono", "code", "courier")
+
+# Per-process styles, built once by _init_worker
+_styles: Optional[dict] = None
+
+
+def _build_styles() -> dict:
+    sample = getSampleStyleSheet()
+    return {
+        "title": ParagraphStyle(
+            'CustomTitle',
+            parent=sample['Heading1'],
+            fontSize=28,
+            spaceAfter=30,
+            textColor=colors.HexColor('#667eea')
+        ),
+        "heading": ParagraphStyle(
+            'CustomHeading',
+            parent=sample['Heading2'],
+            fontSize=16,
+            spaceAfter=12,
+            textColor=colors.HexColor('#333333')
+        ),
+        "body": ParagraphStyle(
+            'CustomBody',
+            parent=sample['Normal'],
+            fontSize=11,
+            spaceAfter=8,
+            leading=16
+        ),
+        "subheading": ParagraphStyle(
+            'CustomSubheading',
+            parent=sample['Heading3'],
+            fontSize=12,
+            spaceAfter=6,
+            textColor=colors.HexColor('#667eea')
+        ),
+        "normal": sample['Normal'],
+        "italic": sample['Italic'],
+        "voice_table": TableStyle([
+            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#f8f9fa')),
+            ('TEXTCOLOR', (0, 0), (-1, -1), colors.HexColor('#333333')),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
+            ('TOPPADDING', (0, 0), (-1, -1), 10),
+            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#dee2e6')),
+        ]),
+        "palette_table": TableStyle([
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('TEXTCOLOR', (0, 0), (-1, -1), colors.HexColor('#333333')),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('LINEBELOW', (0, 0), (-1, -1), 0.5, colors.HexColor('#dee2e6')),
+        ]),
+    }
+
+
+def _init_worker() -> None:
+    """Process-pool initializer: load font metrics and build styles."""
+    global _styles
+    for font in FONTS:
+        pdfmetrics.getFont(font)
+    _styles = _build_styles()
+
+
+def brand_guide_key(data: dict, generated_on: str) -> str:
+    """Canonical hash of everything that determines a brand-guide PDF."""
+    canonical = json.dumps(
+        {"template": BRAND_GUIDE_TEMPLATE_VERSION, "generated_on": generated_on, "data": data},
+        sort_keys=True,
+        separators=(",", ":")
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _typeface(font_name: str) -> str:
+    """Closest standard PDF font for a font family name."""
+    name = font_name.lower()
+    if any(word in name for word in MONO_HINTS):
+        return "Courier"
+    if "sans" not in name and any(word in name for word in SERIF_HINTS):
+        return "Times-Roman"
+    return "Helvetica"
+
+
+def _hex_color(value: str) -> Optional[str]:
+    """Normalise "#abc" / "aabbcc" to "#AABBCC", or None if not a hex colour."""
+    match = HEX_COLOR_RE.fullmatch(value.strip())
+    if match is None:
+        return None
+    digits = match.group(1)
+    if len(digits) == 3:
+        digits = "".join(c * 2 for c in digits)
+    return f"#{digits.upper()}"
+
+
+def _palette(data: dict) -> List[dict]:
+    """Swatches from the palette list, the primary/secondary colours and palette_text."""
+    swatches: List[dict] = []
+    seen = set()
+
+    def add(value: str, name: str = "", usage: str = "") -> None:
+        hex_value = _hex_color(value or "")
+        if hex_value and hex_value not in seen and len(swatches) < MAX_SWATCHES:
+            seen.add(hex_value)
+            swatches.append({"hex": hex_value, "name": name, "usage": usage})
+
+    if data.get("primary_color"):
+        add(data["primary_color"], "Primary")
+    if data.get("secondary_color"):
+        add(data["secondary_color"], "Secondary")
+    for color in data.get("palette") or []:
+        add(color.get("hex", ""), color.get("name") or "", color.get("usage") or "")
+    # Hex codes mentioned in generated design recommendations
+    for value in HEX_COLOR_IN_TEXT_RE.findall(data.get("palette_text") or ""):
+        add(value)
+    return swatches
+
+
+def _text(value: str) -> str:
+    """Escape user text for a Paragraph, keeping line breaks."""
+    return escape(value).replace("\n", "<br/>")
+
+
+def _prepare_logo(source_path: str, work_dir: str) -> Optional[str]:
+    """Downsample the logo once; the file is drawn on the cover and in every page header."""
+    if Image is None or not os.path.isfile(source_path):
+        return None
+    with Image.open(source_path) as image:
+        image = image.convert("RGBA")
+        image.thumbnail((LOGO_MAX_PIXELS, LOGO_MAX_PIXELS), Image.LANCZOS)
+        path = os.path.join(work_dir, "logo.png")
+        image.save(path, "PNG", optimize=True)
+    return path
+
+
+def render_brand_guide(data: dict, generated_on: str, out_path: str) -> None:
+    """
+    Render a brand guide PDF to out_path (runs in a worker process).
+
+    Optional sections (logo, palette swatches, typography specimens,
+    content samples, sentiment summary) are included when data has them.
+    """
+    if _styles is None:
+        _init_worker()
+    styles = _styles
+    title_style, heading_style, body_style = styles["title"], styles["heading"], styles["body"]
+    brand_name = _text(data['brand_name'])
+
+    part_path = f"{out_path}.part"
+    with tempfile.TemporaryDirectory() as work_dir:
+        logo_path = _prepare_logo(data["logo_path"], work_dir) if data.get("logo_path") else None
+
+        def header(canvas, doc) -> None:
+            canvas.saveState()
+            canvas.setFont("Helvetica", 9)
+            canvas.setFillColor(colors.HexColor('#888888'))
+            canvas.drawRightString(letter[0] - 72, 40, str(doc.page))
+            if doc.page == 1:
+                canvas.restoreState()
+                return
+            if logo_path:
+                # Same file as the cover logo: embedded once, referenced per page
+                canvas.drawImage(logo_path, 72, letter[1] - 56, width=24, height=24, mask="auto")
+            canvas.drawString(104 if logo_path else 72, letter[1] - 48, f"{data['brand_name']} Brand Guide")
+            canvas.restoreState()
+
+        doc = SimpleDocTemplate(part_path, pagesize=letter,
+                                rightMargin=72, leftMargin=72,
+                                topMargin=72, bottomMargin=72,
+                                invariant=True)  # no timestamps / random IDs
+
+        story = []
+
+        # Title
+        if logo_path:
+            story.append(RLImage(logo_path, width=2.5*inch, height=2.5*inch))
+            story.append(Spacer(1, 20))
+        story.append(Paragraph(f"{brand_name} Brand Guide", title_style))
+        story.append(Paragraph(f"Generated by BizForge • {generated_on}", styles['italic']))
+        story.append(Spacer(1, 30))
+
+        # Tagline
+        if data.get("tagline"):
+            story.append(Paragraph("Tagline", heading_style))
+            story.append(Paragraph(f'"{_text(data["tagline"])}"', body_style))
+            story.append(Spacer(1, 20))
+
+        # About
+        if data.get("description"):
+            story.append(Paragraph("Brand Description", heading_style))
+            story.append(Paragraph(_text(data["description"]), body_style))
+            story.append(Spacer(1, 20))
+
+        # Industry
+        if data.get("industry"):
+            story.append(Paragraph("Industry", heading_style))
+            story.append(Paragraph(_text(data["industry"].title()), body_style))
+            story.append(Spacer(1, 20))
+
+        # Brand Voice
+        brand_voice = data.get("brand_voice")
+        if brand_voice:
+            story.append(Paragraph("Brand Voice DNA", heading_style))
+            voice_data = [
+                ["Personality", str(brand_voice.get('personality', 'Not specified'))],
+                ["Tone", str(brand_voice.get('tone', 'Not specified'))],
+                ["Target Audience", str(brand_voice.get('target_audience', 'Not specified'))],
+            ]
+            voice_table = Table(voice_data, colWidths=[2*inch, 4*inch])
+            voice_table.setStyle(styles["voice_table"])
+            story.append(voice_table)
+            story.append(Spacer(1, 20))
+
+        # Colors
+        swatches = _palette(data)
+        if swatches:
+            story.append(Paragraph("Color Palette", heading_style))
+            rows = [["", "Color", "HEX", "RGB"]]
+            for swatch in swatches:
+                color = colors.HexColor(swatch["hex"])
+                rgb = ", ".join(str(round(channel * 255)) for channel in (color.red, color.green, color.blue))
+                label = swatch["name"] + (f" - {swatch['usage']}" if swatch["usage"] else "")
+                rows.append(["", Paragraph(_text(label), body_style), swatch["hex"], rgb])
+            palette_table = Table(rows, colWidths=[0.8*inch, 2.6*inch, 1.1*inch, 1.5*inch], rowHeights=[20] + [36] * len(swatches))
+            palette_table.setStyle(TableStyle(
+                styles["palette_table"].getCommands()
+                + [('BACKGROUND', (0, i), (0, i), colors.HexColor(s["hex"])) for i, s in enumerate(swatches, 1)]
+            ))
+            story.append(palette_table)
+            story.append(Spacer(1, 20))
+        elif data.get("primary_color") or data.get("secondary_color"):
+            story.append(Paragraph("Color Palette", heading_style))
+            colors_text = []
+            if data.get("primary_color"):
+                colors_text.append(f"Primary: {_text(data['primary_color'])}")
+            if data.get("secondary_color"):
+                colors_text.append(f"Secondary: {_text(data['secondary_color'])}")
+            story.append(Paragraph(" | ".join(colors_text), body_style))
+            story.append(Spacer(1, 20))
+
+        # Typography
+        fonts = [(role, data.get(key)) for role, key in (("Primary", "font_primary"), ("Secondary", "font_secondary"))]
+        fonts = [(role, name) for role, name in fonts if name]
+        if fonts:
+            story.append(Paragraph("Typography", heading_style))
+            for role, name in fonts:
+                face = _typeface(name)
+                story.append(Paragraph(f"{role} Font: {_text(name)}", body_style))
+                for size in SPECIMEN_SIZES:
+                    specimen = ParagraphStyle(f"Specimen{size}", parent=body_style, fontName=face, fontSize=size, leading=size * 1.3)
+                    story.append(Paragraph(SPECIMEN_TEXT, specimen))
+                story.append(Paragraph(f"Shown in {face}, the closest standard PDF typeface.", styles['italic']))
+                story.append(Spacer(1, 12))
+            story.append(Spacer(1, 8))
+
+        # Generated content
+        samples = [s for s in data.get("content_samples") or [] if s.get("content")]
+        if samples:
+            story.append(PageBreak())
+            story.append(Paragraph("Content Samples", heading_style))
+            for sample in samples:
+                label = (sample.get("content_type") or "Sample").replace("_", " ").title()
+                story.append(Paragraph(_text(label), styles['subheading']))
+                for block in sample["content"].split("\n\n"):
+                    if block.strip():
+                        story.append(Paragraph(_text(block.strip()), body_style))
+                story.append(Spacer(1, 12))
+
+        # Audience sentiment
+        if data.get("sentiment_summary"):
+            story.append(Paragraph("Audience Sentiment", heading_style))
+            for block in data["sentiment_summary"].split("\n\n"):
+                if block.strip():
+                    story.append(Paragraph(_text(block.strip()), body_style))
+            story.append(Spacer(1, 20))
+
+        # Footer
+        story.append(Spacer(1, 40))
+        story.append(Paragraph("—", styles['normal']))
+        story.append(Paragraph("This brand guide was generated using BizForge AI Branding Suite.",
+                               styles['italic']))
+
+        try:
+            doc.build(story, onFirstPage=header, onLaterPages=header)
+            os.replace(part_path, out_path)
+        finally:
+            if os.path.exists(part_path):
+                os.remove(part_path)
+
+
+def _discard(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _warm_up() -> None:
+    """No-op task that makes the pool start a worker process."""
+
+
+class PDFRenderer:
+    """Bounded, timed-out PDF rendering on a process pool."""
+
+    def __init__(self, workers: int, max_pending: int, timeout: float):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self.pending = 0
+        self.rendered = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.recycled = 0
+        self.render_seconds = 0.0
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+        return self._pool
+
+    async def start(self) -> None:
+        """Start the worker processes ahead of the first export."""
+        loop = asyncio.get_running_loop()
+        pool = self._executor()
+        await asyncio.gather(*[loop.run_in_executor(pool, _warm_up) for _ in range(self.workers)])
+
+    def _submit(self, *args) -> Tuple[ProcessPoolExecutor, Future]:
+        pool = self._executor()
+        future = pool.submit(render_brand_guide, *args)
+        self.pending += 1
+        loop = asyncio.get_running_loop()
+
+        def release(_: Future) -> None:
+            # The slot is held until the worker is done, even after a timeout
+            try:
+                loop.call_soon_threadsafe(self._release)
+            except RuntimeError:  # loop already closed (shutdown)
+                pass
+
+        future.add_done_callback(release)
+        return pool, future
+
+    def _release(self) -> None:
+        self.pending -= 1
+
+    def _abandon(self, pool: ProcessPoolExecutor, future: Future) -> None:
+        """Stop a render nobody waits for any more."""
+        if future.cancel() or future.done():
+            return  # still queued, or finished meanwhile
+        if pool is not self._pool:
+            return  # its pool is already being retired
+        # A running worker cannot be interrupted: retire the whole pool
+        self._pool = None
+        self.recycled += 1
+        for process in list(pool._processes.values()):
+            process.terminate()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    async def render_brand_guide(self, data: dict, generated_on: str, out_path: str) -> None:
+        """Render a brand guide to out_path, failing fast when the queue is full."""
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise JobQueueFullError("Too many PDF exports in progress, please retry shortly", retry_after=5)
+        started = time.monotonic()
+        for attempt in range(2):
+            pool, future = self._submit(data, generated_on, out_path)
+            waiter = asyncio.wrap_future(future)
+            try:
+                await asyncio.wait_for(asyncio.shield(waiter), self.timeout)
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+                # The abandoned render's outcome (e.g. BrokenProcessPool) is not
+                # needed; a terminated worker may leave its .part file behind
+                waiter.add_done_callback(lambda f: f.cancelled() or f.exception())
+                waiter.add_done_callback(lambda _: _discard(f"{out_path}.part"))
+                self._abandon(pool, future)
+                raise RenderTimeoutError(f"PDF rendering took longer than {self.timeout:g}s")
+            except asyncio.CancelledError:
+                future.cancel()  # only if still queued; a running render finishes
+                raise
+            except BrokenProcessPool:
+                # Its pool was retired after another render timed out: retry once
+                if attempt:
+                    raise
+                continue
+            break
+        self.rendered += 1
+        self.render_seconds += time.monotonic() - started
+
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "pending": self.pending,
+            "rendered": self.rendered,
+            "rejected": self.rejected,
+            "timeouts": self.timeouts,
+            "pools_recycled": self.recycled,
+            "avg_render_ms": round(1000 * self.render_seconds / self.rendered, 1) if self.rendered else 0.0
+        }
+
+
+# Singleton instance
+_pdf_renderer: Optional[PDFRenderer] = None
+
+
+def get_pdf_renderer() -> PDFRenderer:
+    """Get or create the PDF renderer singleton."""
+    global _pdf_renderer
+    if _pdf_renderer is None:
+        settings = get_settings()
+        _pdf_renderer = PDFRenderer(
+            workers=settings.pdf_render_workers,
+            max_pending=settings.pdf_render_max_pending,
+            timeout=settings.pdf_render_timeout
+        )
+    return _pdf_renderer
+
+
+async def init_pdf_renderer() -> None:
+    """Start the PDF worker processes on application startup."""
+    await get_pdf_renderer().start()
+
+
+def close_pdf_renderer() -> None:
+    """Stop the PDF worker processes on application shutdown."""
+    if _pdf_renderer is not None:
+        _pdf_renderer.shutdown()
@@ -0,0 +1,60 @@
+"""
+BizForge Request Priority
+Priority classes for upstream AI traffic.
+
+Every request runs with a priority class (interactive, standard or bulk)
+held in a context variable, so it follows the request into the service
+layer and into any tasks it spawns. The class comes from the X-Priority
+request header when given, otherwise from the endpoint. The rate-limit
+scheduler then shares upstream capacity between the classes by weight.
+"""
+
+from contextvars import ContextVar
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+PRIORITIES = ("interactive", "standard", "bulk")
+DEFAULT_PRIORITY = "standard"
+
+# Endpoint defaults, matched by path prefix (longest first)
+ENDPOINT_PRIORITIES = {
+    "/api/chat": "interactive",
+    "/api/content/generate/stream": "interactive",
+    "/api/batch": "bulk",
+    "/api/sentiment/analyze-batch": "bulk",
+    "/api/sentiment/jobs": "bulk",
+}
+
+_current_priority: ContextVar[str] = ContextVar("priority", default=DEFAULT_PRIORITY)
+
+
+def get_priority() -> str:
+    """Priority class of the current request or task."""
+    return _current_priority.get()
+
+
+def set_priority(priority: str) -> None:
+    """Set the priority class for the current context (and tasks it creates)."""
+    _current_priority.set(priority if priority in PRIORITIES else DEFAULT_PRIORITY)
+
+
+def endpoint_priority(path: str) -> str:
+    """Default priority class for an endpoint path."""
+    for prefix in sorted(ENDPOINT_PRIORITIES, key=len, reverse=True):
+        if path.startswith(prefix):
+            return ENDPOINT_PRIORITIES[prefix]
+    return DEFAULT_PRIORITY
+
+
+class PriorityMiddleware:
+    """Assigns each HTTP request its priority class (X-Priority header or endpoint default)."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            requested = Headers(scope=scope).get("x-priority", "").strip().lower()
+            set_priority(requested if requested in PRIORITIES else endpoint_priority(scope["path"]))
+        await self.app(scope, receive, send)
@@ -0,0 +1,376 @@
+"""
+BizForge Rate Limiting
+Client-side scheduling of Groq calls within the account's rate limits.
+
+Each model has two token buckets: requests per minute and tokens per
+minute. A call waits in a queue until both buckets can cover it
+(prompt estimate + max_tokens), so bursts are smoothed into the highest
+rate the account allows instead of turning into 429s. Unused tokens are
+refunded once the actual usage is known.
+
+Calls are granted in weighted-fair order across priority classes
+(interactive, standard, bulk), so a bulk job only takes the capacity the
+higher classes leave, and never the last slice of the token budget.
+
+The buckets follow Groq's rate-limit headers:
+    x-ratelimit-limit-tokens / -remaining-tokens   tokens per minute
+    x-ratelimit-remaining-requests / -reset-requests   requests per day
+and a 429 pauses the whole model for Retry-After (plus jitter) rather
+than letting every queued call retry at once.
+"""
+
+import asyncio
+import math
+import random
+import re
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, List, Mapping, Optional, TypeVar
+
+from groq import APIConnectionError, APIStatusError, RateLimitError
+
+from app.services.cancellation import remaining_time
+from app.services.errors import RateLimitedError, UpstreamUnavailableError
+from app.services.priority import PRIORITIES, get_priority
+
+T = TypeVar("T")
+
+_DURATION_RE = re.compile(r"([\d.]+)(ms|h|m|s)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def parse_duration(value: Optional[str]) -> Optional[float]:
+    """Parse Groq reset durations ("7.66s", "2m59.56s", "120ms") or plain seconds."""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_RE.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts)
+
+
+class TokenBucket:
+    """Continuously refilling bucket: capacity units per period seconds."""
+
+    def __init__(self, capacity: float, period: float = 60.0):
+        self.capacity = capacity
+        self.period = period
+        self.level = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.capacity / self.period)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until amount units are available (0 if they are now)."""
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) * self.period / self.capacity
+
+    def consume(self, amount: float) -> None:
+        self._refill()
+        self.level -= min(amount, self.capacity)
+
+    def refund(self, amount: float) -> None:
+        self._refill()
+        self.level = min(self.capacity, self.level + amount)
+
+    def sync(self, limit: Optional[float], remaining: Optional[float]) -> None:
+        """Adopt the server's limit and never assume more than it reports remaining."""
+        self._refill()
+        if limit:
+            self.capacity = limit
+        if remaining is not None:
+            self.level = min(self.level, remaining)
+
+
+class _Waiter:
+    """A call waiting for capacity, ordered by its weighted-fair finish tag."""
+
+    def __init__(self, tokens: int, priority: str, finish: float):
+        self.tokens = tokens
+        self.priority = priority
+        self.finish = finish
+        self.granted: asyncio.Future = asyncio.get_running_loop().create_future()
+
+
+class _ModelLimiter:
+    """Buckets, pause state and the weighted-fair queue for one model."""
+
+    def __init__(self, rpm: int, tpm: int, weights: Dict[str, float], bulk_headroom: float):
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.paused_until = 0.0
+        self.weights = weights
+        self.bulk_headroom = bulk_headroom
+        self.queues: Dict[str, Deque[_Waiter]] = {priority: deque() for priority in weights}
+        self.last_finish: Dict[str, float] = {priority: 0.0 for priority in weights}
+        self.virtual_time = 0.0
+        self.wakeup = asyncio.Event()
+        self.dispatcher: Optional[asyncio.Task] = None
+
+    @property
+    def queued(self) -> int:
+        return sum(len(queue) for queue in self.queues.values())
+
+    def wait_time(self, tokens: int, priority: str = "interactive") -> float:
+        pause = self.paused_until - time.monotonic()
+        # Bulk calls leave a slice of the token budget for the other classes
+        reserve = self.tokens.capacity * self.bulk_headroom if priority == "bulk" else 0.0
+        return max(
+            pause,
+            self.requests.wait_time(1),
+            self.tokens.wait_time(min(tokens + reserve, self.tokens.capacity)),
+            0.0
+        )
+
+    def pause(self, seconds: float) -> None:
+        # Jitter spreads the restart of several workers/processes sharing the key
+        until = time.monotonic() + seconds + random.uniform(0, 0.1 * seconds + 0.05)
+        self.paused_until = max(self.paused_until, until)
+
+    def enqueue(self, tokens: int, priority: str) -> _Waiter:
+        # WFQ: a class's share of the token budget is proportional to its weight
+        start = max(self.virtual_time, self.last_finish[priority])
+        waiter = _Waiter(tokens, priority, start + tokens / self.weights[priority])
+        self.last_finish[priority] = waiter.finish
+        self.queues[priority].append(waiter)
+        self.wakeup.set()
+        if self.dispatcher is None or self.dispatcher.done():
+            self.dispatcher = asyncio.create_task(self._dispatch())
+        return waiter
+
+    def _heads(self) -> List[_Waiter]:
+        """Drop abandoned waiters; return each class's head, by finish tag."""
+        heads = []
+        for queue in self.queues.values():
+            while queue and queue[0].granted.done():
+                queue.popleft()
+            if queue:
+                heads.append(queue[0])
+        return sorted(heads, key=lambda w: w.finish)
+
+    async def _dispatch(self) -> None:
+        """Grant queued calls one at a time, as the buckets allow."""
+        while heads := self._heads():
+            waiter = heads[0]
+            wait = self.wait_time(waiter.tokens, waiter.priority)
+            if wait > 0:
+                # A higher class that fits right now may overtake a waiting head
+                rank = PRIORITIES.index(waiter.priority)
+                waiter = next((
+                    w for w in heads[1:]
+                    if PRIORITIES.index(w.priority) < rank and self.wait_time(w.tokens, w.priority) == 0
+                ), None)
+            if waiter is None:
+                # Re-evaluate early if a call arrives that may go first
+                self.wakeup.clear()
+                try:
+                    await asyncio.wait_for(self.wakeup.wait(), wait)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            self.queues[waiter.priority].popleft()
+            self.requests.consume(1)
+            self.tokens.consume(waiter.tokens)
+            self.virtual_time = max(
+                self.virtual_time, waiter.finish - waiter.tokens / self.weights[waiter.priority]
+            )
+            waiter.granted.set_result(None)
+
+
+class RateLimitScheduler:
+    """
+    Queues upstream calls per model so they stay within RPM/TPM limits,
+    granting them in weighted-fair order of their priority class.
+
+    Calls that hit a 429 or a transient upstream failure are retried with
+    jittered exponential backoff (or after Retry-After when given). A call
+    that cannot start within max_wait seconds fails with RateLimitedError,
+    which carries a Retry-After for the client.
+    """
+
+    def __init__(
+        self,
+        rpm: int,
+        tpm: int,
+        weights: Dict[str, float],
+        bulk_headroom: float = 0.2,
+        max_wait: float = 60.0,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_cap: float = 20.0
+    ):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.weights = weights
+        self.bulk_headroom = bulk_headroom
+        self.max_wait = max_wait
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self._limiters: Dict[str, _ModelLimiter] = {}
+        self._waits: Dict[str, Deque[float]] = {priority: deque(maxlen=500) for priority in weights}
+        self.throttled = 0
+        self.retries = 0
+        self.rejected = 0
+
+    def _limiter(self, model: str) -> _ModelLimiter:
+        limiter = self._limiters.get(model)
+        if limiter is None:
+            limiter = self._limiters[model] = _ModelLimiter(
+                self.rpm, self.tpm, self.weights, self.bulk_headroom
+            )
+        return limiter
+
+    async def run(self, model: str, tokens: int, call: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run call() once the model's buckets allow a request of tokens.
+
+        call must return a raw Groq response (with .headers) so the buckets
+        can follow the server's view of the limits. The full reservation
+        stays consumed; use settle() to refund what was not used.
+        """
+        limiter = self._limiter(model)
+        # Never queue past the request's own deadline (X-Deadline-Ms)
+        remaining = remaining_time()
+        max_wait = self.max_wait if remaining is None else min(self.max_wait, remaining)
+        deadline = time.monotonic() + max_wait
+        for attempt in range(self.max_retries + 1):
+            await self._acquire(limiter, tokens, deadline)
+            try:
+                response = await call()
+            except RateLimitError as e:
+                self.throttled += 1
+                limiter.tokens.refund(tokens)
+                self.observe(model, e.response.headers)
+                delay = parse_duration(e.response.headers.get("retry-after"))
+                limiter.pause(delay if delay is not None else self._backoff(attempt))
+                if attempt == self.max_retries:
+                    raise RateLimitedError(
+                        "Upstream rate limit reached, please retry later",
+                        retry_after=max(0.0, limiter.paused_until - time.monotonic())
+                    ) from e
+            except (APIConnectionError, APIStatusError) as e:
+                limiter.tokens.refund(tokens)
+                transient = not isinstance(e, APIStatusError) or e.status_code >= 500
+                if not transient or attempt == self.max_retries:
+                    if transient:
+                        raise UpstreamUnavailableError(f"AI provider unavailable: {e}") from e
+                    raise
+                await asyncio.sleep(self._backoff(attempt))
+            except Exception:
+                # e.g. an open circuit breaker: the call never reached the upstream
+                limiter.tokens.refund(tokens)
+                raise
+            except asyncio.CancelledError:
+                # Deadline or disconnect before a response: usage is unknown, so
+                # return the reservation (the next response's headers correct
+                # the bucket if the call did reach Groq)
+                limiter.tokens.refund(tokens)
+                raise
+            else:
+                self.observe(model, response.headers)
+                return response
+            self.retries += 1
+
+    async def _acquire(self, limiter: _ModelLimiter, tokens: int, deadline: float) -> None:
+        """Wait in the model's weighted-fair queue until the request is granted."""
+        priority = get_priority()
+        started = time.monotonic()
+        waiter = limiter.enqueue(tokens, priority)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.granted), max(0.0, deadline - started))
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if waiter.granted.done() and not waiter.granted.cancelled():
+                # Granted just as the deadline passed or the caller went away:
+                # the call will not be made, so return the capacity
+                limiter.requests.refund(1)
+                limiter.tokens.refund(tokens)
+            if isinstance(e, asyncio.TimeoutError):
+                self._reject(limiter.wait_time(tokens, priority))
+            raise
+        finally:
+            if not waiter.granted.done():
+                # Timed out or cancelled: give up the place in the queue
+                waiter.granted.cancel()
+                limiter.wakeup.set()
+        self._waits[priority].append(time.monotonic() - started)
+
+    def _reject(self, wait: float) -> None:
+        self.rejected += 1
+        raise RateLimitedError(
+            "Too many requests queued for the AI provider, please retry later",
+            retry_after=wait
+        )
+
+    def _backoff(self, attempt: int) -> float:
+        # "Full jitter": random delay up to the exponential bound
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+
+    def queued(self, model: str) -> int:
+        """Calls waiting for capacity on a model."""
+        limiter = self._limiters.get(model)
+        return limiter.queued if limiter is not None else 0
+
+    def settle(self, model: str, reserved: int, used: Optional[int]) -> None:
+        """Refund the part of a reservation the call did not use."""
+        if used is not None and used < reserved:
+            self._limiter(model).tokens.refund(reserved - used)
+
+    def observe(self, model: str, headers: Mapping[str, str]) -> None:
+        """Align the model's buckets with Groq's rate-limit headers."""
+        limiter = self._limiter(model)
+
+        def number(name: str) -> Optional[float]:
+            try:
+                return float(headers[name])
+            except (KeyError, TypeError, ValueError):
+                return None
+
+        limiter.tokens.sync(number("x-ratelimit-limit-tokens"), number("x-ratelimit-remaining-tokens"))
+        # The request headers describe the daily quota: pause until it resets
+        if number("x-ratelimit-remaining-requests") == 0:
+            reset = parse_duration(headers.get("x-ratelimit-reset-requests"))
+            if reset:
+                limiter.pause(reset)
+
+    def stats(self) -> dict:
+        """Queue depth, wait times per priority class and throttling counters."""
+        now = time.monotonic()
+        classes = {}
+        for priority, waits in self._waits.items():
+            ordered = sorted(waits)
+            classes[priority] = {
+                "queued": sum(len(limiter.queues[priority]) for limiter in self._limiters.values()),
+                "avg_wait_ms": round(1000 * sum(ordered) / len(ordered), 1) if ordered else 0.0,
+                "p95_wait_ms": (
+                    round(1000 * ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 1)
+                    if ordered else 0.0
+                )
+            }
+        return {
+            "queued": sum(limiter.queued for limiter in self._limiters.values()),
+            "throttled": self.throttled,
+            "retries": self.retries,
+            "rejected": self.rejected,
+            "priorities": classes,
+            "models": {
+                model: {
+                    "queued": limiter.queued,
+                    "requests_available": math.floor(limiter.requests.level),
+                    "tokens_available": math.floor(limiter.tokens.level),
+                    "tokens_per_minute": int(limiter.tokens.capacity),
+                    "paused_for": round(max(0.0, limiter.paused_until - now), 2)
+                }
+                for model, limiter in self._limiters.items()
+            }
+        }
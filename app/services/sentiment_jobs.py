@@ -0,0 +1,388 @@
+"""
+BizForge Sentiment Jobs
+Resumable bulk sentiment analysis for large CSV / NDJSON uploads.
+
+Each job lives in its own directory:
+    input.<fmt>     the uploaded file, copied to disk in chunks
+    state.json      progress and the checkpoint (byte offset into input)
+    results.ndjson  one JSON line per record, in input order
+
+Records are parsed as a stream from the checkpoint offset, grouped into
+chunks and fed through a bounded queue to a pool of workers. Results are
+committed strictly in input order, so the checkpoint always marks a prefix
+of the input whose results are already on disk; a restarted job resumes
+from there without repeating or skipping records.
+"""
+
+import asyncio
+import csv
+import json
+import os
+import shutil
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from fastapi import UploadFile
+
+from app.config import get_settings
+from app.services.ai_service import get_ai_service
+from app.services.cancellation import set_deadline
+from app.services.priority import set_priority
+
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Seconds between sweeps for expired finished jobs
+PRUNE_INTERVAL = 3600
+
+# A parsed record: (record id or None, text or None if unusable, end offset)
+Record = Tuple[Optional[str], Optional[str], int]
+
+
+@dataclass
+class JobState:
+    """Persisted job state (state.json)."""
+    job_id: str
+    format: str
+    context: str
+    text_field: str
+    id_field: str
+    mode: str = "auto"  # fast | full | auto (see analyze_sentiment_batch)
+    status: str = "queued"  # queued | running | completed | failed
+    bytes_total: int = 0
+    offset: int = 0  # checkpoint: input bytes whose results are committed
+    records_done: int = 0
+    records_failed: int = 0
+    results_bytes: int = 0
+    fieldnames: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    updated_at: float = field(default_factory=time.time)
+
+
+def _iter_records(path: str, state: JobState) -> Iterator[Record]:
+    """Stream records from the checkpoint offset, tracking byte positions."""
+    with open(path, "rb") as fh:
+        fh.seek(state.offset)
+        position = state.offset
+
+        def lines() -> Iterator[str]:
+            nonlocal position
+            for raw in fh:
+                position += len(raw)
+                yield raw.decode("utf-8", errors="replace")
+
+        if state.format == "ndjson":
+            for line in lines():
+                if not line.strip():
+                    continue
+                try:
+                    obj = json.loads(line)
+                except ValueError:
+                    yield None, None, position
+                    continue
+                if isinstance(obj, dict):
+                    text = obj.get(state.text_field)
+                    record_id = obj.get(state.id_field)
+                    yield (
+                        str(record_id) if record_id is not None else None,
+                        text if isinstance(text, str) else None,
+                        position
+                    )
+                else:
+                    yield None, obj if isinstance(obj, str) else None, position
+        else:
+            names = state.fieldnames
+            text_col = names.index(state.text_field) if state.text_field in names else 0
+            id_col = names.index(state.id_field) if state.id_field in names else None
+            for row in csv.reader(lines()):
+                if not row:
+                    continue
+                text = row[text_col] if text_col < len(row) else None
+                record_id = row[id_col] if id_col is not None and id_col < len(row) else None
+                yield record_id, text, position
+
+
+async def _in_thread(fn, *args):
+    """
+    Run fn in a worker thread. If the caller is cancelled, wait for the
+    thread to finish before propagating, so nothing it touches (the record
+    iterator, the results file, state.json) is still in use afterwards.
+    """
+    task = asyncio.ensure_future(asyncio.to_thread(fn, *args))
+    try:
+        return await asyncio.shield(task)
+    except asyncio.CancelledError:
+        await asyncio.wait([task])
+        raise
+
+
+def _read_csv_header(path: str) -> Tuple[List[str], int]:
+    """Read the CSV header row; returns the field names and the data offset."""
+    with open(path, "rb") as fh:
+        first = fh.readline()
+    names = next(csv.reader([first.decode("utf-8-sig", errors="replace")]), [])
+    return [n.strip() for n in names], len(first)
+
+
+class SentimentJobManager:
+    """Creates, runs, tracks and resumes sentiment jobs."""
+
+    def __init__(self, root: str):
+        self.root = root
+        self.settings = get_settings()
+        self._states: Dict[str, JobState] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._pruned_at = 0.0
+        os.makedirs(root, exist_ok=True)
+
+    # ============ Paths & persistence ============
+
+    def _dir(self, job_id: str) -> str:
+        return os.path.join(self.root, job_id)
+
+    def input_path(self, state: JobState) -> str:
+        return os.path.join(self._dir(state.job_id), f"input.{state.format}")
+
+    def results_path(self, job_id: str) -> str:
+        return os.path.join(self._dir(job_id), "results.ndjson")
+
+    def _save(self, state: JobState) -> None:
+        state.updated_at = time.time()
+        path = os.path.join(self._dir(state.job_id), "state.json")
+        tmp = path + ".tmp"
+        with open(tmp, "w") as fh:
+            json.dump(asdict(state), fh)
+        os.replace(tmp, path)
+
+    def get(self, job_id: str) -> Optional[JobState]:
+        """Return the job state, loading it from disk if needed."""
+        if job_id in self._states:
+            return self._states[job_id]
+        path = os.path.join(self._dir(os.path.basename(job_id)), "state.json")
+        if not os.path.exists(path):
+            return None
+        with open(path) as fh:
+            state = JobState(**json.load(fh))
+        self._states[job_id] = state
+        return state
+
+    async def prune(self) -> int:
+        """Delete finished jobs older than the retention period. Returns how many."""
+        self._pruned_at = time.monotonic()
+        retention = self.settings.sentiment_job_retention_seconds
+        if retention <= 0:
+            return 0
+        cutoff = time.time() - retention
+        expired = [
+            state.job_id for state in self._states.values()
+            if state.status in ("completed", "failed")
+            and state.updated_at < cutoff
+            and state.job_id not in self._tasks
+        ]
+        for job_id in expired:
+            del self._states[job_id]
+            await asyncio.to_thread(shutil.rmtree, self._dir(job_id), True)
+        return len(expired)
+
+    # ============ Lifecycle ============
+
+    async def create(
+        self,
+        upload: UploadFile,
+        fmt: str,
+        context: str,
+        text_field: str,
+        id_field: str,
+        mode: str = "auto"
+    ) -> JobState:
+        """Copy the upload to disk in chunks and start processing it."""
+        if time.monotonic() - self._pruned_at >= PRUNE_INTERVAL:
+            await self.prune()
+        state = JobState(
+            job_id=uuid.uuid4().hex,
+            format=fmt,
+            context=context,
+            text_field=text_field,
+            id_field=id_field,
+            mode=mode
+        )
+        os.makedirs(self._dir(state.job_id))
+
+        path = self.input_path(state)
+        try:
+            with open(path, "wb") as out:
+                while chunk := await upload.read(UPLOAD_CHUNK_SIZE):
+                    state.bytes_total += len(chunk)
+                    if state.bytes_total > self.settings.sentiment_job_max_upload_bytes:
+                        raise ValueError(
+                            f"Upload exceeds {self.settings.sentiment_job_max_upload_bytes} bytes"
+                        )
+                    await asyncio.to_thread(out.write, chunk)
+        except BaseException:
+            shutil.rmtree(self._dir(state.job_id), ignore_errors=True)
+            raise
+
+        if fmt == "csv":
+            state.fieldnames, state.offset = await asyncio.to_thread(_read_csv_header, path)
+        open(self.results_path(state.job_id), "wb").close()
+
+        self._states[state.job_id] = state
+        self._save(state)
+        self._start(state)
+        return state
+
+    def _start(self, state: JobState) -> None:
+        self._tasks[state.job_id] = asyncio.create_task(self._run(state))
+
+    async def resume_all(self) -> None:
+        """Restart every unfinished job from its last checkpoint and drop expired ones."""
+        for job_id in os.listdir(self.root):
+            state = self.get(job_id)
+            if state is None or state.status not in ("queued", "running"):
+                continue
+            # Drop result lines written after the last saved checkpoint
+            with open(self.results_path(job_id), "ab") as fh:
+                fh.truncate(state.results_bytes)
+            print(f"🔁 Resuming sentiment job {job_id} at byte {state.offset}")
+            self._start(state)
+        await self.prune()
+
+    async def shutdown(self) -> None:
+        """Stop running jobs; their checkpoints let them resume on next start."""
+        for task in self._tasks.values():
+            task.cancel()
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+        self._tasks.clear()
+
+    # ============ Pipeline ============
+
+    async def _run(self, state: JobState) -> None:
+        # Background work (including jobs resumed at startup) is always bulk
+        # and outlives the request that created it
+        set_priority("bulk")
+        set_deadline(None)
+        state.status = "running"
+        self._save(state)
+
+        window = self.settings.sentiment_job_workers * 2
+        queue: asyncio.Queue = asyncio.Queue(maxsize=window)
+        pending: Dict[int, tuple] = {}
+        # Chunks taken but not yet committed: one slow chunk stalls the
+        # workers after `window` chunks instead of buffering the whole file
+        # in pending
+        uncommitted = asyncio.Semaphore(window)
+        commit_lock = asyncio.Lock()
+        next_commit = [0]
+
+        async def produce() -> None:
+            records = _iter_records(self.input_path(state), state)
+            chunk_size = self.settings.sentiment_job_chunk_size
+            seq = 0
+            try:
+                while True:
+                    chunk = await _in_thread(
+                        lambda: [r for _, r in zip(range(chunk_size), records)]
+                    )
+                    if not chunk:
+                        break
+                    await queue.put((seq, chunk))
+                    seq += 1
+            finally:
+                # Closes the input file, also when the job is cancelled
+                records.close()
+            for _ in range(self.settings.sentiment_job_workers):
+                await queue.put(None)
+
+        async def work() -> None:
+            while True:
+                await uncommitted.acquire()
+                item = await queue.get()
+                if item is None:
+                    uncommitted.release()
+                    return
+                seq, chunk = item
+                lines, failed = await self._analyze_chunk(state, chunk)
+                pending[seq] = (lines, failed, len(chunk), chunk[-1][2])
+                async with commit_lock:
+                    while next_commit[0] in pending:
+                        await _in_thread(self._commit, state, *pending.pop(next_commit[0]))
+                        next_commit[0] += 1
+                        uncommitted.release()
+
+        tasks = [asyncio.create_task(produce())] + [
+            asyncio.create_task(work()) for _ in range(self.settings.sentiment_job_workers)
+        ]
+        try:
+            # A failing worker cancels the producer and the other workers, so
+            # nothing is committed after the job is saved as failed
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+            error = next((t.exception() for t in done if not t.cancelled() and t.exception()), None)
+            if error is not None:
+                raise error
+            state.status = "completed"
+            state.offset = state.bytes_total
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            state.status = "failed"
+            state.error = str(exc)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self._tasks.pop(state.job_id, None)
+        self._save(state)
+
+    async def _analyze_chunk(self, state: JobState, chunk: List[Record]) -> Tuple[List[str], int]:
+        """Classify a chunk and render its result lines (in chunk order)."""
+        texts = [text for _, text, _ in chunk if text and text.strip()]
+        outcomes = await get_ai_service().analyze_sentiment_batch(
+            texts, state.context, mode=state.mode
+        ) if texts else []
+
+        lines, failed, outcome_iter = [], 0, iter(outcomes)
+        for record_id, text, _ in chunk:
+            entry = {"id": record_id}
+            if not text or not text.strip():
+                entry.update(success=False, error=f"Missing '{state.text_field}' text")
+            else:
+                outcome = next(outcome_iter)
+                if isinstance(outcome, str):
+                    entry.update(success=False, error=outcome)
+                else:
+                    entry.update(success=True, sentiment=outcome.model_dump())
+            if not entry["success"]:
+                failed += 1
+            lines.append(entry)
+        return lines, failed
+
+    def _commit(self, state: JobState, lines: List[dict], failed: int, count: int, end_offset: int) -> None:
+        """Append a chunk's results and advance the checkpoint (worker thread)."""
+        payload = "".join(
+            json.dumps({"record": state.records_done + i, **entry}) + "\n"
+            for i, entry in enumerate(lines)
+        ).encode("utf-8")
+        with open(self.results_path(state.job_id), "ab") as fh:
+            fh.write(payload)
+            fh.flush()
+            os.fsync(fh.fileno())
+        state.results_bytes += len(payload)
+        state.records_done += count
+        state.records_failed += failed
+        state.offset = end_offset
+        self._save(state)
+
+
+# Singleton instance
+_job_manager = None
+
+
+def get_sentiment_job_manager() -> SentimentJobManager:
+    """Get or create the sentiment job manager singleton."""
+    global _job_manager
+    if _job_manager is None:
+        _job_manager = SentimentJobManager(get_settings().sentiment_jobs_dir)
+    return _job_manager
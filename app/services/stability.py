@@ -0,0 +1,187 @@
+"""
+BizForge Stability AI Client
+Pooled HTTP client for Stability AI image generation.
+
+One httpx client is shared by every logo request and owned by the
+application lifespan, so DNS, TCP and TLS setup are paid once per
+connection rather than once per logo. HTTP/2 is used when the h2 package
+is installed (concurrent generations then multiplex over one connection);
+otherwise the pool falls back to HTTP/1.1 keep-alive.
+
+The pool is bounded (max_connections), and a request that cannot get a
+connection within the pool timeout fails with httpx.PoolTimeout instead of
+opening more sockets. Connection reuse and pool waits are tracked through
+httpcore's trace extension and reported by stats().
+"""
+
+import time
+from collections import Counter, deque
+from typing import Deque, Optional
+
+import httpx
+
+from app.config import get_settings
+from app.services.circuit_breaker import get_breaker
+
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+STABILITY_API_BASE = "https://api.stability.ai"
+SDXL_TEXT_TO_IMAGE = "/v1/generation/stable-diffusion-xl-1024-v1-0/text-to-image"
+
+# Trace events that mark a connection being handed to a request
+_SEND_HEADERS_EVENTS = ("http11.send_request_headers.started", "http2.send_request_headers.started")
+
+
+def _is_upstream_failure(error: BaseException) -> bool:
+    # A full local pool says nothing about Stability AI's health
+    return not isinstance(error, httpx.PoolTimeout)
+
+
+class StabilityClient:
+    """
+    Shared, bounded connection pool to Stability AI.
+
+    Calls go through the "stability" circuit breaker; 5xx responses raise
+    so the breaker counts them as failures, other responses are returned
+    for the caller to inspect.
+    """
+
+    def __init__(self, http_client: Optional[httpx.AsyncClient] = None):
+        self.settings = get_settings()
+        self.http2 = self.settings.stability_http2 and HTTP2_AVAILABLE
+        self.http_client = http_client or self._create_http_client()
+        self.breaker = get_breaker("stability")
+        self.requests = 0
+        self.in_flight = 0
+        self.waiting = 0
+        self.connections_opened = 0
+        self.connections_reused = 0
+        self.pool_timeouts = 0
+        self.http_versions: Counter = Counter()
+        self._pool_waits: Deque[float] = deque(maxlen=500)
+
+    def _create_http_client(self) -> httpx.AsyncClient:
+        settings = self.settings
+        return httpx.AsyncClient(
+            base_url=STABILITY_API_BASE,
+            http2=self.http2,
+            limits=httpx.Limits(
+                max_connections=settings.stability_max_connections,
+                max_keepalive_connections=settings.stability_max_keepalive_connections,
+                keepalive_expiry=settings.stability_keepalive_expiry
+            ),
+            timeout=httpx.Timeout(
+                settings.stability_read_timeout,
+                connect=settings.stability_connect_timeout,
+                pool=settings.stability_pool_timeout
+            )
+        )
+
+    async def aclose(self) -> None:
+        """Close the shared connection pool."""
+        await self.http_client.aclose()
+
+    async def text_to_image(self, payload: dict) -> httpx.Response:
+        """POST an SDXL text-to-image request through the breaker."""
+        headers = {
+            "Content-Type": "application/json",
+            "Accept": "application/json",
+            "Authorization": f"Bearer {self.settings.stability_api_key}",
+        }
+        return await self.breaker.call(
+            lambda: self._post(SDXL_TEXT_TO_IMAGE, headers, payload),
+            is_failure=_is_upstream_failure
+        )
+
+    async def _post(self, path: str, headers: dict, payload: dict) -> httpx.Response:
+        started = time.monotonic()
+        waiting = True
+        opened = False
+
+        async def trace(event: str, info: dict) -> None:
+            nonlocal waiting, opened
+            if event == "connection.connect_tcp.complete":
+                opened = True
+                self.connections_opened += 1
+            elif event in _SEND_HEADERS_EVENTS and waiting:
+                # Time spent queueing for (or opening) a connection
+                waiting = False
+                self.waiting -= 1
+                self._pool_waits.append(time.monotonic() - started)
+                if not opened:
+                    self.connections_reused += 1
+
+        self.requests += 1
+        self.in_flight += 1
+        self.waiting += 1
+        try:
+            response = await self.http_client.post(
+                path, headers=headers, json=payload, extensions={"trace": trace}
+            )
+        except httpx.PoolTimeout:
+            self.pool_timeouts += 1
+            raise
+        finally:
+            self.in_flight -= 1
+            if waiting:
+                self.waiting -= 1
+        self.http_versions[response.http_version] += 1
+        if response.status_code >= 500:
+            response.raise_for_status()
+        return response
+
+    def stats(self) -> dict:
+        """Connection reuse and pool saturation."""
+        pool = getattr(self.http_client._transport, "_pool", None)
+        connections = list(getattr(pool, "connections", []))
+        waits = sorted(self._pool_waits)
+        return {
+            "http2": self.http2,
+            "requests": self.requests,
+            "in_flight": self.in_flight,
+            "waiting_for_connection": self.waiting,
+            "connections_opened": self.connections_opened,
+            "connections_reused": self.connections_reused,
+            "open_connections": len(connections),
+            "idle_connections": sum(1 for c in connections if c.is_idle()),
+            "max_connections": self.settings.stability_max_connections,
+            "pool_timeouts": self.pool_timeouts,
+            "p95_pool_wait_ms": (
+                round(1000 * waits[min(len(waits) - 1, int(len(waits) * 0.95))], 1) if waits else 0.0
+            ),
+            "http_versions": dict(self.http_versions)
+        }
+
+
+# Singleton instance
+_stability_client: Optional[StabilityClient] = None
+
+
+def get_stability_client() -> StabilityClient:
+    """Get or create the Stability AI client singleton."""
+    global _stability_client
+    if _stability_client is None:
+        _stability_client = StabilityClient()
+    return _stability_client
+
+
+def get_stability_stats() -> dict:
+    """Stats for the Stability AI pool, or {} if it has not been created."""
+    return _stability_client.stats() if _stability_client is not None else {}
+
+
+async def init_stability_client() -> None:
+    """Create the shared Stability AI pool on application startup."""
+    get_stability_client()
+
+
+async def close_stability_client() -> None:
+    """Release the shared Stability AI pool on application shutdown."""
+    global _stability_client
+    if _stability_client is not None:
+        await _stability_client.aclose()
+        _stability_client = None
@@ -0,0 +1,48 @@
+"""
+BizForge Streaming Helpers
+Server-Sent Events formatting for token-streaming endpoints.
+"""
+
+import json
+from typing import AsyncIterator, Optional
+
+
+# Headers that stop proxies (nginx etc.) from buffering the event stream
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",
+}
+
+
+def format_sse(event: str, data: dict) -> str:
+    """Format a single Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def sse_stream(
+    first_event: dict,
+    events: AsyncIterator[dict],
+    done_extra: Optional[dict] = None
+) -> AsyncIterator[str]:
+    """
+    Render AI service stream events as SSE.
+    
+    The first event is awaited by the router before the response starts so
+    that upstream failures still surface as regular HTTP errors; failures
+    after that point are reported as an `error` event.
+    """
+    async def all_events():
+        yield first_event
+        async for event in events:
+            yield event
+    
+    try:
+        async for event in all_events():
+            event_type = event.pop("type")
+            if event_type == "done" and done_extra:
+                event.update(done_extra)
+            yield format_sse(event_type, event)
+    except Exception as e:
+        yield format_sse("error", {"detail": str(e)})
+    finally:
+        await events.aclose()
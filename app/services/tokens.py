@@ -0,0 +1,221 @@
+"""
+BizForge Token Accounting
+Local prompt token estimation and adaptive per-endpoint output budgets.
+
+Prompts are counted with tiktoken when it is installed (cl100k_base is a
+close proxy for the LLaMA tokenizer) and with a character heuristic
+otherwise. The encoding is loaded once at startup, off the event loop
+(tiktoken may download it); if that fails the heuristic is used, so token
+counting never fails a request. Estimates are continuously calibrated
+against the prompt_tokens Groq reports, and the observed completion
+lengths are used to shrink each endpoint's max_tokens from the static
+default to what it actually needs.
+"""
+
+import asyncio
+import math
+from collections import deque
+from typing import Deque, Dict, List, Optional
+
+from app.services.errors import PromptTooLargeError
+
+try:
+    import tiktoken
+except ImportError:  # optional dependency
+    tiktoken = None
+
+
+# Default max_tokens per budget key ("<task>" or "content:<content_type>")
+DEFAULT_OUTPUT_BUDGETS = {
+    "brand_name": 768,
+    "content:tagline": 256,
+    "content:social_post": 512,
+    "content:ad_copy": 512,
+    "content:email": 1024,
+    "content:blog_intro": 768,
+    "content:landing_page": 2048,
+    "content": 1024,
+    "chat": 1024,
+    "chat_summary": 512,
+    "sentiment": 1024,
+    "sentiment_batch": 2048,
+    "design": 2048,
+    "logo_prompt": 1024,
+}
+
+# Per-message framing overhead (role markers, separators)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+# Loaded by init_token_counter; None means the character heuristic is used
+_encoding = None
+
+
+def load_encoding() -> None:
+    """Load the tiktoken encoding (blocking; may download the BPE file)."""
+    global _encoding
+    if tiktoken is None or _encoding is not None:
+        return
+    try:
+        _encoding = tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        print(f"⚠️ tiktoken encoding unavailable, estimating tokens from characters: {e}")
+
+
+async def init_token_counter() -> None:
+    """Load the tiktoken encoding on application startup, off the event loop."""
+    await asyncio.to_thread(load_encoding)
+
+
+def count_tokens(text: str) -> int:
+    """Estimate the token count of text."""
+    if _encoding is not None:
+        try:
+            return len(_encoding.encode(text, disallowed_special=()))
+        except Exception:
+            pass
+    return len(text) // 4 + 1
+
+
+def count_message_tokens(messages: List[dict]) -> int:
+    """Estimate the prompt tokens of a chat message list."""
+    return sum(count_tokens(m.get("content", "")) + MESSAGE_OVERHEAD_TOKENS for m in messages) + 3
+
+
+class _BudgetStats:
+    """Rolling usage statistics for one budget key."""
+    
+    def __init__(self, window: int):
+        self.completions: Deque[int] = deque(maxlen=window)
+        self.truncations: Deque[bool] = deque(maxlen=window)
+        self.requests = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.tuned: Optional[int] = None
+
+
+class TokenBudgeter:
+    """
+    Chooses max_tokens per request and rejects prompts that cannot fit.
+    
+    Once a key has min_samples observations its budget becomes the p95
+    completion length times headroom, clamped to [floor, configured
+    default]. Frequent truncation (finish_reason == "length") grows the
+    budget back towards the default.
+    """
+    
+    def __init__(
+        self,
+        budgets: Dict[str, int],
+        context_window: int,
+        max_prompt_tokens: int,
+        auto_tune: bool = True,
+        window: int = 200,
+        min_samples: int = 20,
+        headroom: float = 1.25,
+        floor: int = 128
+    ):
+        self.budgets = budgets
+        self.context_window = context_window
+        self.max_prompt_tokens = max_prompt_tokens
+        self.auto_tune = auto_tune
+        self.window = window
+        self.min_samples = min_samples
+        self.headroom = headroom
+        self.floor = floor
+        # Ratio actual/estimated prompt tokens (EWMA), corrects the local estimator
+        self.calibration = 1.0
+        self._stats: Dict[str, _BudgetStats] = {}
+    
+    def _default(self, key: str) -> int:
+        if key in self.budgets:
+            return self.budgets[key]
+        return self.budgets.get(key.split(":", 1)[0], 2048)
+    
+    def budget(self, key: str) -> int:
+        """Current max_tokens for a budget key."""
+        stats = self._stats.get(key)
+        if self.auto_tune and stats is not None and stats.tuned is not None:
+            return stats.tuned
+        return self._default(key)
+    
+    def reserve(self, messages: List[dict], key: str) -> tuple:
+        """
+        Estimate the prompt and pick max_tokens for it.
+        Returns (max_tokens, estimated_prompt_tokens); raises PromptTooLargeError.
+        """
+        estimated = count_message_tokens(messages)
+        prompt_tokens = math.ceil(estimated * self.calibration)
+        if prompt_tokens > self.max_prompt_tokens:
+            raise PromptTooLargeError(
+                f"Input too large: ~{prompt_tokens} prompt tokens (limit {self.max_prompt_tokens})"
+            )
+        
+        max_tokens = self.budget(key)
+        available = self.context_window - prompt_tokens
+        if available < min(max_tokens, self.floor):
+            raise PromptTooLargeError(
+                f"Input too large: ~{prompt_tokens} prompt tokens leave no room for a response "
+                f"in the {self.context_window}-token context window"
+            )
+        return min(max_tokens, available), estimated
+    
+    def record(
+        self,
+        key: str,
+        estimated_prompt: int,
+        prompt_tokens: Optional[int],
+        completion_tokens: Optional[int],
+        finish_reason: Optional[str]
+    ) -> None:
+        """Record actual usage from a response and re-tune the key's budget."""
+        stats = self._stats.setdefault(key, _BudgetStats(self.window))
+        stats.requests += 1
+        if prompt_tokens:
+            stats.prompt_tokens += prompt_tokens
+            if estimated_prompt:
+                ratio = min(2.0, max(0.5, prompt_tokens / estimated_prompt))
+                self.calibration = 0.9 * self.calibration + 0.1 * ratio
+        if completion_tokens is None:
+            return
+        stats.completion_tokens += completion_tokens
+        stats.completions.append(completion_tokens)
+        stats.truncations.append(finish_reason == "length")
+        
+        if len(stats.completions) < self.min_samples:
+            return
+        ordered = sorted(stats.completions)
+        p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+        tuned = max(self.floor, math.ceil(p95 * self.headroom))
+        if sum(stats.truncations) / len(stats.truncations) > 0.05:
+            tuned = max(tuned, math.ceil(self.budget(key) * 1.5))
+        stats.tuned = min(tuned, self._default(key))
+    
+    def stats(self) -> dict:
+        """Per-key usage and current budgets."""
+        return {
+            "estimator": "tiktoken" if _encoding is not None else "heuristic",
+            "calibration": round(self.calibration, 3),
+            "budgets": {
+                key: {
+                    "requests": s.requests,
+                    "avg_prompt_tokens": round(s.prompt_tokens / s.requests) if s.requests else 0,
+                    "avg_completion_tokens": (
+                        round(s.completion_tokens / len(s.completions)) if s.completions else 0
+                    ),
+                    "truncations": sum(s.truncations),
+                    "max_tokens": self.budget(key),
+                    "default_max_tokens": self._default(key)
+                }
+                for key, s in self._stats.items()
+            }
+        }
+
+
+def parse_budget_overrides(spec: str) -> Dict[str, int]:
+    """Parse "key=tokens,key=tokens" budget overrides from settings."""
+    overrides = {}
+    for part in spec.split(","):
+        if "=" in part:
+            key, value = part.split("=", 1)
+            overrides[key.strip()] = int(value)
+    return overrides
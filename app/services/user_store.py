@@ -0,0 +1,351 @@
+"""
+BizForge User Store
+Async repository for user profiles, brand voice and generation history.
+
+Two backends implement the same interface:
+    MongoUserRepository   MongoDB via motor (MONGODB_URI set)
+    SQLiteUserRepository  embedded SQLite file, or ":memory:" for tests and
+                          local runs without a database server
+
+Generation history is read newest first with keyset pagination: a page
+is fetched with a range condition on the compound index (google_id,
+created_at, id) and the next_cursor names the last row returned, so the
+cost of a page does not depend on how deep into the history it is (no
+OFFSET / skip).
+"""
+
+import abc
+import asyncio
+import base64
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, List, Optional, Tuple
+
+from app.config import get_settings
+
+try:
+    from motor.motor_asyncio import AsyncIOMotorClient
+    from pymongo import ASCENDING, DESCENDING
+except ImportError:  # optional dependency; only needed for the MongoDB backend
+    AsyncIOMotorClient = None
+
+
+def encode_cursor(created_at: float, generation_id: str) -> str:
+    """Opaque page cursor naming the last generation of a page."""
+    raw = json.dumps([created_at, generation_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[float, str]:
+    """Inverse of encode_cursor; raises ValueError for a malformed cursor."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, generation_id = json.loads(raw)
+        return float(created_at), str(generation_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def _page(rows: List[dict], limit: int) -> Tuple[List[dict], Optional[str]]:
+    """Split limit + 1 fetched rows into a page and the cursor of the next one."""
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1]["created_at"], rows[-1]["id"])
+
+
+class UserRepository(abc.ABC):
+    """Interface shared by the storage backends."""
+
+    backend = ""
+
+    @abc.abstractmethod
+    async def init(self) -> None:
+        """Create tables / indexes."""
+
+    @abc.abstractmethod
+    async def close(self) -> None:
+        """Release connections."""
+
+    @abc.abstractmethod
+    async def upsert_user(self, google_id: str, email: str, name: str, picture: Optional[str]) -> bool:
+        """Create or refresh a user on login; True if the user is new."""
+
+    @abc.abstractmethod
+    async def get_user(self, google_id: str) -> Optional[dict]:
+        """The user's profile, or None if they never signed in."""
+
+    @abc.abstractmethod
+    async def set_brand_voice(self, google_id: str, brand_voice: dict) -> None:
+        """Replace the user's brand voice settings."""
+
+    @abc.abstractmethod
+    async def get_brand_voice(self, google_id: str) -> Optional[dict]:
+        """The user's brand voice settings, or None if unset."""
+
+    @abc.abstractmethod
+    async def add_generation(self, google_id: str, generation_type: str, input: Optional[dict], output: Any) -> dict:
+        """Record a generation and return it (with id and created_at)."""
+
+    @abc.abstractmethod
+    async def list_generations(self, google_id: str, limit: int, cursor: Optional[str] = None) -> Tuple[List[dict], Optional[str]]:
+        """A page of generations, newest first, and the cursor of the next page (or None)."""
+
+    def stats(self) -> dict:
+        return {"backend": self.backend}
+
+
+class SQLiteUserRepository(UserRepository):
+    """Embedded SQLite backend; calls are run in a worker thread."""
+
+    backend = "sqlite"
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> None:
+        if self.path != ":memory:" and os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        if self.path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS users ("
+            "google_id TEXT PRIMARY KEY, email TEXT NOT NULL, name TEXT NOT NULL, picture TEXT, "
+            "brand_voice TEXT, created_at REAL NOT NULL, last_login_at REAL NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS generations ("
+            "id TEXT PRIMARY KEY, google_id TEXT NOT NULL, generation_type TEXT NOT NULL, "
+            "input TEXT, output TEXT, created_at REAL NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS idx_generations_user_created "
+            "ON generations (google_id, created_at, id);"
+        )
+        self._conn.commit()
+
+    def _run(self, fn, *args):
+        with self._lock:
+            return fn(*args)
+
+    async def init(self) -> None:
+        await asyncio.to_thread(self._run, self._connect)
+
+    async def close(self) -> None:
+        if self._conn is not None:
+            await asyncio.to_thread(self._run, self._conn.close)
+            self._conn = None
+
+    def _upsert_user(self, google_id: str, email: str, name: str, picture: Optional[str]) -> bool:
+        now = time.time()
+        is_new = self._conn.execute(
+            "SELECT 1 FROM users WHERE google_id = ?", (google_id,)
+        ).fetchone() is None
+        self._conn.execute(
+            "INSERT INTO users (google_id, email, name, picture, created_at, last_login_at) "
+            "VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (google_id) DO UPDATE SET "
+            "email = excluded.email, name = excluded.name, picture = excluded.picture, "
+            "last_login_at = excluded.last_login_at",
+            (google_id, email, name, picture, now, now)
+        )
+        self._conn.commit()
+        return is_new
+
+    async def upsert_user(self, google_id: str, email: str, name: str, picture: Optional[str]) -> bool:
+        return await asyncio.to_thread(self._run, self._upsert_user, google_id, email, name, picture)
+
+    def _get_user(self, google_id: str) -> Optional[dict]:
+        row = self._conn.execute("SELECT * FROM users WHERE google_id = ?", (google_id,)).fetchone()
+        if row is None:
+            return None
+        user = dict(row)
+        user["brand_voice"] = json.loads(user["brand_voice"]) if user["brand_voice"] else None
+        return user
+
+    async def get_user(self, google_id: str) -> Optional[dict]:
+        return await asyncio.to_thread(self._run, self._get_user, google_id)
+
+    def _set_brand_voice(self, google_id: str, brand_voice: dict) -> None:
+        # The brand voice may be saved before the first /sync
+        now = time.time()
+        self._conn.execute(
+            "INSERT INTO users (google_id, email, name, brand_voice, created_at, last_login_at) "
+            "VALUES (?, '', '', ?, ?, ?) "
+            "ON CONFLICT (google_id) DO UPDATE SET brand_voice = excluded.brand_voice",
+            (google_id, json.dumps(brand_voice), now, now)
+        )
+        self._conn.commit()
+
+    async def set_brand_voice(self, google_id: str, brand_voice: dict) -> None:
+        await asyncio.to_thread(self._run, self._set_brand_voice, google_id, brand_voice)
+
+    async def get_brand_voice(self, google_id: str) -> Optional[dict]:
+        user = await self.get_user(google_id)
+        return user["brand_voice"] if user else None
+
+    def _add_generation(self, generation: dict) -> None:
+        self._conn.execute(
+            "INSERT INTO generations (id, google_id, generation_type, input, output, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                generation["id"], generation["google_id"], generation["generation_type"],
+                json.dumps(generation["input"]), json.dumps(generation["output"]), generation["created_at"]
+            )
+        )
+        self._conn.commit()
+
+    async def add_generation(self, google_id: str, generation_type: str, input: Optional[dict], output: Any) -> dict:
+        generation = {
+            "id": uuid.uuid4().hex,
+            "google_id": google_id,
+            "generation_type": generation_type,
+            "input": input,
+            "output": output,
+            "created_at": time.time()
+        }
+        await asyncio.to_thread(self._run, self._add_generation, generation)
+        return generation
+
+    def _list_generations(self, google_id: str, limit: int, after: Optional[Tuple[float, str]]) -> List[dict]:
+        query = "SELECT * FROM generations WHERE google_id = ?"
+        params: list = [google_id]
+        if after is not None:
+            # Row-value comparison: strictly older than the cursor row
+            query += " AND (created_at, id) < (?, ?)"
+            params.extend(after)
+        query += " ORDER BY created_at DESC, id DESC LIMIT ?"
+        params.append(limit + 1)
+        rows = []
+        for row in self._conn.execute(query, params):
+            generation = dict(row)
+            generation["input"] = json.loads(generation["input"]) if generation["input"] else None
+            generation["output"] = json.loads(generation["output"]) if generation["output"] else None
+            rows.append(generation)
+        return rows
+
+    async def list_generations(self, google_id: str, limit: int, cursor: Optional[str] = None) -> Tuple[List[dict], Optional[str]]:
+        after = decode_cursor(cursor) if cursor else None
+        rows = await asyncio.to_thread(self._run, self._list_generations, google_id, limit, after)
+        return _page(rows, limit)
+
+    def stats(self) -> dict:
+        return {"backend": self.backend, "path": self.path}
+
+
+class MongoUserRepository(UserRepository):
+    """MongoDB backend (motor)."""
+
+    backend = "mongodb"
+
+    def __init__(self, uri: str, database: str):
+        if AsyncIOMotorClient is None:
+            raise RuntimeError("motor is required for the MongoDB user store (pip install motor)")
+        self._client = AsyncIOMotorClient(uri)
+        self._db = self._client[database]
+        self.users = self._db["users"]
+        self.generations = self._db["generations"]
+
+    async def init(self) -> None:
+        await self.users.create_index([("google_id", ASCENDING)], unique=True)
+        # Serves the history query and its keyset range condition
+        await self.generations.create_index(
+            [("google_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)]
+        )
+
+    async def close(self) -> None:
+        self._client.close()
+
+    async def upsert_user(self, google_id: str, email: str, name: str, picture: Optional[str]) -> bool:
+        now = time.time()
+        result = await self.users.update_one(
+            {"google_id": google_id},
+            {
+                "$set": {"email": email, "name": name, "picture": picture, "last_login_at": now},
+                "$setOnInsert": {"created_at": now}
+            },
+            upsert=True
+        )
+        return result.upserted_id is not None
+
+    async def get_user(self, google_id: str) -> Optional[dict]:
+        user = await self.users.find_one({"google_id": google_id}, {"_id": 0})
+        if user is not None:
+            user.setdefault("brand_voice", None)
+        return user
+
+    async def set_brand_voice(self, google_id: str, brand_voice: dict) -> None:
+        now = time.time()
+        await self.users.update_one(
+            {"google_id": google_id},
+            {
+                "$set": {"brand_voice": brand_voice},
+                "$setOnInsert": {"email": "", "name": "", "created_at": now, "last_login_at": now}
+            },
+            upsert=True
+        )
+
+    async def get_brand_voice(self, google_id: str) -> Optional[dict]:
+        user = await self.users.find_one({"google_id": google_id}, {"brand_voice": 1})
+        return user.get("brand_voice") if user else None
+
+    async def add_generation(self, google_id: str, generation_type: str, input: Optional[dict], output: Any) -> dict:
+        generation = {
+            "id": uuid.uuid4().hex,
+            "google_id": google_id,
+            "generation_type": generation_type,
+            "input": input,
+            "output": output,
+            "created_at": time.time()
+        }
+        document = {key: value for key, value in generation.items() if key != "id"}
+        await self.generations.insert_one({**document, "_id": generation["id"]})
+        return generation
+
+    async def list_generations(self, google_id: str, limit: int, cursor: Optional[str] = None) -> Tuple[List[dict], Optional[str]]:
+        query: dict = {"google_id": google_id}
+        if cursor:
+            created_at, generation_id = decode_cursor(cursor)
+            query["$or"] = [
+                {"created_at": {"$lt": created_at}},
+                {"created_at": created_at, "_id": {"$lt": generation_id}}
+            ]
+        documents = self.generations.find(query).sort(
+            [("created_at", DESCENDING), ("_id", DESCENDING)]
+        ).limit(limit + 1)
+        rows = []
+        async for document in documents:
+            document["id"] = document.pop("_id")
+            rows.append(document)
+        return _page(rows, limit)
+
+
+# Singleton instance
+_user_repository: Optional[UserRepository] = None
+
+
+def get_user_repository() -> UserRepository:
+    """Get or create the user repository singleton (MongoDB if configured, else SQLite)."""
+    global _user_repository
+    if _user_repository is None:
+        settings = get_settings()
+        if settings.mongodb_uri:
+            _user_repository = MongoUserRepository(settings.mongodb_uri, settings.mongodb_database)
+        else:
+            _user_repository = SQLiteUserRepository(settings.user_store_sqlite_path)
+    return _user_repository
+
+
+async def init_user_repository() -> None:
+    """Connect and create indexes on application startup."""
+    await get_user_repository().init()
+
+
+async def close_user_repository() -> None:
+    """Close the user store on application shutdown."""
+    if _user_repository is not None:
+        await _user_repository.close()
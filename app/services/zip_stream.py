@@ -0,0 +1,77 @@
+"""
+BizForge ZIP Streaming
+Build a ZIP archive incrementally and hand out its bytes as they are written.
+
+zipfile writes into a buffer that is drained after every chunk, so only
+the chunk being compressed is ever held in memory, however large the
+archive gets. The stream is not seekable, so entries carry data
+descriptors (sizes and CRC after the data) and the central directory is
+written by close().
+"""
+
+import asyncio
+import time
+import zipfile
+from typing import AsyncIterator, BinaryIO, List
+
+CHUNK_SIZE = 64 * 1024
+
+
+class _Sink:
+    """Write-only buffer; zipfile sees an unseekable stream."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _copy_chunk(src: BinaryIO, dest) -> int:
+    data = src.read(CHUNK_SIZE)
+    if data:
+        dest.write(data)
+    return len(data)
+
+
+class ZipStream:
+    """A ZIP archive written entry by entry; every method returns the new bytes."""
+
+    def __init__(self, compression: int = zipfile.ZIP_DEFLATED):
+        self.compression = compression
+        self._sink = _Sink()
+        self._zip = zipfile.ZipFile(self._sink, mode="w", compression=compression)
+
+    def _info(self, name: str) -> zipfile.ZipInfo:
+        info = zipfile.ZipInfo(name, date_time=time.localtime()[:6])
+        info.compress_type = self.compression
+        return info
+
+    async def write_file(self, name: str, src: BinaryIO) -> AsyncIterator[bytes]:
+        """Add an entry from an open file, yielding archive bytes chunk by chunk."""
+        with self._zip.open(self._info(name), mode="w") as dest:
+            # Reading and compressing block, so each chunk runs in a thread
+            while await asyncio.to_thread(_copy_chunk, src, dest):
+                data = self._sink.drain()
+                if data:
+                    yield data
+        yield self._sink.drain()
+
+    def write_bytes(self, name: str, data: bytes) -> bytes:
+        """Add a small in-memory entry."""
+        self._zip.writestr(self._info(name), data)
+        return self._sink.drain()
+
+    def close(self) -> bytes:
+        """Finish the archive (writes the central directory)."""
+        self._zip.close()
+        return self._sink.drain()
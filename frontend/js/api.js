@@ -44,26 +44,100 @@ async function generateBrandNames(keywords, industry, tone) {
     }
 }
 
+/**
+ * Resolve an image URL returned by the API (stored logos come back as a
+ * path under the API origin)
+ * @param {string} url - Image URL or path
+ * @returns {string} Absolute image URL
+ */
+function resolveImageUrl(url) {
+    return url && url.startsWith('/') ? new URL(url, API_BASE_URL).href : url;
+}
+
+/**
+ * Resolve the derived image URLs of a logo (thumbnails, favicon, social cards)
+ * @param {Object} variants - Variant name to URL or path
+ * @returns {Object} Variant name to absolute URL
+ */
+function resolveVariants(variants) {
+    const resolved = {};
+    for (const [name, url] of Object.entries(variants || {})) {
+        resolved[name] = resolveImageUrl(url);
+    }
+    return resolved;
+}
+
+/**
+ * Wait for a background logo job to finish (SSE status events)
+ * @param {string} jobId - Logo job ID
+ * @param {Function} onPreview - Called with the preview image URL once it is ready
+ * @returns {Promise<Object>} Final job status
+ */
+function waitForLogoJob(jobId, onPreview) {
+    return new Promise((resolve, reject) => {
+        const source = new EventSource(`${API_BASE_URL}/logo/jobs/${jobId}/events`);
+        const finish = (event) => {
+            source.close();
+            resolve(JSON.parse(event.data));
+        };
+        source.addEventListener('preview_ready', (event) => {
+            const job = JSON.parse(event.data);
+            if (onPreview && job.preview_url) onPreview(resolveImageUrl(job.preview_url));
+        });
+        source.addEventListener('done', finish);
+        source.addEventListener('failed', finish);
+        source.onerror = () => {
+            source.close();
+            reject(new Error('Lost connection to logo job'));
+        };
+    });
+}
+
 /**
  * Generate logo prompt
  * @param {string} brandName - Brand name
  * @param {string} industry - Industry category
  * @param {string} keywords - Keywords/Values for logo
+ * @param {Function} onPreview - Called with a fast preview image URL before the final logo
  * @returns {Promise<Object>} API response
  */
-async function generateLogo(brandName, industry, keywords) {
+async function generateLogo(brandName, industry, keywords, onPreview) {
     try {
+        const body = JSON.stringify({
+            brand_name: brandName,
+            industry: industry,
+            brand_values: keywords, // Mapping keywords to brand_values
+            style: "modern", // Default
+            icon_preferences: "",
+            colors: ""
+        });
+
+        // Render in the background (fast preview first) and follow the job's status events
+        const jobResponse = await fetch(`${API_BASE_URL}/logo/jobs?progressive=true`, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: body
+        });
+        if (jobResponse.ok) {
+            let job = await jobResponse.json();
+            if (job.status !== 'done' && job.status !== 'failed') {
+                if (onPreview && job.preview_url) onPreview(resolveImageUrl(job.preview_url));
+                job = await waitForLogoJob(job.job_id, onPreview);
+            }
+            if (job.status === 'failed') throw new Error(job.error || 'Logo generation failed');
+            return {
+                success: true,
+                response: null,
+                image_url: resolveImageUrl(job.image_url),
+                variants: resolveVariants(job.variants)
+            };
+        }
+
+        // Jobs unavailable: synchronous endpoint (placeholder image if rendering fails)
         const response = await fetch(`${API_BASE_URL}/logo/prompt`, {
             method: 'POST',
             headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({
-                brand_name: brandName,
-                industry: industry,
-                brand_values: keywords, // Mapping keywords to brand_values
-                style: "modern", // Default
-                icon_preferences: "",
-                colors: ""
-            })
+            body: body
         });
 
         if (!response.ok) throw new Error(`HTTP error! status: ${response.status}`);
@@ -72,7 +146,8 @@ async function generateLogo(brandName, industry, keywords) {
         return {
             success: data.success,
             response: data.prompts, // Map 'prompts' to 'response'
-            image_url: data.image_url // Pass image URL
+            image_url: resolveImageUrl(data.image_url), // Pass image URL
+            variants: resolveVariants(data.variants)
         };
     } catch (error) {
         console.error('Error generating logo:', error);
@@ -173,7 +248,9 @@ async function analyzeSentiment(review) {
 
         return {
             success: data.success,
-            response: data.analysis // Map 'analysis' to 'response'
+            response: data.analysis, // Map 'analysis' to 'response'
+            sentiment: data.sentiment, // Set when answered by the local fast path
+            confidence: data.confidence
         };
     } catch (error) {
         console.error('Error analyzing sentiment:', error);
@@ -211,6 +288,126 @@ async function chatWithAI(message) {
     }
 }
 
+/**
+ * POST a JSON body to a streaming endpoint and consume Server-Sent Events
+ * @param {string} path - API path (relative to API_BASE_URL)
+ * @param {Object} body - Request payload
+ * @param {Function} onToken - Called with each token as it arrives
+ * @param {AbortSignal} [signal] - Optional signal to stop the stream early
+ * @returns {Promise<Object>} Final `done` event (model_used, usage, finish_reason)
+ */
+async function streamSSE(path, body, onToken, signal) {
+    const response = await fetch(`${API_BASE_URL}${path}`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json', 'Accept': 'text/event-stream' },
+        body: JSON.stringify(body),
+        signal: signal
+    });
+
+    if (!response.ok) throw new Error(`HTTP error! status: ${response.status}`);
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    let done = null;
+
+    while (true) {
+        const { value, done: finished } = await reader.read();
+        if (finished) break;
+        buffer += decoder.decode(value, { stream: true });
+
+        // Events are separated by a blank line
+        let boundary;
+        while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+            const raw = buffer.slice(0, boundary);
+            buffer = buffer.slice(boundary + 2);
+
+            let event = 'message';
+            let data = '';
+            for (const line of raw.split('\n')) {
+                if (line.startsWith('event:')) event = line.slice(6).trim();
+                else if (line.startsWith('data:')) data += line.slice(5).trim();
+            }
+            if (!data) continue;
+            const payload = JSON.parse(data);
+
+            if (event === 'token') onToken(payload.content);
+            else if (event === 'done') done = payload;
+            else if (event === 'error') throw new Error(payload.detail);
+        }
+    }
+
+    return done;
+}
+
+/**
+ * Chat with AI branding assistant, streaming the reply
+ * @param {string} message - User message
+ * @param {Function} onToken - Called with each token as it arrives
+ * @param {AbortSignal} [signal] - Optional signal to stop the stream early
+ * @returns {Promise<Object>} API response with the full reply
+ */
+async function streamChatWithAI(message, onToken, signal) {
+    try {
+        let text = '';
+        const done = await streamSSE('/chat/stream', {
+            message: message,
+            conversation_history: [],
+            business_context: ""
+        }, (token) => {
+            text += token;
+            onToken(token, text);
+        }, signal);
+
+        return {
+            success: true,
+            response: text,
+            model_used: done ? done.model_used : null,
+            usage: done ? done.usage : null
+        };
+    } catch (error) {
+        console.error('Error streaming chat:', error);
+        throw error;
+    }
+}
+
+/**
+ * Generate marketing content, streaming tokens as they arrive
+ * @param {string} brandName - Brand name
+ * @param {string} description - Brand description
+ * @param {string} tone - Content tone
+ * @param {string} contentType - Type of content
+ * @param {Function} onToken - Called with each token as it arrives
+ * @param {AbortSignal} [signal] - Optional signal to stop the stream early
+ * @returns {Promise<Object>} API response with the full content
+ */
+async function streamContent(brandName, description, tone, contentType, onToken, signal) {
+    try {
+        let text = '';
+        const done = await streamSSE('/content/generate/stream', {
+            brand_name: brandName,
+            brand_description: description,
+            content_type: contentType,
+            target_audience: "General Audience",
+            tone: tone
+        }, (token) => {
+            text += token;
+            onToken(token, text);
+        }, signal);
+
+        return {
+            success: true,
+            content: text,
+            response: text,
+            model_used: done ? done.model_used : null,
+            usage: done ? done.usage : null
+        };
+    } catch (error) {
+        console.error('Error streaming content:', error);
+        throw error;
+    }
+}
+
 // Export functions if using modules (optional)
 if (typeof module !== 'undefined' && module.exports) {
     module.exports = {
@@ -219,6 +416,8 @@ if (typeof module !== 'undefined' && module.exports) {
         generateContent,
         getDesignSystem,
         analyzeSentiment,
-        chatWithAI
+        chatWithAI,
+        streamChatWithAI,
+        streamContent
     };
 }
@@ -79,6 +79,12 @@ function checkAuth() {
     return session.user;
 }
 
+// Authorization header carrying the Google ID token of the session
+function authHeaders() {
+    const session = JSON.parse(localStorage.getItem('bizforge_session') || '{}');
+    return session.token ? { 'Authorization': `Bearer ${session.token}` } : {};
+}
+
 function logout() {
     localStorage.removeItem('bizforge_session');
     window.location.href = 'login.html';
@@ -160,7 +166,7 @@ document.addEventListener('DOMContentLoaded', () => {
         syncUserWithBackend(user);
 
         // Initialize Brand Voice
-        initBrandVoice(user.sub);
+        initBrandVoice();
     }
 });
 
@@ -169,9 +175,9 @@ async function syncUserWithBackend(user) {
     try {
         await fetch('/api/users/sync', {
             method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
+            headers: { 'Content-Type': 'application/json', ...authHeaders() },
             body: JSON.stringify({
-                google_id: user.sub,
+                google_id: user.id,
                 email: user.email,
                 name: user.name,
                 picture: user.picture
@@ -183,7 +189,7 @@ async function syncUserWithBackend(user) {
 }
 
 // Brand Voice DNA functionality
-async function initBrandVoice(googleId) {
+async function initBrandVoice() {
     const personalityInput = document.getElementById('brandPersonality');
     const industrySelect = document.getElementById('brandIndustryGlobal');
     const audienceInput = document.getElementById('brandTargetAudience');
@@ -202,7 +208,7 @@ async function initBrandVoice(googleId) {
 
     // Try to load from API
     try {
-        const res = await fetch(`/api/users/me/brand-voice?google_id=${googleId}`);
+        const res = await fetch('/api/users/me/brand-voice', { headers: authHeaders() });
         if (res.ok) {
             const data = await res.json();
             if (data.brand_voice) {
@@ -230,9 +236,9 @@ async function initBrandVoice(googleId) {
 
         // Try to save to API
         try {
-            await fetch(`/api/users/me/brand-voice?google_id=${googleId}`, {
+            await fetch('/api/users/me/brand-voice', {
                 method: 'PUT',
-                headers: { 'Content-Type': 'application/json' },
+                headers: { 'Content-Type': 'application/json', ...authHeaders() },
                 body: JSON.stringify(brandVoice)
             });
         } catch (e) {
@@ -258,17 +264,25 @@ document.addEventListener('DOMContentLoaded', () => {
     const exportBtn = document.getElementById('exportBrandGuideBtn');
     if (!exportBtn) return;
 
+    // Last downloaded PDF and its ETag: unchanged repeats come back as 304
+    let lastExport = null;
+
     exportBtn.addEventListener('click', async () => {
         const session = JSON.parse(localStorage.getItem('bizforge_session') || '{}');
         const brandVoice = getBrandVoice();
+        // Latest generated assets, saved by the generators in main.js
+        const lastContent = JSON.parse(localStorage.getItem('bizforge_last_content') || 'null');
 
         exportBtn.disabled = true;
         exportBtn.textContent = '⏳ Generating PDF...';
 
         try {
+            const headers = { 'Content-Type': 'application/json' };
+            if (lastExport) headers['If-None-Match'] = lastExport.etag;
+
             const response = await fetch('/api/export/brand-bible', {
                 method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
+                headers: headers,
                 body: JSON.stringify({
                     brand_name: session.user?.name || 'My Brand',
                     tagline: 'Powered by BizForge AI',
@@ -278,14 +292,24 @@ document.addEventListener('DOMContentLoaded', () => {
                     primary_color: '#667eea',
                     secondary_color: '#764ba2',
                     font_primary: 'Inter',
-                    font_secondary: 'Roboto'
+                    font_secondary: 'Roboto',
+                    logo_url: localStorage.getItem('bizforge_last_logo'),
+                    palette_text: localStorage.getItem('bizforge_last_palette'),
+                    content_samples: lastContent ? [lastContent] : null
                 })
             });
 
-            if (!response.ok) throw new Error('PDF generation failed');
+            let blob;
+            if (response.status === 304 && lastExport) {
+                blob = lastExport.blob;
+            } else {
+                if (!response.ok) throw new Error('PDF generation failed');
+                blob = await response.blob();
+                const etag = response.headers.get('ETag');
+                lastExport = etag ? { etag, blob } : null;
+            }
 
             // Download the PDF
-            const blob = await response.blob();
             const url = window.URL.createObjectURL(blob);
             const a = document.createElement('a');
             a.href = url;
@@ -290,19 +290,32 @@ function initLogoGenerator() {
         outputDiv.innerHTML = '<div class="loading-text"><span class="loading"></span> Generating logo prompt...</div>';
 
         try {
-            const result = await generateLogo(brandName, industry, keywords);
+            const result = await generateLogo(brandName, industry, keywords, (previewUrl) => {
+                // Show the fast preview while the full-quality render finishes
+                outputDiv.innerHTML = `<h3>Your Generated Logo:</h3>
+                    <div class="logo-preview" style="text-align: center; margin-bottom: 20px;">
+                        <img src="${previewUrl}" alt="Logo Preview"
+                             style="max-width: 100%; max-height: 400px; border-radius: 8px; opacity: 0.8;">
+                    </div>
+                    <div class="loading-text"><span class="loading"></span> Refining...</div>`;
+            });
 
             // Display results
             let html = '<h3>Your Generated Logo:</h3>';
 
             if (result.image_url) {
+                // Downscaled variants (when available) instead of the 1024px original
+                const variants = result.variants || {};
+                const previewUrl = variants['512.webp'] || result.image_url;
                 html += `<div class="logo-preview" style="text-align: center; margin-bottom: 20px;">
-                    <img src="${result.image_url}" 
+                    <img src="${previewUrl}" 
                          alt="Generated Logo" 
                          onerror="this.onerror=null; this.parentElement.innerHTML='<div style=\\'padding:20px; text-align:center; color:#ef4444; border:1px dashed #ef4444; border-radius:8px;\\'>Image load failed. Please check backend logs.</div>';"
                          style="max-width: 100%; max-height: 400px; border-radius: 8px; box-shadow: 0 4px 10px rgba(0,0,0,0.1);">
                 </div>`;
-                populateMockups(result.image_url, brandName);
+                populateMockups(result.image_url, brandName, variants);
+                // Included in the exported brand guide
+                localStorage.setItem('bizforge_last_logo', result.image_url);
             } else {
                 html += '<p>No image generated.</p>';
             }
@@ -318,7 +331,7 @@ function initLogoGenerator() {
 
 
 // Populate merchandise mockups with logo
-function populateMockups(logoUrl, brandName) {
+function populateMockups(logoUrl, brandName, variants = {}) {
     const mockupContainer = document.getElementById('mockupPreviews');
     if (!mockupContainer) return;
 
@@ -328,7 +341,7 @@ function populateMockups(logoUrl, brandName) {
     // Business card logo
     const businessCardLogo = document.getElementById('businessCardLogo');
     if (businessCardLogo) {
-        businessCardLogo.style.backgroundImage = `url('${logoUrl}')`;
+        businessCardLogo.style.backgroundImage = `url('${variants['256.webp'] || logoUrl}')`;
     }
 
     // Update brand name on card
@@ -340,7 +353,7 @@ function populateMockups(logoUrl, brandName) {
     // Signage logo
     const signageLogo = document.getElementById('signageLogo');
     if (signageLogo) {
-        signageLogo.style.backgroundImage = `url('${logoUrl}')`;
+        signageLogo.style.backgroundImage = `url('${variants['512.webp'] || logoUrl}')`;
     }
 }
 
@@ -379,6 +392,7 @@ function initContentGenerator() {
                 html += `<div class="markdown-content">${marked.parse(result.content)}</div>`;
                 // Populate social previews
                 populateSocialPreviews(brandName, result.content);
+                localStorage.setItem('bizforge_last_content', JSON.stringify({ content_type: contentType, content: result.content }));
             } else if (result.response) {
                 html += `<div class="markdown-content">${marked.parse(result.response)}</div>`;
                 populateSocialPreviews(brandName, result.response);
@@ -468,6 +482,7 @@ function initDesignGenerator() {
 
             if (result.response) {
                 html += `<div class="markdown-content">${marked.parse(result.response)}</div>`;
+                localStorage.setItem('bizforge_last_palette', result.response);
             }
 
             outputDiv.innerHTML = html;
@@ -572,7 +587,14 @@ function initChat() {
         addChatMessage('assistant', '<span class="loading"></span> Thinking...', loadingId);
 
         try {
-            const result = await chatWithAI(message);
+            // Render the reply into the loading message as tokens stream in
+            const result = await streamChatWithAI(message, (token, text) => {
+                const loadingMsg = document.getElementById(loadingId);
+                if (loadingMsg) {
+                    loadingMsg.innerHTML = `<strong>AI Assistant:</strong> ${marked.parse(text)}`;
+                    chatMessages.scrollTop = chatMessages.scrollHeight;
+                }
+            });
 
             // Remove loading message
             const loadingMsg = document.getElementById(loadingId);
@@ -0,0 +1,77 @@
+import asyncio
+
+import pytest
+
+from app.services import cache as cache_module
+from app.services.cache import ResponseCache
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(cache_module.time, "time", clock)
+    return clock
+
+
+def _cache(tmp_path, **options) -> ResponseCache:
+    defaults = dict(ttl=60, max_entries=10, max_bytes=10000, sqlite_path=str(tmp_path / "cache.db"))
+    return ResponseCache(**{**defaults, **options})
+
+
+def test_memory_entry_expires_after_ttl(clock):
+    cache = ResponseCache(ttl=60, max_entries=10, max_bytes=10000)
+
+    async def scenario():
+        await cache.set("k", "v")
+        clock.now += 59
+        fresh = await cache.get("k")
+        clock.now += 2
+        return fresh, await cache.get("k")
+
+    assert asyncio.run(scenario()) == ("v", None)
+    assert cache.stats()["entries"] == 0
+
+
+def test_disk_entry_expires_after_ttl(tmp_path, clock):
+    async def scenario():
+        writer = _cache(tmp_path)
+        await writer.set("k", "v")
+        writer.close()
+        # A new process: empty memory tier, same database
+        reader = _cache(tmp_path)
+        clock.now += 61
+        value = await reader.get("k")
+        reader.close()
+        return value
+
+    assert asyncio.run(scenario()) is None
+
+
+def test_promotion_keeps_the_disk_entrys_expiry(tmp_path, clock):
+    async def scenario():
+        writer = _cache(tmp_path)
+        await writer.set("k", "v")
+        writer.close()
+
+        reader = _cache(tmp_path)
+        clock.now += 50
+        promoted = await reader.get("k")  # disk hit, promoted to memory
+        clock.now += 5
+        from_memory = await reader.get("k")
+        clock.now += 6  # 61s after the write: past the original TTL
+        expired = await reader.get("k")
+        stats = reader.stats()
+        reader.close()
+        return promoted, from_memory, expired, stats
+
+    promoted, from_memory, expired, stats = asyncio.run(scenario())
+    assert (promoted, from_memory, expired) == ("v", "v", None)
+    assert (stats["hits"], stats["disk_hits"], stats["misses"]) == (2, 1, 1)
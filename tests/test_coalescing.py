@@ -0,0 +1,81 @@
+import asyncio
+
+from app.services.cancellation import remaining_time, set_deadline
+from app.services.coalescing import SingleFlight
+from app.services.priority import get_priority, set_priority
+
+
+def test_flight_runs_at_most_demanding_waiters_priority_and_deadline():
+    async def scenario():
+        flight = SingleFlight()
+        seen = {}
+        release = asyncio.Event()
+
+        async def call():
+            await release.wait()
+            seen["priority"] = get_priority()
+            seen["remaining"] = remaining_time()
+            return "result"
+
+        async def caller(priority, deadline):
+            set_priority(priority)
+            set_deadline(deadline)
+            return await flight.do("key", call)
+
+        leader = asyncio.create_task(caller("bulk", 0.5))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(caller("interactive", None))
+        await asyncio.sleep(0)
+        release.set()
+        return await asyncio.gather(leader, follower), seen, flight.stats()
+
+    results, seen, stats = asyncio.run(scenario())
+    assert results == ["result", "result"]
+    assert seen == {"priority": "interactive", "remaining": None}
+    assert stats["upstream_calls"] == 1 and stats["coalesced"] == 1
+
+
+def test_leader_cancellation_does_not_fail_followers():
+    async def scenario():
+        flight = SingleFlight()
+        release = asyncio.Event()
+
+        async def call():
+            await release.wait()
+            return "result"
+
+        leader = asyncio.create_task(flight.do("key", call))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flight.do("key", call))
+        await asyncio.sleep(0)
+        leader.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        return await follower, leader.cancelled()
+
+    assert asyncio.run(scenario()) == ("result", True)
+
+
+def test_call_is_cancelled_when_last_waiter_leaves():
+    async def scenario():
+        flight = SingleFlight()
+        started = asyncio.Event()
+        cancelled = asyncio.Event()
+
+        async def call():
+            started.set()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        waiters = [asyncio.create_task(flight.do("key", call)) for _ in range(2)]
+        await started.wait()
+        for waiter in waiters:
+            waiter.cancel()
+        await asyncio.gather(*waiters, return_exceptions=True)
+        await asyncio.wait_for(cancelled.wait(), 1)
+        return flight.stats()["in_flight"]
+
+    assert asyncio.run(scenario()) == 0
@@ -0,0 +1,43 @@
+import asyncio
+
+from app.services.conversation import ConversationCompactor
+
+
+def _history(count: int, words: int = 40) -> list:
+    return [
+        {"role": "user" if i % 2 == 0 else "assistant", "content": f"turn{i} " + "word " * words}
+        for i in range(count)
+    ]
+
+
+def _compactor(summarize, token_budget=400) -> ConversationCompactor:
+    return ConversationCompactor(
+        summarize, token_budget=token_budget, keep_turns=2, fold_stride=2, cache_size=16
+    )
+
+
+def test_recent_turns_over_budget_are_folded_into_the_summary():
+    folded = []
+
+    async def summarize(previous, messages):
+        folded.extend(m["content"].split()[0] for m in messages)
+        return "summary"
+
+    history = _history(8, words=60)
+    summary, verbatim = asyncio.run(_compactor(summarize, token_budget=200).compact(history))
+    assert summary == "summary"
+    assert len(verbatim) < 4
+    # Every message left out of the verbatim tail is covered by the summary
+    assert folded == [f"turn{i}" for i in range(len(history) - len(verbatim))]
+
+
+def test_summarizer_failure_falls_back_to_truncation():
+    async def summarize(previous, messages):
+        raise RuntimeError("upstream down")
+
+    compactor = _compactor(summarize)
+    history = _history(12)
+    summary, verbatim = asyncio.run(compactor.compact(history))
+    assert summary is None
+    assert verbatim and verbatim == history[-len(verbatim):]
+    assert compactor.stats()["summary_failures"] == 1
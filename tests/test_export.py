@@ -0,0 +1,81 @@
+import io
+import json
+import zipfile
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.routers import export
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """Export router with rendering stubbed: every guide is a tiny fake PDF."""
+    rendered = []
+
+    async def open_brand_guide(data, payload, generated_on, key):
+        rendered.append(data.brand_name)
+        if data.brand_name == "Broken":
+            raise RuntimeError("renderer crashed")
+        path = tmp_path / f"{key}.pdf"
+        path.write_bytes(b"%PDF-1.4 " + data.brand_name.encode("utf-8"))
+        return open(path, "rb")
+
+    monkeypatch.setattr(export, "_open_brand_guide", open_brand_guide)
+    app = FastAPI()
+    app.include_router(export.router)
+    client = TestClient(app)
+    client.rendered = rendered
+    return client
+
+
+@pytest.mark.parametrize("brand_name, filename", [
+    ("Acme Co", "Acme_Co_Brand_Guide.pdf"),
+    ('Bob\'s "Best"; Bakery', "Bob_s_Best_Bakery_Brand_Guide.pdf"),
+    ("Café Zürich", "Caf_Z_rich_Brand_Guide.pdf"),
+    ("東京", "Brand_Brand_Guide.pdf"),
+])
+def test_download_filename_is_a_safe_quoted_header(client, brand_name, filename):
+    response = client.post("/export/brand-bible", json={"brand_name": brand_name})
+    assert response.status_code == 200
+    assert response.headers["content-disposition"] == f'attachment; filename="{filename}"'
+
+
+def test_bulk_export_reports_a_failed_guide_in_the_manifest(client):
+    guides = [{"brand_name": "Acme"}, {"brand_name": "Broken"}, {"brand_name": "Zeta; \"Z\""}]
+    response = client.post("/export/brand-bibles", json={"guides": guides})
+    assert response.status_code == 200
+    assert response.headers["content-disposition"].startswith('attachment; filename="Brand_Guides_')
+
+    archive = zipfile.ZipFile(io.BytesIO(response.content))
+    assert archive.testzip() is None
+    assert sorted(archive.namelist()) == [
+        "001_Acme_Brand_Guide.pdf", "003_Zeta_Z_Brand_Guide.pdf", "manifest.json"
+    ]
+    assert archive.read("001_Acme_Brand_Guide.pdf") == b"%PDF-1.4 Acme"
+
+    manifest = json.loads(archive.read("manifest.json"))
+    assert (manifest["total"], manifest["succeeded"], manifest["failed"]) == (3, 2, 1)
+    assert [entry["status"] for entry in manifest["entries"]] == ["ok", "failed", "ok"]
+    assert manifest["entries"][1]["error"] == "PDF generation failed: renderer crashed"
+
+
+@pytest.mark.parametrize("if_none_match, status", [
+    ("{etag}", 304),
+    ("W/{etag}", 304),
+    ("*", 304),
+    ('"stale", W/"other" ,{etag} ', 304),
+    ('"stale", W/"other"', 200),
+    ('"{key}-not-it"', 200),
+])
+def test_if_none_match(client, if_none_match, status):
+    body = {"brand_name": "Acme"}
+    etag = client.post("/export/brand-bible", json=body).headers["etag"]
+    header = if_none_match.format(etag=etag, key=etag.strip('"'))
+
+    response = client.post("/export/brand-bible", json=body, headers={"If-None-Match": header})
+    assert response.status_code == status
+    assert response.headers["etag"] == etag
+    # A 304 is answered before anything is rendered or read from the cache
+    assert len(client.rendered) == (1 if status == 304 else 2)
@@ -0,0 +1,61 @@
+import pytest
+
+from app.config import get_settings
+from app.services.fast_sentiment import needs_escalation, score_texts
+
+THRESHOLD = get_settings().fast_sentiment_threshold
+
+# Small labelled sample used to calibrate the confidence formula
+CLEAR = [
+    ("Love it!", "Positive"),
+    ("I absolutely love it", "Positive"),
+    ("Awesome!", "Positive"),
+    ("Great product, works perfectly.", "Positive"),
+    ("Best purchase I've made this year.", "Positive"),
+    ("Really happy with it", "Positive"),
+    ("Good value, would recommend", "Positive"),
+    ("Excellent service and fast delivery!", "Positive"),
+    ("The support team was so helpful and friendly.", "Positive"),
+    ("Amazing quality, highly recommend.", "Positive"),
+    ("Terrible experience.", "Negative"),
+    ("I hate it", "Negative"),
+    ("Worst customer service ever!", "Negative"),
+    ("Very disappointed with the quality", "Negative"),
+    ("The app is buggy and crashes constantly.", "Negative"),
+    ("Total waste of money, arrived broken.", "Negative"),
+    ("Horrible, rude staff.", "Negative"),
+    ("It's useless garbage", "Negative"),
+    ("Awful. Want a refund.", "Negative"),
+    ("Delivery was late and the box was damaged.", "Negative"),
+]
+
+AMBIGUOUS = [
+    "The design is beautiful but the battery is terrible.",
+    "Not bad, I guess.",
+    "It's okay.",
+    "Fast shipping but the product is defective and support was unhelpful, though the price was good.",
+    "I received the package yesterday.",
+    "Great, another update that breaks everything.",
+    "Works, but.",
+    "Not great, not terrible.",
+    "I wanted to love it but",
+    "Nice idea, poor execution.",
+    "Could be better.",
+]
+
+
+@pytest.mark.parametrize("text,label", CLEAR)
+def test_clear_polarity_stays_on_fast_path(text, label):
+    result = score_texts([text])[0]
+    assert result.label == label
+    assert not needs_escalation(result, THRESHOLD)
+
+
+@pytest.mark.parametrize("text", AMBIGUOUS)
+def test_ambiguous_text_escalates(text):
+    assert needs_escalation(score_texts([text])[0], THRESHOLD)
+
+
+def test_batch_scoring_matches_single():
+    texts = [text for text, _ in CLEAR] + AMBIGUOUS
+    assert score_texts(texts) == [score_texts([text])[0] for text in texts]
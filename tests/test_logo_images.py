@@ -0,0 +1,31 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.routers import logo
+from app.services.blob_store import BlobStore
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 32
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    store = BlobStore(str(tmp_path))
+    monkeypatch.setattr(logo, "get_blob_store", lambda: store)
+    app = FastAPI()
+    app.include_router(logo.router)
+    client = TestClient(app)
+    client.digest = store.put(PNG)
+    return client
+
+
+def test_image_is_served_with_its_stored_type(client):
+    response = client.get(f"/logo/images/{client.digest}.png")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "image/png"
+    assert response.content == PNG
+
+
+@pytest.mark.parametrize("ext", ["webp", "ico"])
+def test_extension_not_matching_the_blob_is_not_found(client, ext):
+    assert client.get(f"/logo/images/{client.digest}.{ext}").status_code == 404
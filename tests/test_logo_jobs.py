@@ -0,0 +1,168 @@
+import asyncio
+import json
+import os
+from dataclasses import asdict
+
+import pytest
+
+from app.schemas.models import LogoPromptRequest
+from app.services import logo_jobs
+from app.services.logo_jobs import LogoJobManager, RenderedLogo
+
+
+def _request(brand_name: str) -> LogoPromptRequest:
+    return LogoPromptRequest(brand_name=brand_name, industry="tech", brand_values="bold")
+
+
+@pytest.fixture
+def renders(monkeypatch):
+    """Stub Stability AI: each render waits for its release event."""
+    calls = []
+    release = {}
+
+    async def render_logo(payload, derivatives=True):
+        calls.append(payload)
+        await release.setdefault(payload["seed"], asyncio.Event()).wait()
+        return RenderedLogo(f"/logo/images/{payload['seed']}.png", {})
+
+    monkeypatch.setattr(logo_jobs, "render_logo", render_logo)
+    return calls, release
+
+
+async def _settle(state, status):
+    for _ in range(100):
+        if state.status == status:
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"job stayed {state.status}, expected {status}")
+
+
+def test_worker_survives_a_job_that_cannot_be_saved(tmp_path, monkeypatch, renders):
+    _, release = renders
+
+    async def scenario():
+        manager = LogoJobManager(str(tmp_path), workers=1, max_queued=10)
+        await manager.start()
+        broken, _ = manager.create(_request("Broken"))
+        unsaved, _ = manager.create(_request("Unsaved"))
+        save = manager._save
+
+        def failing_save(state):
+            if (state, state.status) in ((broken, "rendering"), (unsaved, "done")):
+                raise OSError("disk full")
+            save(state)
+
+        monkeypatch.setattr(manager, "_save", failing_save)
+        await _settle(broken, "failed")
+
+        # Rendered, but the final save fails: the job stays done
+        events = manager.events(unsaved.job_id)
+        await events.__anext__()
+        release.setdefault(unsaved.seed, asyncio.Event()).set()
+        async for event in events:
+            last_event = event
+        await asyncio.sleep(0.05)
+
+        healthy, _ = manager.create(_request("Healthy"))
+        await _settle(healthy, "rendering")
+        release.setdefault(healthy.seed, asyncio.Event()).set()
+        await _settle(healthy, "done")
+        workers = [task.done() for task in manager._workers]
+        await manager.shutdown()
+        return broken, unsaved, last_event, workers
+
+    broken, unsaved, last_event, workers = asyncio.run(scenario())
+    assert broken.error == "disk full"
+    assert (unsaved.status, unsaved.error) == ("done", None)
+    assert unsaved.image_url == last_event.image_url == f"/logo/images/{unsaved.seed}.png"
+    assert last_event.status == "done"
+    assert workers == [False]
+
+
+def test_identical_prompt_joins_an_unfinished_job_only(tmp_path, renders):
+    calls, release = renders
+
+    async def scenario():
+        manager = LogoJobManager(str(tmp_path), workers=1, max_queued=10)
+        await manager.start()
+        blocker, _ = manager.create(_request("Blocker"))
+        await _settle(blocker, "rendering")
+
+        first, deduplicated = manager.create(_request("Acme"))
+        assert (first.status, deduplicated) == ("queued", False)
+        queued, deduplicated = manager.create(_request("Acme"))
+        assert (queued, deduplicated) == (first, True)
+
+        release.setdefault(blocker.seed, asyncio.Event()).set()
+        await _settle(first, "rendering")
+        rendering, deduplicated = manager.create(_request("Acme"))
+        assert (rendering, deduplicated) == (first, True)
+
+        release.setdefault(first.seed, asyncio.Event()).set()
+        await _settle(first, "done")
+        second, deduplicated = manager.create(_request("Acme"))
+        assert deduplicated is False
+        assert second.job_id != first.job_id and second.seed != first.seed
+        release.setdefault(second.seed, asyncio.Event()).set()
+        await _settle(second, "done")
+        await manager.shutdown()
+        return manager.deduplicated
+
+    assert asyncio.run(scenario()) == 2
+    assert len(calls) == 3
+
+
+def test_restart_deduplicates_only_unfinished_jobs(tmp_path, renders):
+    _, release = renders
+
+    async def scenario():
+        manager = LogoJobManager(str(tmp_path), workers=1, max_queued=10)
+        await manager.start()
+        done, _ = manager.create(_request("Done"))
+        release.setdefault(done.seed, asyncio.Event()).set()
+        await _settle(done, "done")
+        pending, _ = manager.create(_request("Pending"))
+        await _settle(pending, "rendering")
+        await manager.shutdown()
+
+        restarted = LogoJobManager(str(tmp_path), workers=1, max_queued=10)
+        await restarted.start()
+        joined = restarted.create(_request("Pending"))
+        fresh = restarted.create(_request("Done"))
+        await restarted.shutdown()
+        return pending, joined, done, fresh
+
+    pending, (joined, joined_dedup), done, (fresh, fresh_dedup) = asyncio.run(scenario())
+    assert (joined.job_id, joined_dedup) == (pending.job_id, True)
+    assert fresh_dedup is False and fresh.job_id != done.job_id
+
+
+def test_restart_prunes_expired_finished_jobs(tmp_path, renders):
+    _, release = renders
+
+    async def scenario():
+        manager = LogoJobManager(str(tmp_path), workers=1, max_queued=10, retention=60)
+        await manager.start()
+        old, _ = manager.create(_request("Old"))
+        recent, _ = manager.create(_request("Recent"))
+        for state in (old, recent):
+            release.setdefault(state.seed, asyncio.Event()).set()
+            await _settle(state, "done")
+        pending, _ = manager.create(_request("Pending"))
+        await _settle(pending, "rendering")
+        await manager.shutdown()
+        for state in (old, pending):
+            state.updated_at -= 3600
+            with open(manager._path(state.job_id), "w") as fh:
+                json.dump(asdict(state), fh)
+
+        restarted = LogoJobManager(str(tmp_path), workers=1, max_queued=10, retention=60)
+        await restarted.start()
+        await restarted.shutdown()
+        return restarted, old, recent, pending
+
+    restarted, old, recent, pending = asyncio.run(scenario())
+    assert restarted.get(old.job_id) is None
+    assert not os.path.exists(restarted._path(old.job_id))
+    assert restarted.get(recent.job_id) is not None
+    assert restarted.get(pending.job_id) is not None
@@ -0,0 +1,17 @@
+from app.services.model_router import ModelRouter
+
+
+def test_latency_is_recorded_per_matched_route():
+    router = ModelRouter(
+        {"content": ["fast"], "content:landing_page": ["large"], "default": ["fast"]},
+        hedging=True,
+        min_samples=2
+    )
+    for key in ("content:tagline", "content:made-up", "content:landing_page", "chat", "anything"):
+        router.record_success(key, "fast", 0.1)
+        router.record_success(key, "fast", 0.2)
+
+    assert sorted(router.stats()["latency"]) == ["content", "content:landing_page", "default"]
+    assert router.stats()["latency"]["content"]["fast"]["samples"] == 4
+    # Equivalent keys share hedge thresholds
+    assert router.hedge_delay("content:other", "fast") == router.hedge_delay("content", "fast")
@@ -0,0 +1,97 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.ai_service import GroqAIService
+from app.services.errors import RateLimitedError
+from app.services.rate_limit import RateLimitScheduler
+from app.services.tokens import TokenBudgeter
+
+WEIGHTS = {"interactive": 4.0, "standard": 2.0, "bulk": 1.0}
+
+
+class _Response:
+    headers = {}
+
+
+def test_cancelled_call_refunds_its_reservation():
+    async def scenario():
+        scheduler = RateLimitScheduler(rpm=100, tpm=1000, weights=WEIGHTS)
+        started = asyncio.Event()
+
+        async def call():
+            started.set()
+            await asyncio.sleep(10)
+
+        task = asyncio.create_task(scheduler.run("model", 400, call))
+        await started.wait()
+        limiter = scheduler._limiter("model")
+        during = limiter.tokens.level
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return during, limiter.tokens.level
+
+    during, after = asyncio.run(scenario())
+    assert during == pytest.approx(600, abs=1)
+    assert after == pytest.approx(1000, abs=1)
+
+
+def test_deadline_in_queue_does_not_consume_capacity():
+    async def scenario():
+        scheduler = RateLimitScheduler(rpm=100, tpm=1000, weights=WEIGHTS, max_wait=0.05)
+
+        async def call():
+            return _Response()
+
+        await scheduler.run("model", 900, call)
+        limiter = scheduler._limiter("model")
+        before = limiter.tokens.level
+        # Needs more than is left: waits in the queue until max_wait runs out
+        with pytest.raises(RateLimitedError):
+            await scheduler.run("model", 900, call)
+        return before, limiter.tokens.level
+
+    before, after = asyncio.run(scenario())
+    # Only the refill since the first call, nothing consumed by the rejected one
+    assert after >= before
+
+
+def test_abandoned_stream_refunds_unused_reservation():
+    service = GroqAIService.__new__(GroqAIService)
+    service.scheduler = RateLimitScheduler(rpm=100, tpm=4000, weights=WEIGHTS)
+    service.budgets = TokenBudgeter(budgets={"chat": 1000}, context_window=8000, max_prompt_tokens=4000)
+    closed = []
+    opened = {}
+
+    class _Stream:
+        response = SimpleNamespace(aclose=lambda: closed.append(True) or asyncio.sleep(0))
+
+        async def __aiter__(self):
+            for _ in range(3):
+                choice = SimpleNamespace(finish_reason=None, delta=SimpleNamespace(content="word"))
+                yield SimpleNamespace(model="model", x_groq=None, choices=[choice])
+
+    async def open_stream(messages, temperature, budget_key, max_tokens, reserved):
+        async def call():
+            return _Response()
+
+        await service.scheduler.run("model", reserved, call)
+        opened["estimated"] = reserved - max_tokens
+        return _Stream(), "model"
+
+    service._open_stream = open_stream
+
+    async def scenario():
+        events = service._chat_stream([{"role": "user", "content": "hello"}])
+        await events.__anext__()
+        await events.__anext__()
+        # Client disconnects after two tokens
+        await events.aclose()
+        return service.scheduler._limiter("model").tokens.level
+
+    level = asyncio.run(scenario())
+    assert closed == [True]
+    assert level == pytest.approx(4000 - opened["estimated"] - 2, abs=1)
+    assert service.budgets.stats()["budgets"]["chat"]["requests"] == 1
@@ -0,0 +1,106 @@
+import asyncio
+import json
+import os
+
+from app.services.sentiment_jobs import JobState, SentimentJobManager
+
+
+def _job(manager: SentimentJobManager, records: int) -> JobState:
+    state = JobState(job_id="job", format="ndjson", context="general", text_field="text", id_field="id")
+    os.makedirs(os.path.join(manager.root, state.job_id))
+    with open(manager.input_path(state), "wb") as fh:
+        for i in range(records):
+            fh.write(json.dumps({"id": str(i), "text": f"text {i}"}).encode("utf-8") + b"\n")
+    state.bytes_total = os.path.getsize(manager.input_path(state))
+    open(manager.results_path(state.job_id), "wb").close()
+    return state
+
+
+def test_failing_worker_stops_the_job_at_a_consistent_checkpoint(tmp_path, monkeypatch):
+    manager = SentimentJobManager(str(tmp_path))
+    monkeypatch.setattr(manager.settings, "sentiment_job_workers", 3)
+    monkeypatch.setattr(manager.settings, "sentiment_job_chunk_size", 2)
+    state = _job(manager, 40)
+    analyzed = []
+
+    async def analyze(state, chunk):
+        first = int(chunk[0][0])
+        analyzed.append(first)
+        if first == 6:
+            raise RuntimeError("upstream exploded")
+        # Chunks after the failing one finish later, racing its failure
+        await asyncio.sleep(0.01 if first > 6 else 0)
+        return [{"id": record_id, "success": True} for record_id, _, _ in chunk], 0
+
+    monkeypatch.setattr(manager, "_analyze_chunk", analyze)
+
+    async def scenario():
+        await manager._run(state)
+        committed = state.records_done
+        # Siblings were cancelled: nothing keeps running or committing
+        await asyncio.sleep(0.05)
+        return committed, [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+
+    committed, leftover = asyncio.run(scenario())
+
+    assert leftover == []
+    assert state.status == "failed"
+    assert state.error == "upstream exploded"
+    assert state.records_done == committed == 6
+    assert len(analyzed) < 20  # the producer stopped too
+
+    with open(manager.results_path(state.job_id), "rb") as fh:
+        results = fh.read()
+    assert len(results) == state.results_bytes
+    assert [json.loads(line)["id"] for line in results.splitlines()] == [str(i) for i in range(6)]
+    with open(manager.input_path(state), "rb") as fh:
+        assert fh.read(state.offset).count(b"\n") == 6
+
+    with open(os.path.join(manager.root, state.job_id, "state.json")) as fh:
+        saved = json.load(fh)
+    assert (saved["status"], saved["offset"], saved["records_done"]) == ("failed", state.offset, 6)
+
+
+
+def test_slow_chunk_bounds_the_results_awaiting_commit(tmp_path, monkeypatch):
+    manager = SentimentJobManager(str(tmp_path))
+    monkeypatch.setattr(manager.settings, "sentiment_job_workers", 3)
+    monkeypatch.setattr(manager.settings, "sentiment_job_chunk_size", 2)
+    state = _job(manager, 100)
+    started = []
+    awaiting_commit = []
+
+    async def analyze(state, chunk):
+        first = int(chunk[0][0])
+        started.append(first)
+        # Chunks analyzed but not yet committed sit in the reorder buffer
+        awaiting_commit.append(len(started) - state.records_done // 2)
+        # The second chunk is stuck (e.g. retrying under rate limiting)
+        await asyncio.sleep(0.2 if first == 2 else 0)
+        return [{"id": record_id, "success": True} for record_id, _, _ in chunk], 0
+
+    monkeypatch.setattr(manager, "_analyze_chunk", analyze)
+    asyncio.run(manager._run(state))
+
+    assert state.status == "completed"
+    assert state.records_done == 100
+    assert max(awaiting_commit) <= 6  # sentiment_job_workers * 2
+
+
+def test_prune_deletes_only_expired_finished_jobs(tmp_path, monkeypatch):
+    manager = SentimentJobManager(str(tmp_path))
+    monkeypatch.setattr(manager.settings, "sentiment_job_retention_seconds", 60)
+    jobs = {}
+    for job_id, status, age in [("old", "completed", 3600), ("recent", "failed", 0), ("stalled", "running", 3600)]:
+        state = JobState(job_id=job_id, format="ndjson", context="general", text_field="text", id_field="id")
+        os.makedirs(os.path.join(manager.root, job_id))
+        state.status = status
+        manager._save(state)
+        state.updated_at -= age
+        manager._states[job_id] = jobs[job_id] = state
+
+    assert asyncio.run(manager.prune()) == 1
+    assert manager.get("old") is None
+    assert not os.path.exists(os.path.join(manager.root, "old"))
+    assert manager.get("recent") is jobs["recent"]
+    assert manager.get("stalled") is jobs["stalled"]
@@ -0,0 +1,58 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.ai_service import GroqAIService
+from app.services.model_router import ModelRouter
+from app.services.rate_limit import RateLimitScheduler
+from app.services.tokens import DEFAULT_OUTPUT_BUDGETS, TokenBudgeter
+
+
+@pytest.fixture
+def service():
+    """AI service whose upstream stream yields one token and reports usage."""
+    service = GroqAIService.__new__(GroqAIService)
+    service.scheduler = RateLimitScheduler(
+        rpm=100, tpm=100000, weights={"interactive": 4.0, "standard": 2.0, "bulk": 1.0}
+    )
+    service.budgets = TokenBudgeter(
+        budgets=dict(DEFAULT_OUTPUT_BUDGETS), context_window=8000, max_prompt_tokens=4000
+    )
+    service.router = ModelRouter({})
+
+    class _Stream:
+        response = SimpleNamespace(aclose=lambda: asyncio.sleep(0))
+
+        async def __aiter__(self):
+            usage = SimpleNamespace(model_dump=lambda **_: {"prompt_tokens": 50, "completion_tokens": 1})
+            choice = SimpleNamespace(finish_reason="stop", delta=SimpleNamespace(content="word"))
+            yield SimpleNamespace(model="model", x_groq=SimpleNamespace(usage=usage), choices=[choice])
+
+    async def open_stream(messages, temperature, budget_key, max_tokens, reserved):
+        return _Stream(), "model"
+
+    service._open_stream = open_stream
+    return service
+
+
+def _stream_content(service, content_type: str) -> None:
+    async def scenario():
+        events = service.stream_marketing_content("Acme", "Rockets", content_type, "engineers")
+        async for _ in events:
+            pass
+
+    asyncio.run(scenario())
+
+
+def test_known_content_type_has_its_own_budget(service):
+    _stream_content(service, "tagline")
+    assert list(service.budgets.stats()["budgets"]) == ["content:tagline"]
+
+
+def test_unknown_content_type_does_not_create_a_stats_key(service):
+    for content_type in ("made-up", "also-made-up"):
+        _stream_content(service, content_type)
+    budgets = service.budgets.stats()["budgets"]
+    assert list(budgets) == ["content"]
+    assert budgets["content"]["requests"] == 2
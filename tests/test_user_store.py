@@ -0,0 +1,61 @@
+import asyncio
+
+import pytest
+
+from app.services import user_store
+from app.services.user_store import SQLiteUserRepository, decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor(1712345678.123456, "a1b2c3")
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (1712345678.123456, "a1b2c3")
+
+
+@pytest.mark.parametrize("cursor", ["bad", "", encode_cursor(1.0, "x")[:-3], "W1sxXV0"])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_pages_across_equal_timestamps_neither_skip_nor_repeat(monkeypatch):
+    # Three bursts of generations sharing a created_at, so page
+    # boundaries fall between rows with equal timestamps
+    clock = iter([100.0] * 7 + [200.0] * 9 + [300.0] * 5)
+    monkeypatch.setattr(user_store.time, "time", lambda: next(clock))
+
+    async def scenario():
+        repo = SQLiteUserRepository(":memory:")
+        await repo.init()
+        added = [await repo.add_generation("g1", "content", {"i": i}, f"text {i}") for i in range(21)]
+        pages, cursor = [], None
+        while True:
+            page, cursor = await repo.list_generations("g1", 4, cursor)
+            pages.append(page)
+            if cursor is None:
+                break
+        await repo.close()
+        return added, pages
+
+    added, pages = asyncio.run(scenario())
+
+    seen = [g["id"] for page in pages for g in page]
+    expected = [g["id"] for g in sorted(added, key=lambda g: (g["created_at"], g["id"]), reverse=True)]
+    assert seen == expected
+    assert len(set(seen)) == 21
+    assert [len(page) for page in pages] == [4, 4, 4, 4, 4, 1]
+
+
+def test_history_is_per_user():
+    async def scenario():
+        repo = SQLiteUserRepository(":memory:")
+        await repo.init()
+        await repo.add_generation("g1", "content", None, "mine")
+        await repo.add_generation("g2", "content", None, "theirs")
+        page, cursor = await repo.list_generations("g1", 10)
+        await repo.close()
+        return page, cursor
+
+    page, cursor = asyncio.run(scenario())
+    assert [g["output"] for g in page] == ["mine"]
+    assert cursor is None
@@ -0,0 +1,59 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from google.auth.exceptions import GoogleAuthError
+
+from app.routers import users
+from app.services import google_auth
+
+
+async def _verify(token):
+    if token != "good":
+        raise ValueError("Token expired")
+    return {"sub": "g1"}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(users, "verify_google_id_token", _verify)
+    app = FastAPI()
+    app.include_router(users.router)
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("headers", [
+    {},
+    {"Authorization": "Basic Zzox"},
+    {"Authorization": "Bearer"},
+    {"Authorization": "Bearer forged"},
+])
+@pytest.mark.parametrize("method, path", [
+    ("GET", "/users/me"),
+    ("GET", "/users/me/brand-voice"),
+    ("GET", "/users/me/generations"),
+])
+def test_missing_or_invalid_token_is_401(client, headers, method, path):
+    response = client.request(method, path, headers=headers, params={"google_id": "g1"})
+    assert response.status_code == 401
+    assert response.headers["www-authenticate"] == "Bearer"
+
+
+def test_sync_rejects_another_users_id(client):
+    body = {"google_id": "g2", "email": "a@b.co", "name": "A"}
+    response = client.post("/users/sync", json=body, headers={"Authorization": "Bearer good"})
+    assert response.status_code == 403
+
+
+def test_wrong_issuer_is_an_invalid_token(monkeypatch):
+    def wrong_issuer(token, request, audience=None):
+        raise GoogleAuthError("Wrong issuer. 'iss' should be one of the following: ...")
+
+    monkeypatch.setattr(google_auth.get_settings(), "google_client_id", "cid")
+    monkeypatch.setattr(google_auth, "_request", object())
+    monkeypatch.setattr(google_auth.id_token, "verify_oauth2_token", wrong_issuer)
+
+    app = FastAPI()
+    app.include_router(users.router)
+    response = TestClient(app).get("/users/me", headers={"Authorization": "Bearer token"})
+    assert response.status_code == 401
+    assert "Wrong issuer" in response.json()["detail"]